@@ -0,0 +1,117 @@
+"""
+Incremental maintenance of DailyFinancialSummary.
+
+Every Transaction adds its amount to the (date, worker, transaction_type) row of
+the day it was written. Single transactions are picked up by a post_save signal;
+paths that bulk_create transactions (settlement, Redis bet intake) call
+add_to_daily_summary() themselves.
+
+The increments run after the surrounding transaction commits, so a bet never
+holds a lock on the day's hot summary row for longer than one UPDATE, and
+rolled-back transactions are never counted. If a process dies between the
+commit and the increment, ``backfill_daily_summary`` recomputes the affected
+days from the Transaction table.
+"""
+import logging
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Sum, Count
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import User, Transaction, DailyFinancialSummary
+
+logger = logging.getLogger('accounts')
+
+
+def add_to_daily_summary(transactions):
+    """Schedule the summary increments for ``transactions`` (saved Transaction instances)."""
+    totals = defaultdict(lambda: [Decimal('0.00'), 0])
+    user_ids = {t.user_id for t in transactions}
+    workers = dict(User.objects.filter(id__in=user_ids).values_list('id', 'worker_id')) if user_ids else {}
+    for t in transactions:
+        created_at = t.created_at or timezone.now()
+        key = (timezone.localdate(created_at), workers.get(t.user_id), t.transaction_type)
+        totals[key][0] += Decimal(str(t.amount))
+        totals[key][1] += 1
+    if totals:
+        transaction.on_commit(lambda: _apply(totals))
+
+
+def _apply(totals):
+    for (day, worker_id, transaction_type), (amount, count) in totals.items():
+        try:
+            _increment(day, worker_id, transaction_type, amount, count)
+        except Exception as e:
+            logger.error(f"Daily summary update failed for {day}/{worker_id}/{transaction_type}: {e}")
+
+
+def _add(rows, amount, count):
+    return rows.update(
+        total_amount=F('total_amount') + amount,
+        transaction_count=F('transaction_count') + count,
+        updated_at=timezone.now(),
+    )
+
+
+def _increment(day, worker_id, transaction_type, amount, count):
+    # worker_id=None filters on IS NULL; the partial unique constraint keeps that row single
+    rows = DailyFinancialSummary.objects.filter(date=day, worker_id=worker_id, transaction_type=transaction_type)
+    if _add(rows, amount, count):
+        return
+    try:
+        with transaction.atomic():
+            DailyFinancialSummary.objects.create(
+                date=day, worker_id=worker_id, transaction_type=transaction_type,
+                total_amount=amount, transaction_count=count,
+            )
+    except IntegrityError:
+        # Another process created the row first
+        _add(rows, amount, count)
+
+
+def fold_worker_summary(worker_id):
+    """
+    Merge a worker's rows into the no-worker rows before the worker is deleted:
+    SET_NULL would otherwise collide with the existing (date, type) row.
+    """
+    with transaction.atomic():
+        for row in DailyFinancialSummary.objects.select_for_update().filter(worker_id=worker_id):
+            unassigned = DailyFinancialSummary.objects.filter(
+                date=row.date, worker__isnull=True, transaction_type=row.transaction_type
+            )
+            if _add(unassigned, row.total_amount, row.transaction_count):
+                row.delete()
+
+
+def rebuild_daily_summary(since=None):
+    """
+    Recompute the summary from Transaction for every day from ``since`` (a date,
+    None for all history). Rows are attributed to each user's current worker.
+    Returns the number of summary rows written.
+    """
+    transactions = Transaction.objects.all()
+    if since:
+        transactions = transactions.filter(created_at__date__gte=since)
+    rows = (
+        transactions.annotate(day=TruncDate('created_at'))
+        .values('day', 'user__worker_id', 'transaction_type')
+        .annotate(total=Sum('amount'), count=Count('id'))
+        .order_by()
+    )
+    with transaction.atomic():
+        existing = DailyFinancialSummary.objects.all()
+        if since:
+            existing = existing.filter(date__gte=since)
+        existing.delete()
+        summaries = [
+            DailyFinancialSummary(
+                date=row['day'], worker_id=row['user__worker_id'], transaction_type=row['transaction_type'],
+                total_amount=row['total'] or Decimal('0.00'), transaction_count=row['count'],
+            )
+            for row in rows.iterator(chunk_size=2000)
+        ]
+        DailyFinancialSummary.objects.bulk_create(summaries, batch_size=2000)
+    return len(summaries)
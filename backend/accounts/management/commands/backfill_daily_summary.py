@@ -0,0 +1,33 @@
+"""
+Management command to (re)build DailyFinancialSummary from the Transaction table.
+
+Run once after deploying the rollup, and again for recent days if the summary
+ever drifts (e.g. a process died between a commit and its summary update):
+
+    python manage.py backfill_daily_summary            # all history
+    python manage.py backfill_daily_summary --days 7   # today and the 6 days before
+"""
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from accounts.financial_summary import rebuild_daily_summary
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the daily financial summary from transactions'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=None,
+                            help='Only rebuild the last N days (default: all history)')
+
+    def handle(self, *args, **options):
+        since = None
+        if options['days']:
+            since = timezone.localdate() - timedelta(days=options['days'] - 1)
+            self.stdout.write(f'Rebuilding daily summary since {since}...')
+        else:
+            self.stdout.write('Rebuilding daily summary for all history...')
+        rows = rebuild_daily_summary(since)
+        self.stdout.write(self.style.SUCCESS(f'✅ Daily financial summary rebuilt: {rows} rows'))
@@ -0,0 +1,96 @@
+"""
+Management command to hammer one wallet with concurrent debits and compare the
+old read-modify-save pattern with the conditional ``Wallet.debit`` UPDATE.
+
+Each bettor thread repeatedly takes ``--amount`` from the same wallet. Afterwards
+the wallet must hold exactly ``initial - successes * amount`` and never go below
+zero; the read-modify-save pattern loses updates under contention.
+
+Uses a throwaway user that is deleted at the end. Run it against a database that
+handles concurrent writers (PostgreSQL); SQLite serializes all writers.
+"""
+import threading
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, OperationalError
+
+from accounts.models import User, Wallet
+
+
+class Command(BaseCommand):
+    help = 'Benchmark concurrent wallet debits: read-modify-save vs conditional UPDATE'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=50, help='Concurrent bettors (default: 50)')
+        parser.add_argument('--debits', type=int, default=20, help='Debits per bettor (default: 20)')
+        parser.add_argument('--amount', type=str, default='10.00', help='Amount per debit (default: 10.00)')
+
+    def handle(self, *args, **options):
+        threads = options['threads']
+        debits = options['debits']
+        amount = Decimal(options['amount'])
+        # Enough for roughly 80% of the attempts, so the balance check is exercised too
+        initial = amount * int(threads * debits * 0.8)
+
+        user = User.objects.create(username=f'_wallet_bench_{int(time.time())}')
+        try:
+            self.stdout.write(self.style.SUCCESS(
+                f'{threads} bettors x {debits} debits of {amount} on one wallet starting at {initial}'
+            ))
+            for name, debit in (('read-modify-save', self._legacy_debit), ('conditional UPDATE', self._conditional_debit)):
+                Wallet.objects.update_or_create(user=user, defaults={'balance': initial})
+                elapsed, successes, errors = self._run(user.id, debit, threads, debits, amount)
+                balance = Wallet.objects.get(user=user).balance
+                expected = initial - amount * successes
+                ok = balance == expected and balance >= 0
+                style = self.style.SUCCESS if ok else self.style.ERROR
+                self.stdout.write(style(
+                    f'  {name:<19} {successes / elapsed if elapsed else 0:8.0f} debits/s   '
+                    f'successes {successes:5d}   errors {errors:4d}   '
+                    f'balance {balance} (expected {expected}) {"✅" if ok else "❌ lost updates"}'
+                ))
+        finally:
+            user.delete()
+
+    def _run(self, user_id, debit, threads, debits, amount):
+        successes = []
+        errors = []
+        barrier = threading.Barrier(threads)
+
+        def bettor():
+            close_old_connections()
+            ok = failed = 0
+            barrier.wait()
+            for _ in range(debits):
+                try:
+                    if debit(user_id, amount):
+                        ok += 1
+                except OperationalError:
+                    failed += 1
+            successes.append(ok)
+            errors.append(failed)
+            close_old_connections()
+
+        workers = [threading.Thread(target=bettor) for _ in range(threads)]
+        start = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        return time.perf_counter() - start, sum(successes), sum(errors)
+
+    @staticmethod
+    def _legacy_debit(user_id, amount):
+        # What place_bet did before: read the balance, check it in Python, save
+        wallet = Wallet.objects.get(user_id=user_id)
+        if wallet.balance >= amount:
+            wallet.balance -= amount
+            wallet.save()
+            return True
+        return False
+
+    @staticmethod
+    def _conditional_debit(user_id, amount):
+        return Wallet.debit(user_id, amount) is not None
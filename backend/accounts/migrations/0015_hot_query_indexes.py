@@ -0,0 +1,33 @@
+# Generated by Django 4.2.7 on 2026-10-17 07:45
+
+from django.db import migrations, models
+
+from game.migration_operations import AddIndexConcurrentlyIfPostgres
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('accounts', '0014_dailyfinancialsummary'),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyIfPostgres(
+            model_name='transaction',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='txn_user_created_idx'),
+        ),
+        AddIndexConcurrentlyIfPostgres(
+            model_name='transaction',
+            index=models.Index(fields=['transaction_type', 'created_at'], name='txn_type_created_idx'),
+        ),
+        AddIndexConcurrentlyIfPostgres(
+            model_name='depositrequest',
+            index=models.Index(fields=['status', 'id'], name='deposit_status_id_idx'),
+        ),
+        AddIndexConcurrentlyIfPostgres(
+            model_name='withdrawrequest',
+            index=models.Index(fields=['status', 'id'], name='withdraw_status_id_idx'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.7 on 2026-10-17 08:20
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def merge_no_worker_duplicates(apps, schema_editor):
+    """Collapse the duplicate no-worker rows concurrent increments may have created."""
+    DailyFinancialSummary = apps.get_model('accounts', 'DailyFinancialSummary')
+    duplicates = (
+        DailyFinancialSummary.objects.filter(worker__isnull=True)
+        .values('date', 'transaction_type')
+        .annotate(rows=Count('id'), total=Sum('total_amount'), count=Sum('transaction_count'))
+        .filter(rows__gt=1)
+    )
+    for dup in duplicates:
+        rows = DailyFinancialSummary.objects.filter(
+            worker__isnull=True, date=dup['date'], transaction_type=dup['transaction_type']
+        ).order_by('id')
+        keep = rows.first()
+        rows.exclude(id=keep.id).delete()
+        DailyFinancialSummary.objects.filter(id=keep.id).update(total_amount=dup['total'], transaction_count=dup['count'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0015_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_no_worker_duplicates, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='dailyfinancialsummary',
+            constraint=models.UniqueConstraint(condition=models.Q(('worker__isnull', True)), fields=('date', 'transaction_type'), name='daily_summary_no_worker_uniq'),
+        ),
+    ]
@@ -1,6 +1,9 @@
 from django.contrib.auth.models import AbstractUser
-from django.db import models
+from django.db import models, connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
 from decimal import Decimal
+import sqlite3
 
 
 class User(AbstractUser):
@@ -34,18 +37,71 @@ class Wallet(models.Model):
 
     def deduct(self, amount):
         """Deduct amount from wallet"""
-        if self.balance >= amount:
-            self.balance -= amount
-            self.save()
-            return True
-        return False
+        balance = Wallet.debit(self.user_id, amount)
+        if balance is None:
+            return False
+        self.balance = balance
+        return True
 
     def add(self, amount):
         """Add amount to wallet"""
-        self.balance += amount
-        self.save()
+        balance = Wallet.credit(self.user_id, amount)
+        if balance is None:
+            return False
+        self.balance = balance
         return True
 
+    @classmethod
+    def debit(cls, user_id, amount):
+        """
+        Take ``amount`` from the user's wallet if the balance covers it.
+        Returns the new balance, or None if the balance is too low (or there is
+        no wallet). A single conditional UPDATE, so concurrent debits never
+        overdraw and never need a row lock held across Python code.
+        """
+        return cls._apply_delta(user_id, -Decimal(str(amount)), require_funds=True)
+
+    @classmethod
+    def credit(cls, user_id, amount):
+        """Add ``amount`` to the user's wallet. Returns the new balance, or None if there is no wallet."""
+        return cls._apply_delta(user_id, Decimal(str(amount)), require_funds=False)
+
+    @classmethod
+    def _apply_delta(cls, user_id, delta, require_funds):
+        if connection.vendor == 'postgresql' or (
+            connection.vendor == 'sqlite' and sqlite3.sqlite_version_info >= (3, 35)
+        ):
+            field = cls._meta.get_field('balance')
+            qn = connection.ops.quote_name
+            sql = (
+                f"UPDATE {qn(cls._meta.db_table)} SET {qn('balance')} = {qn('balance')} + %s, "
+                f"{qn('updated_at')} = %s WHERE {qn('user_id')} = %s"
+            )
+            params = [
+                connection.ops.adapt_decimalfield_value(delta, field.max_digits, field.decimal_places),
+                connection.ops.adapt_datetimefield_value(timezone.now()),
+                user_id,
+            ]
+            if require_funds:
+                sql += f" AND {qn('balance')} >= %s"
+                params.append(connection.ops.adapt_decimalfield_value(-delta, field.max_digits, field.decimal_places))
+            sql += f" RETURNING {qn('balance')}"
+            with connection.cursor() as cursor:
+                cursor.execute(sql, params)
+                row = cursor.fetchone()
+            if row is None:
+                return None
+            return Decimal(str(row[0])).quantize(Decimal('0.01'))
+
+        # Backends without UPDATE ... RETURNING: same conditional update, then read back
+        with transaction.atomic():
+            wallets = cls.objects.filter(user_id=user_id)
+            if require_funds:
+                wallets = wallets.filter(balance__gte=-delta)
+            if not wallets.update(balance=F('balance') + delta, updated_at=timezone.now()):
+                return None
+            return cls.objects.filter(user_id=user_id).values_list('balance', flat=True).get()
+
 
 class Transaction(models.Model):
     """Transaction log for wallet operations"""
@@ -67,11 +123,46 @@ class Transaction(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at', '-id'], name='txn_user_created_idx'),
+            models.Index(fields=['transaction_type', 'created_at'], name='txn_type_created_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.transaction_type} - {self.amount}"
 
 
+class DailyFinancialSummary(models.Model):
+    """Per-day transaction totals by worker and type, kept up to date as transactions are written"""
+    date = models.DateField()
+    worker = models.ForeignKey(
+        User,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name='daily_financial_summaries',
+    )
+    transaction_type = models.CharField(max_length=10, choices=Transaction.TRANSACTION_TYPES)
+    total_amount = models.DecimalField(max_digits=16, decimal_places=2, default=Decimal('0.00'))
+    transaction_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-date']
+        unique_together = ['date', 'worker', 'transaction_type']
+        constraints = [
+            # NULLs are distinct in the unique_together index, so the no-worker rows need their own
+            models.UniqueConstraint(
+                fields=['date', 'transaction_type'],
+                condition=Q(worker__isnull=True),
+                name='daily_summary_no_worker_uniq',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.date} - {self.worker or 'no worker'} - {self.transaction_type} - {self.total_amount}"
+
+
 class DepositRequest(models.Model):
     """Manual deposit requests reviewed by admin"""
     STATUS_CHOICES = [
@@ -100,6 +191,9 @@ class DepositRequest(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'id'], name='deposit_status_id_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - ₹{self.amount} - {self.status}"
@@ -134,6 +228,9 @@ class WithdrawRequest(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'id'], name='withdraw_status_id_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - ₹{self.amount} - {self.status}"
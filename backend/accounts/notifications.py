@@ -0,0 +1,75 @@
+"""
+Pushes to one user's WebSocket connections.
+
+GameConsumer adds every authenticated socket to its user's group
+(``user_group(user_id)``), so bet confirmations, wallet balances, wins and
+deposit/withdraw decisions reach all of a user's open tabs and devices without
+polling the REST API. Messages go out once the surrounding transaction commits,
+so a rolled-back write is never announced.
+
+Client messages (JSON, amounts as strings like the REST API):
+
+    bet_update    action ('placed' | 'removed'), round_id, number, chip_amount,
+                  wallet_balance, pending (Redis intake bets not yet persisted)
+    win           round_id, payout, bets [{number, payout}], wallet_balance
+    notification  message, wallet_balance (when the balance changed)
+"""
+import asyncio
+import logging
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.db import transaction
+
+logger = logging.getLogger('accounts')
+
+EVENT_TYPE = 'user_message'
+# group_send calls in flight at once when pushing to many users (settlement)
+SEND_CONCURRENCY = 200
+
+
+def user_group(user_id):
+    return f"user_{user_id}"
+
+
+async def _send_all(channel_layer, messages):
+    failures = 0
+    for start in range(0, len(messages), SEND_CONCURRENCY):
+        results = await asyncio.gather(
+            *(channel_layer.group_send(user_group(user_id), {'type': EVENT_TYPE, 'message': message})
+              for user_id, message in messages[start:start + SEND_CONCURRENCY]),
+            return_exceptions=True
+        )
+        failures += sum(isinstance(result, Exception) for result in results)
+    return failures
+
+
+def _send_now(messages):
+    try:
+        channel_layer = get_channel_layer()
+        if channel_layer is None:
+            return
+        failures = async_to_sync(_send_all)(channel_layer, messages)
+        if failures:
+            logger.warning(f"{failures} of {len(messages)} user pushes failed")
+    except Exception as e:
+        logger.warning(f"User push failed: {e}")
+
+
+def push_to_users(messages):
+    """Send ``[(user_id, message)]`` to the users' sockets after the current transaction commits."""
+    if messages:
+        messages = list(messages)
+        transaction.on_commit(lambda: _send_now(messages))
+
+
+def push_to_user(user_id, message):
+    push_to_users([(user_id, message)])
+
+
+def notify_user(user, message, wallet_balance=None):
+    """Show ``message`` to the user (deposit/withdraw updates), with their new balance if it changed."""
+    payload = {'type': 'notification', 'message': message}
+    if wallet_balance is not None:
+        payload['wallet_balance'] = str(wallet_balance)
+    push_to_user(user.id, payload)
@@ -0,0 +1,113 @@
+"""
+Keyset (cursor) pagination on (created_at, id), newest first.
+
+Page N is fetched with ``WHERE (created_at, id) < (cursor) ORDER BY created_at
+DESC, id DESC LIMIT size``, so every page costs the same as the first one: no
+COUNT(*) and no OFFSET scan over the rows already shown. ``id`` breaks ties
+between rows written in the same instant (bulk-created bets and transactions).
+
+Cursors are opaque URL-safe strings; clients just pass back ``next``.
+"""
+import base64
+from datetime import datetime
+
+from django.conf import settings
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param, remove_query_param
+
+CURSOR_PARAM = 'cursor'
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(obj):
+    raw = f"{obj.created_at.isoformat()}|{obj.pk}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """``(created_at, id)`` from a cursor string; raises ValueError if malformed."""
+    padded = cursor + '=' * (-len(cursor) % 4)
+    created_at, pk = base64.urlsafe_b64decode(padded.encode()).decode().split('|')
+    return datetime.fromisoformat(created_at), int(pk)
+
+
+def _after(queryset, cursor, page_size):
+    """Up to ``page_size + 1`` rows of ``queryset`` (newest first) after ``cursor``."""
+    queryset = queryset.order_by('-created_at', '-id')
+    if cursor:
+        created_at, pk = decode_cursor(cursor)
+        queryset = queryset.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk))
+    return list(queryset[:page_size + 1])
+
+
+def _split(items, page_size):
+    if len(items) > page_size:
+        items = items[:page_size]
+        return items, encode_cursor(items[-1])
+    return items, None
+
+
+def keyset_page(queryset, cursor=None, page_size=50):
+    """
+    One page of ``queryset`` (newest first) after ``cursor``.
+    Returns ``(items, next_cursor)``; next_cursor is None on the last page.
+    Raises ValueError for a malformed cursor.
+    """
+    return _split(_after(queryset, cursor, page_size), page_size)
+
+
+def keyset_merge_page(querysets, cursor=None, page_size=50):
+    """
+    keyset_page() over the union of querysets whose ids don't overlap (e.g.
+    live and archived bets): each is read from the same cursor and the rows
+    are merged.
+    """
+    items = []
+    for queryset in querysets:
+        items.extend(_after(queryset, cursor, page_size))
+    items.sort(key=lambda obj: (obj.created_at, obj.pk), reverse=True)
+    return _split(items, page_size)
+
+
+class KeysetPagination(BasePagination):
+    """
+    DRF pagination for querysets with ``created_at``/``id``. The response keeps
+    the ``next``/``previous``/``results`` keys; ``previous`` points back to the
+    first page (keyset pages only walk forward).
+    """
+    page_size_query_param = 'page_size'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = settings.REST_FRAMEWORK.get('PAGE_SIZE') or 20
+        try:
+            page_size = min(int(request.query_params.get(self.page_size_query_param, page_size)), MAX_PAGE_SIZE)
+        except (TypeError, ValueError):
+            pass
+        cursor = request.query_params.get(CURSOR_PARAM)
+        try:
+            items, self.next_cursor = keyset_page(queryset, cursor, max(page_size, 1))
+        except (ValueError, TypeError):
+            raise NotFound('Invalid cursor')
+        self.has_previous = bool(cursor)
+        return items
+
+    def get_next_link(self):
+        if not self.next_cursor:
+            return None
+        return replace_query_param(self.request.build_absolute_uri(), CURSOR_PARAM, self.next_cursor)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        return remove_query_param(self.request.build_absolute_uri(), CURSOR_PARAM)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
@@ -3,7 +3,7 @@ Django signals for automatic player distribution and notifications
 """
 from django.db.models.signals import post_save, pre_delete
 from django.dispatch import receiver
-from .models import User, DepositRequest, WithdrawRequest
+from .models import User, DepositRequest, WithdrawRequest, Transaction
 from asgiref.sync import async_to_sync
 from channels.layers import get_channel_layer
 from .player_distribution import (
@@ -11,6 +11,20 @@ from .player_distribution import (
     redistribute_players_from_deleted_admin,
     balance_player_distribution
 )
+from .financial_summary import add_to_daily_summary, fold_worker_summary
+
+
+@receiver(post_save, sender=Transaction)
+def update_daily_financial_summary(sender, instance, created, **kwargs):
+    """Add new transactions to the daily financial rollup (bulk_create callers do this themselves)"""
+    if created:
+        add_to_daily_summary([instance])
+
+
+@receiver(pre_delete, sender=User)
+def fold_deleted_worker_summary(sender, instance, **kwargs):
+    """Move a deleted worker's daily totals to the no-worker rows"""
+    fold_worker_summary(instance.pk)
 
 
 @receiver(post_save, sender=DepositRequest)
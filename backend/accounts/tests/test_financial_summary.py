@@ -0,0 +1,38 @@
+import datetime
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.test import TestCase
+
+from accounts.financial_summary import _increment
+from accounts.models import DailyFinancialSummary, User
+
+DAY = datetime.date(2026, 10, 17)
+
+
+class DailySummaryIncrementTests(TestCase):
+    def test_rows_without_a_worker_accumulate_in_one_row(self):
+        _increment(DAY, None, 'BET', Decimal('10.00'), 1)
+        _increment(DAY, None, 'BET', Decimal('5.50'), 2)
+
+        row = DailyFinancialSummary.objects.get(date=DAY, worker__isnull=True, transaction_type='BET')
+        self.assertEqual((row.total_amount, row.transaction_count), (Decimal('15.50'), 3))
+
+    def test_second_row_without_a_worker_is_rejected(self):
+        _increment(DAY, None, 'WIN', Decimal('1.00'), 1)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            DailyFinancialSummary.objects.create(date=DAY, transaction_type='WIN')
+
+    def test_deleting_a_worker_folds_its_rows_into_the_no_worker_rows(self):
+        worker = User.objects.create_user(username='worker', password='pw', is_staff=True)
+        _increment(DAY, None, 'DEPOSIT', Decimal('100.00'), 1)
+        _increment(DAY, worker.id, 'DEPOSIT', Decimal('50.00'), 2)
+        _increment(DAY, worker.id, 'WITHDRAW', Decimal('20.00'), 1)
+
+        worker.delete()
+
+        rows = DailyFinancialSummary.objects.filter(date=DAY, worker__isnull=True)
+        self.assertEqual(
+            {row.transaction_type: (row.total_amount, row.transaction_count) for row in rows},
+            {'DEPOSIT': (Decimal('150.00'), 3), 'WITHDRAW': (Decimal('20.00'), 1)},
+        )
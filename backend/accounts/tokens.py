@@ -0,0 +1,16 @@
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+class GameRefreshToken(RefreshToken):
+    """
+    Refresh token that also carries ``username`` and ``is_staff``. Access tokens
+    (including ones minted by token refresh) copy the claims, so the WebSocket
+    middleware can build the user without a database query.
+    """
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token['username'] = user.username
+        token['is_staff'] = user.is_staff
+        return token
@@ -4,7 +4,6 @@ from rest_framework.decorators import api_view, permission_classes, parser_class
 from rest_framework.permissions import AllowAny, IsAuthenticated, IsAdminUser
 from rest_framework.response import Response
 from django.views.decorators.csrf import csrf_exempt
-from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework.parsers import MultiPartParser, FormParser
 from django.contrib.auth import authenticate
 from django.db import transaction as db_transaction
@@ -26,6 +25,9 @@ except ImportError:
     TESSERACT_AVAILABLE = False
 
 from .models import User, Wallet, Transaction, DepositRequest, WithdrawRequest, PaymentMethod, UserBankDetail
+from .pagination import KeysetPagination
+from .notifications import notify_user
+from .tokens import GameRefreshToken
 from .serializers import (
     UserRegistrationSerializer,
     UserSerializer,
@@ -50,7 +52,7 @@ def register(request):
     if serializer.is_valid():
         user = serializer.save()
         logger.info(f"User registered successfully: {user.username} (ID: {user.id})")
-        refresh = RefreshToken.for_user(user)
+        refresh = GameRefreshToken.for_user(user)
         return Response({
             'user': UserSerializer(user).data,
             'refresh': str(refresh),
@@ -112,7 +114,7 @@ def login(request):
 
         # Generate JWT tokens
         try:
-            refresh = RefreshToken.for_user(user)
+            refresh = GameRefreshToken.for_user(user)
             access_token = str(refresh.access_token)
             refresh_token = str(refresh)
         except Exception as token_error:
@@ -172,13 +174,14 @@ def wallet(request):
 
 
 class TransactionList(generics.ListAPIView):
-    """List user transactions"""
+    """List user transactions (newest first, cursor paginated)"""
     serializer_class = TransactionSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
         logger.info(f"Transaction history access for user: {self.request.user.username} (ID: {self.request.user.id})")
-        return Transaction.objects.filter(user=self.request.user).order_by('-created_at')
+        return Transaction.objects.filter(user=self.request.user).order_by('-created_at', '-id')
 
 
 def _parse_amount(value):
@@ -215,11 +218,6 @@ def _parse_amount(value):
         return Decimal(str(rounded)).quantize(Decimal('0.01'))
 
 
-def notify_user(user, message):
-    """Placeholder notification helper"""
-    print(f"[NOTIFY] {user.username}: {message}")
-
-
 @csrf_exempt
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
@@ -468,18 +466,16 @@ def approve_deposit_request(request, pk):
                 logger.warning(f"Admin {request.user.username} failed to approve deposit {pk}: Already processed (Status: {deposit.status})")
                 return Response({'error': 'Deposit request already processed'}, status=status.HTTP_400_BAD_REQUEST)
 
-            wallet, _ = Wallet.objects.get_or_create(user=deposit.user)
-            wallet = Wallet.objects.select_for_update().get(pk=wallet.pk)
-            balance_before = wallet.balance
-            wallet.balance = balance_before + deposit.amount
-            wallet.save()
+            Wallet.objects.get_or_create(user=deposit.user)
+            balance_after = Wallet.credit(deposit.user_id, deposit.amount)
+            balance_before = balance_after - deposit.amount
 
             Transaction.objects.create(
                 user=deposit.user,
                 transaction_type='DEPOSIT',
                 amount=deposit.amount,
                 balance_before=balance_before,
-                balance_after=wallet.balance,
+                balance_after=balance_after,
                 description=f"Manual deposit #{deposit.id}",
             )
 
@@ -496,7 +492,7 @@ def approve_deposit_request(request, pk):
         logger.exception(f"Unexpected error approving deposit {pk} by admin {request.user.username}: {e}")
         return Response({'error': 'Internal server error'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-    notify_user(deposit.user, f"Your deposit of ₹{deposit.amount} has been approved.")
+    notify_user(deposit.user, f"Your deposit of ₹{deposit.amount} has been approved.", wallet_balance=balance_after)
     serializer = DepositRequestAdminSerializer(deposit, context={'request': request})
     return Response(serializer.data)
 
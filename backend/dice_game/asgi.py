@@ -19,17 +19,24 @@ from channels.auth import AuthMiddlewareStack
 django_asgi_app = get_asgi_application()
 
 from game.routing import websocket_urlpatterns
-from dice_game.channels_middleware import JWTAuthMiddleware
+from dice_game.channels_middleware import JWTAuthMiddleware, JWTOnlyPathsRouter
 
 # Log startup
 logger.info("ASGI application starting up...")
 
 application = ProtocolTypeRouter({
     "http": django_asgi_app,
-    "websocket": AuthMiddlewareStack(
+    # The game socket authenticates with JWT only; other paths keep the session stack
+    "websocket": JWTOnlyPathsRouter(
         JWTAuthMiddleware(
             URLRouter(websocket_urlpatterns)
-        )
+        ),
+        AuthMiddlewareStack(
+            JWTAuthMiddleware(
+                URLRouter(websocket_urlpatterns)
+            )
+        ),
+        prefixes=['/ws/game/'],
     ),
 })
 
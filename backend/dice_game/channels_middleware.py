@@ -1,4 +1,5 @@
 import os
+import time
 import django
 import logging
 
@@ -8,6 +9,7 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'dice_game.settings')
 django.setup()
 
 from channels.db import database_sync_to_async
+from django.conf import settings
 from django.contrib.auth.models import AnonymousUser
 from rest_framework_simplejwt.tokens import AccessToken
 from django.contrib.auth import get_user_model
@@ -15,12 +17,68 @@ from urllib.parse import parse_qs
 
 User = get_user_model()
 
+# user_id -> (expires_at, principal); short-lived so role changes apply quickly
+_principal_cache = {}
+PRINCIPAL_CACHE_MAX_SIZE = 100000
+
+
+class WebSocketUser:
+    """
+    Lightweight authenticated principal for WebSocket consumers: just what the
+    consumers use (id, username, is_staff), without loading the User row.
+    """
+    is_authenticated = True
+    is_anonymous = False
+    is_active = True
+
+    def __init__(self, user_id, username, is_staff):
+        self.id = self.pk = user_id
+        self.username = username
+        self.is_staff = is_staff
+
+    def __str__(self):
+        return self.username
+
+
+def _cached_principal(user_id):
+    entry = _principal_cache.get(user_id)
+    if entry and entry[0] > time.monotonic():
+        return entry[1]
+    return None
+
+
+def _cache_principal(user_id, principal):
+    if len(_principal_cache) >= PRINCIPAL_CACHE_MAX_SIZE:
+        _principal_cache.clear()
+    _principal_cache[user_id] = (time.monotonic() + settings.WS_AUTH_CACHE_TTL, principal)
+
+
 @database_sync_to_async
-def get_user(user_id):
-    try:
-        return User.objects.get(id=user_id)
-    except User.DoesNotExist:
+def load_principal(user_id):
+    row = User.objects.filter(id=user_id, is_active=True).values('id', 'username', 'is_staff').first()
+    if row is None:
         return AnonymousUser()
+    return WebSocketUser(row['id'], row['username'], row['is_staff'])
+
+
+async def get_principal(access_token):
+    """
+    Principal for a validated access token. Tokens from GameRefreshToken carry
+    username and is_staff, so ordinary players need no query at all. Staff
+    claims, and older tokens without claims, are confirmed against the database
+    at most once per WS_AUTH_CACHE_TTL per user and process.
+    """
+    user_id = access_token['user_id']
+    username = access_token.get('username')
+    if username is not None and not access_token.get('is_staff'):
+        return WebSocketUser(user_id, username, False)
+
+    principal = _cached_principal(user_id)
+    if principal is None:
+        principal = await load_principal(user_id)
+        _cache_principal(user_id, principal)
+    return principal
+
 
 class JWTAuthMiddleware:
     """
@@ -34,7 +92,7 @@ class JWTAuthMiddleware:
         # Ensure user is at least AnonymousUser if not set
         if 'user' not in scope:
             scope['user'] = AnonymousUser()
-        
+
         # Get the token from query string
         query_string = scope.get('query_string', b'').decode()
         query_params = parse_qs(query_string)
@@ -51,9 +109,25 @@ class JWTAuthMiddleware:
             try:
                 # Validate the token
                 access_token = AccessToken(token)
-                user_id = access_token['user_id']
-                scope['user'] = await get_user(user_id)
+                scope['user'] = await get_principal(access_token)
             except Exception as e:
                 # Invalid token
                 scope['user'] = AnonymousUser()
         return await self.inner(scope, receive, send)
+
+
+class JWTOnlyPathsRouter:
+    """
+    Send WebSocket paths that authenticate with JWT alone (``prefixes``) to
+    ``jwt_app``, skipping the session middleware and its session-table lookup;
+    everything else goes to ``session_app``.
+    """
+    def __init__(self, jwt_app, session_app, prefixes):
+        self.jwt_app = jwt_app
+        self.session_app = session_app
+        self.prefixes = tuple(prefixes)
+
+    async def __call__(self, scope, receive, send):
+        if scope.get('path', '').startswith(self.prefixes):
+            return await self.jwt_app(scope, receive, send)
+        return await self.session_app(scope, receive, send)
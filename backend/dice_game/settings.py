@@ -4,8 +4,10 @@ Django settings for dice_game project.
 
 from pathlib import Path
 import os
+import json
 from datetime import timedelta
 from dotenv import load_dotenv
+from corsheaders.defaults import default_headers
 
 load_dotenv()
 
@@ -333,6 +335,9 @@ CORS_ALLOW_CREDENTIALS = True
 # CORS Security: Allow all origins for APK compatibility
 CORS_ALLOW_ALL_ORIGINS = True
 
+# Clients send Idempotency-Key on retried bets (see game/idempotency.py)
+CORS_ALLOW_HEADERS = (*default_headers, 'idempotency-key')
+
 # Redis Configuration
 REDIS_HOST = os.getenv('REDIS_HOST', 'localhost')
 REDIS_PORT = int(os.getenv('REDIS_PORT', 6379))
@@ -444,6 +449,53 @@ GAME_SETTINGS = {
     },
 }
 
+# Game settings are cached per process and invalidated over Redis pub/sub.
+# The TTL is a safety net while the listener is connected; without Redis the
+# snapshot expires after the (short) fallback TTL instead.
+GAME_SETTINGS_CACHE_TTL = int(os.getenv('GAME_SETTINGS_CACHE_TTL', '300'))
+GAME_SETTINGS_FALLBACK_TTL = int(os.getenv('GAME_SETTINGS_FALLBACK_TTL', '1'))
+
+# Game tables (independent dice rooms). The first/default table is 'main';
+# per-table stakes as JSON, e.g. '{"vip": [500, 50000]}' -> [min_bet, max_bet]
+GAME_TABLES = [t.strip().lower() for t in os.getenv('GAME_TABLES', 'main').split(',') if t.strip()]
+GAME_TABLE_BET_LIMITS = json.loads(os.getenv('GAME_TABLE_BET_LIMITS', '{}'))
+
+# Game timer loop: 'poll' (legacy 1 Hz re-read of the round), 'deadline'
+# (phase boundaries computed once per round, DB touched only on transitions)
+# or 'async' (deadline scheduler on asyncio, DB work off the tick loop)
+GAME_TIMER_MODE = os.getenv('GAME_TIMER_MODE', 'poll')
+# Threads available to the async timer engine for database work
+GAME_TIMER_DB_WORKERS = int(os.getenv('GAME_TIMER_DB_WORKERS', '2'))
+
+# WebSocket timer protocol: 'ticks' (game_timer broadcast every second) or
+# 'schedule' (one round_schedule message per round, clients count down locally;
+# needs GAME_TIMER_MODE 'deadline' or 'async')
+GAME_WS_PROTOCOL = os.getenv('GAME_WS_PROTOCOL', 'ticks')
+
+# Redundant timers: instances compete for a Redis lease and only the holder
+# runs rounds. A dead leader is replaced once its lease expires.
+GAME_TIMER_LEADER_ELECTION = os.getenv('GAME_TIMER_LEADER_ELECTION', 'False') == 'True'
+GAME_TIMER_LEASE_TTL_MS = int(os.getenv('GAME_TIMER_LEASE_TTL_MS', '800'))
+
+# Seconds a WebSocket process caches a user looked up for authentication
+WS_AUTH_CACHE_TTL = int(os.getenv('WS_AUTH_CACHE_TTL', '60'))
+
+# WebSocket admission control per ASGI process (see game/admission.py): accepts
+# per second and burst, open-socket cap, and the staggered drain on SIGTERM
+WS_ACCEPT_RATE = float(os.getenv('WS_ACCEPT_RATE', '200'))
+WS_ACCEPT_BURST = int(os.getenv('WS_ACCEPT_BURST', '400'))
+WS_MAX_CONNECTIONS = int(os.getenv('WS_MAX_CONNECTIONS', '10000'))
+WS_DRAIN_SECONDS = float(os.getenv('WS_DRAIN_SECONDS', '8'))
+WS_DRAIN_WAVES = int(os.getenv('WS_DRAIN_WAVES', '8'))
+
+# Bet intake: 'db' (each bet written immediately) or 'redis' (bets accepted by
+# an atomic Lua script and persisted in bulk when betting closes)
+BET_INTAKE_MODE = os.getenv('BET_INTAKE_MODE', 'db')
+
+# Completed rounds older than this are moved to the archive tables by the
+# archive_rounds command
+ARCHIVE_RETENTION_DAYS = int(os.getenv('ARCHIVE_RETENTION_DAYS', '30'))
+
 # Redis Settings
 REDIS_HOST = os.getenv('REDIS_HOST', 'localhost')
 REDIS_PORT = int(os.getenv('REDIS_PORT', 6379))
@@ -46,6 +46,8 @@ urlpatterns = [
     path('api/game/bet/', game_views.place_bet, name='place_bet'),
     path('api/game/bet/<int:number>/', game_views.remove_bet, name='remove_bet'),
     path('api/game/bets/', game_views.my_bets, name='my_bets'),
+    path('api/game/my-stats/', game_views.my_stats, name='my_stats'),
+    path('api/game/leaderboard/', game_views.leaderboard, name='leaderboard'),
     path('api/game/results/', game_views.round_results, name='round_results'),
     path('api/game/results/<str:round_id>/', game_views.round_results, name='round_results_by_id'),
     re_path(r'^api/game/winning-results/?\s*$', game_views.winning_results, name='winning_results'),
@@ -90,6 +92,12 @@ urlpatterns = [
     path('game-admin/admin-management/edit/<int:admin_id>/', game_admin_views.edit_admin, name='edit_admin'),
     path('game-admin/admin-management/delete/<int:admin_id>/', game_admin_views.delete_admin, name='delete_admin'),
     
+    # CSV exports
+    path('game-admin/export/bets.csv', game_admin_views.export_bets_csv, name='export_bets_csv'),
+    path('game-admin/export/wallets.csv', game_admin_views.export_wallets_csv, name='export_wallets_csv'),
+    path('game-admin/export/transactions.csv', game_admin_views.export_transactions_csv, name='export_transactions_csv'),
+    path('game-admin/export/deposit-requests.csv', game_admin_views.export_deposit_requests_csv, name='export_deposit_requests_csv'),
+
     # Payment Methods
     path('game-admin/payment-methods/', game_admin_views.payment_methods, name='payment_methods'),
     path('game-admin/payment-methods/create/', game_admin_views.create_payment_method, name='create_payment_method'),
@@ -1,7 +1,7 @@
 from django.contrib import admin
 from django import forms
 from django.utils.html import format_html
-from .models import GameRound, Bet, DiceResult, GameSettings
+from .models import GameRound, Bet, DiceResult, GameSettings, ArchivedRound, ArchivedBet
 
 
 @admin.register(GameRound)
@@ -31,6 +31,27 @@ class DiceResultAdmin(admin.ModelAdmin):
     date_hierarchy = 'set_at'
 
 
+@admin.register(ArchivedRound)
+class ArchivedRoundAdmin(admin.ModelAdmin):
+    list_display = ['round_id', 'dice_result', 'start_time', 'total_bets', 'total_amount', 'archived_at']
+    search_fields = ['round_id']
+    date_hierarchy = 'start_time'
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(ArchivedBet)
+class ArchivedBetAdmin(admin.ModelAdmin):
+    list_display = ['user', 'round', 'number', 'chip_amount', 'payout_amount', 'is_winner', 'created_at']
+    list_filter = ['is_winner']
+    search_fields = ['user__username', 'round__round_id']
+    date_hierarchy = 'created_at'
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
 class GameSettingsAdminForm(forms.ModelForm):
     """Custom form for GameSettings with validation"""
     
@@ -33,6 +33,12 @@ urlpatterns = [
     path('admin-management/edit/<int:admin_id>/', admin_views.edit_admin, name='edit_admin'),
     path('admin-management/delete/<int:admin_id>/', admin_views.delete_admin, name='delete_admin'),
     
+    # CSV exports
+    path('export/bets.csv', admin_views.export_bets_csv, name='export_bets_csv'),
+    path('export/wallets.csv', admin_views.export_wallets_csv, name='export_wallets_csv'),
+    path('export/transactions.csv', admin_views.export_transactions_csv, name='export_transactions_csv'),
+    path('export/deposit-requests.csv', admin_views.export_deposit_requests_csv, name='export_deposit_requests_csv'),
+
     # Payment Methods
     path('payment-methods/', admin_views.payment_methods, name='payment_methods'),
     path('payment-methods/create/', admin_views.create_payment_method, name='create_payment_method'),
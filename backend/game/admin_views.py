@@ -11,8 +11,8 @@ import redis
 import json
 import os
 from collections import Counter
-from .models import GameRound, Bet, DiceResult, GameSettings, AdminPermissions
-from accounts.models import Wallet, Transaction, DepositRequest, WithdrawRequest, User, PaymentMethod
+from .models import GameRound, Bet, DiceResult, GameSettings, AdminPermissions, ArchivedRound, ArchivedBet, UserBettingStats
+from accounts.models import Wallet, Transaction, DepositRequest, WithdrawRequest, User, PaymentMethod, DailyFinancialSummary
 from accounts.player_distribution import (
     redistribute_all_players,
     balance_player_distribution,
@@ -30,6 +30,12 @@ from .admin_utils import (
     get_admin_permissions, has_menu_permission
 )
 from .utils import get_game_setting
+from .tables import DEFAULT_TABLE
+from .bet_pool import get_bet_pool
+from .betting_stats import get_betting_stats
+from .csv_export import stream_csv, format_datetime
+from accounts.pagination import keyset_merge_page
+from accounts.notifications import notify_user
 from django.db.models import Sum, Q
 from django.core.paginator import Paginator
 
@@ -279,7 +285,7 @@ def set_dice_result_view(request):
                     
                     # Fallback to latest round
                     if not round_obj:
-                        round_obj = GameRound.objects.order_by('-start_time').first()
+                        round_obj = GameRound.objects.filter(table=DEFAULT_TABLE).order_by('-start_time').first()
                         if round_obj and round_obj.start_time:
                             elapsed = (timezone.now() - round_obj.start_time).total_seconds()
                             timer = int(elapsed) % round_obj.round_end_seconds
@@ -335,11 +341,11 @@ def set_dice_result_view(request):
                         
                         # Broadcast to WebSocket
                         from channels.layers import get_channel_layer
-                        from asgiref.sync import async_to_sync
+                        from .broadcast import sync_group_send
                         channel_layer = get_channel_layer()
                         if channel_layer:
                             try:
-                                async_to_sync(channel_layer.group_send)(
+                                sync_group_send(channel_layer)(
                                     'game_room',
                                     {
                                         'type': 'dice_result',
@@ -391,20 +397,10 @@ def admin_dashboard_data(request):
     bets_by_number_list = []
     
     if current_round:
-        current_round_bets = Bet.objects.filter(round=current_round)
-        current_round_total_bets = current_round_bets.count()
-        current_round_total_amount = current_round_bets.aggregate(Sum('chip_amount'))['chip_amount__sum'] or 0
-        
-        # Calculate bets by number
-        for number in range(1, 7):
-            number_bets = current_round_bets.filter(number=number)
-            amount = number_bets.aggregate(Sum('chip_amount'))['chip_amount__sum'] or 0
-            count = number_bets.count()
-            bets_by_number_list.append({
-                'number': number,
-                'amount': float(amount),
-                'count': count
-            })
+        # Per-number pool from the live Redis counters (one round-trip)
+        bets_by_number_list, current_round_total_bets, current_round_total_amount = get_bet_pool(redis_client, current_round)
+        for item in bets_by_number_list:
+            item['amount'] = float(item['amount'])
 
     # Calculate overall profit stats
     overall_total_amount = Bet.objects.aggregate(Sum('chip_amount'))['chip_amount__sum'] or 0
@@ -451,9 +447,9 @@ def set_individual_dice_view(request):
         dice_result_time = get_game_setting('DICE_RESULT_TIME', 51)
 
         # Check timer restriction
-            if timer >= dice_result_time:
-                messages.error(request, f'Cannot set dice values after {dice_result_time} seconds. Use Manual Adjust mode to override.')
-                return redirect('dice_control')
+        if timer >= dice_result_time:
+            messages.error(request, f'Cannot set dice values after {dice_result_time} seconds. Use Manual Adjust mode to override.')
+            return redirect('dice_control')
         
         if not round_obj:
             messages.error(request, 'No active round')
@@ -485,6 +481,7 @@ def set_individual_dice_view(request):
                 return redirect('dice_control')
         
         # Apply updates to round object
+        dice_updates = {f'dice_{i}': value for i, value in enumerate(dice_values_list, start=1)}
         for dice_key, value in dice_updates.items():
             setattr(round_obj, dice_key, value)
         
@@ -552,11 +549,11 @@ def set_individual_dice_view(request):
                     
                     # Broadcast to WebSocket
                     from channels.layers import get_channel_layer
-                    from asgiref.sync import async_to_sync
+                    from .broadcast import sync_group_send
                     channel_layer = get_channel_layer()
                     if channel_layer:
                         try:
-                            async_to_sync(channel_layer.group_send)(
+                            sync_group_send(channel_layer)(
                                 'game_room',
                                 {
                                     'type': 'dice_result',
@@ -596,20 +593,8 @@ def dice_control(request):
     bets_by_number_list = []
     
     if current_round:
-        current_round_bets = Bet.objects.filter(round=current_round)
-        current_round_total_bets = current_round_bets.count()
-        current_round_total_amount = current_round_bets.aggregate(Sum('chip_amount'))['chip_amount__sum'] or 0
-        
-        # Calculate bets by number
-        for number in range(1, 7):
-            number_bets = current_round_bets.filter(number=number)
-            amount = number_bets.aggregate(Sum('chip_amount'))['chip_amount__sum'] or 0
-            count = number_bets.count()
-            bets_by_number_list.append({
-                'number': number,
-                'amount': amount,
-                'count': count
-            })
+        # Per-number pool from the live Redis counters (one round-trip)
+        bets_by_number_list, current_round_total_bets, current_round_total_amount = get_bet_pool(redis_client, current_round)
     
     # Get dice mode
     dice_mode = get_dice_mode()
@@ -696,12 +681,17 @@ def round_details(request, round_id):
     """Round details page showing all users who bet on this round"""
     try:
         round_obj = GameRound.objects.get(round_id=round_id)
+        round_bets = Bet.objects.filter(round=round_obj)
     except GameRound.DoesNotExist:
-        messages.error(request, 'Round not found.')
-        return redirect('recent_rounds')
+        # Older rounds live in the archive tables (see game/archival.py)
+        round_obj = ArchivedRound.objects.filter(round_id=round_id).first()
+        if round_obj is None:
+            messages.error(request, 'Round not found.')
+            return redirect('recent_rounds')
+        round_bets = ArchivedBet.objects.filter(round=round_obj)
     
     # Get all bets for this round
-    round_bets = Bet.objects.filter(round=round_obj).select_related('user').order_by('-created_at')
+    round_bets = round_bets.select_related('user').order_by('-created_at')
     
     # Calculate round stats
     total_bets_count = round_bets.count()
@@ -710,7 +700,7 @@ def round_details(request, round_id):
     total_payouts = round_bets.aggregate(Sum('payout_amount'))['payout_amount__sum'] or 0
     
     # Get unique users who bet on this round
-    unique_users = User.objects.filter(bets__round=round_obj).distinct()
+    unique_users = User.objects.filter(id__in=round_bets.values('user_id'))
     
     # Calculate bets by number
     bets_by_number_list = []
@@ -753,39 +743,40 @@ def user_details(request, user_id):
     # Get active tab from query params
     active_tab = request.GET.get('tab', 'all')
     
-    # Get all bets by this user
-    user_bets = Bet.objects.filter(user=user).select_related('round').order_by('-created_at')
-    if active_tab == 'bets':
-        user_bets = user_bets[:200]
-    else:
-        user_bets = user_bets[:50]
-    
-    # Calculate user stats (always needed)
-    total_bets = Bet.objects.filter(user=user).count()
-    total_bet_amount = Bet.objects.filter(user=user).aggregate(Sum('chip_amount'))['chip_amount__sum'] or 0
-    total_wins = Bet.objects.filter(user=user, is_winner=True).count()
-    total_payouts = Bet.objects.filter(user=user).aggregate(Sum('payout_amount'))['payout_amount__sum'] or 0
+    # The active tab pages through its full history with a keyset cursor on
+    # (created_at, id); the other sections show the most recent rows.
+    cursor = request.GET.get('cursor')
+    next_cursor = None
+
+    def recent(querysets, tab, page_size, preview_size):
+        nonlocal next_cursor
+        if active_tab != tab:
+            return keyset_merge_page(querysets, None, preview_size)[0]
+        try:
+            items, next_cursor = keyset_merge_page(querysets, cursor, page_size)
+        except (ValueError, TypeError):
+            items, next_cursor = keyset_merge_page(querysets, None, page_size)
+        return items
+
+    # Get all bets by this user, live and archived
+    bet_querysets = [Bet.objects.filter(user=user), ArchivedBet.objects.filter(user=user)]
+    user_bets = recent([qs.select_related('round') for qs in bet_querysets], 'bets', 200, 50)
+    
+    # Lifetime stats (always needed), maintained incrementally
+    stats = get_betting_stats(user.id)
+    total_bets = stats['total_bets']
+    total_bet_amount = stats['total_wagered']
+    total_wins = stats['total_wins']
+    total_payouts = stats['total_payouts']
     
     # Get user's transactions
-    user_transactions = Transaction.objects.filter(user=user).order_by('-created_at')
-    if active_tab == 'transactions':
-        user_transactions = user_transactions[:200]
-    else:
-        user_transactions = user_transactions[:50]
+    user_transactions = recent([Transaction.objects.filter(user=user)], 'transactions', 200, 50)
     
     # Get user's deposit requests
-    user_deposits = DepositRequest.objects.filter(user=user).order_by('-created_at')
-    if active_tab == 'deposits':
-        user_deposits = user_deposits[:100]
-    else:
-        user_deposits = user_deposits[:20]
+    user_deposits = recent([DepositRequest.objects.filter(user=user)], 'deposits', 100, 20)
 
     # Get user's withdraw requests
-    user_withdrawals = WithdrawRequest.objects.filter(user=user).order_by('-created_at')
-    if active_tab == 'withdrawals':
-        user_withdrawals = user_withdrawals[:100]
-    else:
-        user_withdrawals = user_withdrawals[:20]
+    user_withdrawals = recent([WithdrawRequest.objects.filter(user=user)], 'withdrawals', 100, 20)
     
     context = get_admin_context(request, {
         'user': user,
@@ -799,32 +790,26 @@ def user_details(request, user_id):
         'user_deposits': user_deposits,
         'user_withdrawals': user_withdrawals,
         'active_tab': active_tab,
+        'cursor': cursor,
+        'next_cursor': next_cursor,
         'page': 'user-details',
     })
     
     return render(request, 'admin/user_details.html', context)
 
-@admin_required
-def all_bets(request):
-    """All bets page"""
-    if not has_menu_permission(request.user, 'all_bets'):
-        messages.error(request, 'You do not have permission to view all bets.')
-        return redirect('admin_dashboard')
-
-    # Get filter parameters
+def _bet_filter(request):
+    """Q for the All Bets page filters (search, status, user), scoped to the admin's players; fits Bet and ArchivedBet"""
     search_query = request.GET.get('search', '').strip()
     status_filter = request.GET.get('status', 'all') # all, winners, losers
 
-    # Get all bets
-    all_bets_list = Bet.objects.select_related('user', 'round').all().order_by('-created_at')
-
+    condition = Q()
     # If not super admin, filter by worker's clients
     if not is_super_admin(request.user):
-        all_bets_list = all_bets_list.filter(user__worker=request.user)
+        condition &= Q(user__worker=request.user)
 
     # Apply search filter
     if search_query:
-        all_bets_list = all_bets_list.filter(
+        condition &= (
             Q(user__username__icontains=search_query) |
             Q(user__phone_number__icontains=search_query) |
             Q(round__round_id__icontains=search_query)
@@ -832,15 +817,59 @@ def all_bets(request):
 
     # Apply status filter
     if status_filter == 'winners':
-        all_bets_list = all_bets_list.filter(is_winner=True)
+        condition &= Q(is_winner=True)
     elif status_filter == 'losers':
-        all_bets_list = all_bets_list.filter(is_winner=False)
+        condition &= Q(is_winner=False)
+
+    # Export from the user details page
+    if request.GET.get('user_id', '').isdigit():
+        condition &= Q(user_id=int(request.GET['user_id']))
+    return condition
+
+
+def _filter_bets(request):
+    """Live bets matching the All Bets page filters, newest first"""
+    return Bet.objects.select_related('user', 'round').filter(_bet_filter(request)).order_by('-created_at')
+
+
+@admin_required
+def all_bets(request):
+    """All bets page"""
+    if not has_menu_permission(request.user, 'all_bets'):
+        messages.error(request, 'You do not have permission to view all bets.')
+        return redirect('admin_dashboard')
+
+    search_query = request.GET.get('search', '').strip()
+    status_filter = request.GET.get('status', 'all') # all, winners, losers
+    all_bets_list = _filter_bets(request)
 
-    # Calculate stats for the current filter (before slicing)
-    total_bets_count = all_bets_list.count()
-    total_bets_amount = all_bets_list.aggregate(Sum('chip_amount'))['chip_amount__sum'] or 0
-    total_payouts = all_bets_list.aggregate(Sum('payout_amount'))['payout_amount__sum'] or 0
-    total_winners = all_bets_list.filter(is_winner=True).count()
+    # Stats for the current filter over live and archived bets; the unfiltered
+    # totals come from the per-user stats rows instead of scanning every bet.
+    if not search_query and status_filter == 'all':
+        user_stats = UserBettingStats.objects.all()
+        if not is_super_admin(request.user):
+            user_stats = user_stats.filter(user__worker=request.user)
+        totals = user_stats.aggregate(
+            bets=Sum('total_bets'), amount=Sum('total_wagered'),
+            payouts=Sum('total_payouts'), winners=Sum('total_wins'),
+        )
+        total_bets_count = totals['bets'] or 0
+        total_bets_amount = totals['amount'] or 0
+        total_payouts = totals['payouts'] or 0
+        total_winners = totals['winners'] or 0
+    else:
+        # Same scope as the stats rows: live and archived bets
+        condition = _bet_filter(request)
+        total_bets_count = total_bets_amount = total_payouts = total_winners = 0
+        for bets in (Bet.objects.filter(condition), ArchivedBet.objects.filter(condition)):
+            totals = bets.aggregate(
+                count=Count('id'), amount=Sum('chip_amount'), payouts=Sum('payout_amount'),
+                winners=Count('id', filter=Q(is_winner=True)),
+            )
+            total_bets_count += totals['count']
+            total_bets_amount += totals['amount'] or 0
+            total_payouts += totals['payouts'] or 0
+            total_winners += totals['winners']
 
     # Limit results for performance
     all_bets_list = all_bets_list[:200]
@@ -858,18 +887,12 @@ def all_bets(request):
 
     return render(request, 'admin/all_bets.html', context)
 
-@admin_required
-def wallets(request):
-    """Wallets page with filters"""
-    if not has_menu_permission(request.user, 'wallets'):
-        messages.error(request, 'You do not have permission to view wallets.')
-        return redirect('admin_dashboard')
-        
-    # Get filter parameters
+def _filter_wallets(request):
+    """Wallets matching the Wallets page filters (balance, search) in the selected order"""
     balance_filter = request.GET.get('balance', 'all')  # all, has_balance, zero
     search_query = request.GET.get('search', '').strip()
     sort_by = request.GET.get('sort', 'balance_desc')  # balance_desc, balance_asc, username_asc, username_desc
-    
+
     # Build query
     wallets_query = Wallet.objects.select_related('user').all()
     
@@ -898,6 +921,19 @@ def wallets(request):
         wallets_query = wallets_query.order_by('-user__username')
     else:
         wallets_query = wallets_query.order_by('-balance')  # default
+    return wallets_query
+
+@admin_required
+def wallets(request):
+    """Wallets page with filters"""
+    if not has_menu_permission(request.user, 'wallets'):
+        messages.error(request, 'You do not have permission to view wallets.')
+        return redirect('admin_dashboard')
+        
+    balance_filter = request.GET.get('balance', 'all')  # all, has_balance, zero
+    search_query = request.GET.get('search', '').strip()
+    sort_by = request.GET.get('sort', 'balance_desc')  # balance_desc, balance_asc, username_asc, username_desc
+    wallets_query = _filter_wallets(request)
     
     # Calculate stats (before filtering for accurate totals)
     total_wallets = Wallet.objects.count()
@@ -919,14 +955,8 @@ def wallets(request):
     
     return render(request, 'admin/wallets.html', context)
 
-@admin_required
-def deposit_requests(request):
-    """Deposit requests page"""
-    if not has_menu_permission(request.user, 'deposit_requests'):
-        messages.error(request, 'You do not have permission to view deposit requests.')
-        return redirect('admin_dashboard')
-        
-    # Get search and status filters
+def _filter_deposit_requests(request):
+    """Deposit requests matching the Deposit Requests page filters (search, status), newest first"""
     search_query = request.GET.get('search', '').strip()
     status_filter = request.GET.get('status', '').strip()
     
@@ -943,9 +973,25 @@ def deposit_requests(request):
         
     if status_filter:
         deposit_requests_list = deposit_requests_list.filter(status=status_filter)
+
+    # Export from the user details page
+    if request.GET.get('user_id', '').isdigit():
+        deposit_requests_list = deposit_requests_list.filter(user_id=int(request.GET['user_id']))
         
     # Order by most recent
-    deposit_requests_list = deposit_requests_list.order_by('-created_at')
+    return deposit_requests_list.order_by('-created_at')
+
+@admin_required
+def deposit_requests(request):
+    """Deposit requests page"""
+    if not has_menu_permission(request.user, 'deposit_requests'):
+        messages.error(request, 'You do not have permission to view deposit requests.')
+        return redirect('admin_dashboard')
+        
+    # Get search and status filters
+    search_query = request.GET.get('search', '').strip()
+    status_filter = request.GET.get('status', '').strip()
+    deposit_requests_list = _filter_deposit_requests(request)
     
     # Calculate stats (totals always based on full dataset)
     stats_base = DepositRequest.objects.all()
@@ -1018,12 +1064,6 @@ def approve_deposit(request, pk):
                 messages.error(request, 'Deposit request has already been processed.')
                 return redirect('deposit_requests')
             
-            wallet, _ = Wallet.objects.get_or_create(user=deposit.user)
-            wallet = Wallet.objects.select_for_update().get(pk=wallet.pk)
-            balance_before = wallet.balance
-            wallet.balance = balance_before + deposit.amount
-            wallet.save()
-            
             deposit.status = 'APPROVED'
             deposit.processed_by = request.user
             deposit.processed_at = timezone.now()
@@ -1041,16 +1081,22 @@ def approve_deposit(request, pk):
             if note:
                 deposit.admin_note = note
             deposit.save()
+
+            # Credit only once the request is valid (UTR present)
+            Wallet.objects.get_or_create(user=deposit.user)
+            balance_after = Wallet.credit(deposit.user_id, deposit.amount)
+            balance_before = balance_after - deposit.amount
             
             Transaction.objects.create(
                 user=deposit.user,
                 transaction_type='DEPOSIT',
                 amount=deposit.amount,
                 balance_before=balance_before,
-                balance_after=wallet.balance,
+                balance_after=balance_after,
                 description=f"Manual deposit approved #{deposit.id}{f'. {deposit.admin_note}' if deposit.admin_note else ''}",
             )
         
+        notify_user(deposit.user, f"Your deposit of ₹{deposit.amount} has been approved.", wallet_balance=balance_after)
         messages.success(request, f'Deposit request #{deposit.id} approved. ₹{deposit.amount} added to {deposit.user.username}\'s wallet.')
     except DepositRequest.DoesNotExist:
         messages.error(request, 'Deposit request not found.')
@@ -1080,6 +1126,7 @@ def reject_deposit(request, pk):
                 deposit.processed_at = timezone.now()
                 deposit.save()
             
+            notify_user(deposit.user, f"Your deposit of ₹{deposit.amount} was rejected. {note}".strip())
             messages.success(request, f'Deposit request #{deposit.id} rejected.')
         except DepositRequest.DoesNotExist:
             messages.error(request, 'Deposit request not found.')
@@ -1191,16 +1238,13 @@ def approve_withdraw(request, pk):
                 messages.error(request, 'Withdraw request has already been processed.')
                 return redirect('withdraw_requests')
             
-            wallet, _ = Wallet.objects.get_or_create(user=withdraw.user)
-            wallet = Wallet.objects.select_for_update().get(pk=wallet.pk)
-            
-            if wallet.balance < withdraw.amount:
+            Wallet.objects.get_or_create(user=withdraw.user)
+            # Conditional debit: no overdraft even if the user is betting right now
+            balance_after = Wallet.debit(withdraw.user_id, withdraw.amount)
+            if balance_after is None:
                 messages.error(request, f'Insufficient balance in {withdraw.user.username}\'s wallet.')
                 return redirect('withdraw_requests')
-
-            balance_before = wallet.balance
-            wallet.balance = balance_before - withdraw.amount
-            wallet.save()
+            balance_before = balance_after + withdraw.amount
             
             withdraw.status = 'APPROVED'
             withdraw.processed_by = request.user
@@ -1272,10 +1316,11 @@ def approve_withdraw(request, pk):
                 transaction_type='WITHDRAW',
                 amount=withdraw.amount,
                 balance_before=balance_before,
-                balance_after=wallet.balance,
+                balance_after=balance_after,
                 description=f"Manual withdraw approved #{withdraw.id}{f'. {withdraw.admin_note}' if withdraw.admin_note else ''}",
             )
         
+        notify_user(withdraw.user, f"Your withdrawal of ₹{withdraw.amount} has been approved.", wallet_balance=balance_after)
         messages.success(request, f'Withdraw request #{withdraw.id} approved. ₹{withdraw.amount} deducted from {withdraw.user.username}\'s wallet.')
     except WithdrawRequest.DoesNotExist:
         messages.error(request, 'Withdraw request not found.')
@@ -1303,6 +1348,7 @@ def reject_withdraw(request, pk):
                 withdraw.processed_at = timezone.now()
                 withdraw.save()
             
+            notify_user(withdraw.user, f"Your withdrawal of ₹{withdraw.amount} was rejected. {note}".strip())
             messages.success(request, f'Withdraw request #{withdraw.id} rejected.')
         except WithdrawRequest.DoesNotExist:
             messages.error(request, 'Withdraw request not found.')
@@ -1320,39 +1366,54 @@ def transactions(request):
 
     # Get search filter
     search_query = request.GET.get('search', '').strip()
-    
-    # Base transaction queryset
-    transactions_query = Transaction.objects.all()
-    
-    # Apply search filter (filter by user)
+
+    from datetime import timedelta
+    from django.db.models.functions import TruncDate
+
+    thirty_days_ago = timezone.now().date() - timedelta(days=29)
+
     if search_query:
-        transactions_query = transactions_query.filter(
+        # Per-user figures are not in the rollup: aggregate the user's transactions
+        transactions_query = Transaction.objects.filter(
             Q(user__username__icontains=search_query) |
             Q(user__phone_number__icontains=search_query)
         )
-
-    # Calculate stats directly from database
-    total_transactions = transactions_query.count()
-    total_deposits = transactions_query.filter(transaction_type='DEPOSIT').aggregate(Sum('amount'))['amount__sum'] or 0
-    total_withdraws = transactions_query.filter(transaction_type='WITHDRAW').aggregate(Sum('amount'))['amount__sum'] or 0
-    total_bets = transactions_query.filter(transaction_type='BET').aggregate(Sum('amount'))['amount__sum'] or 0
-    total_wins = transactions_query.filter(transaction_type='WIN').aggregate(Sum('amount'))['amount__sum'] or 0
+        type_totals = {
+            row['transaction_type']: (row['total'] or 0, row['count'])
+            for row in transactions_query.values('transaction_type').annotate(
+                total=Sum('amount'), count=Count('id')
+            ).order_by()
+        }
+        daily_stats = transactions_query.filter(
+            created_at__date__gte=thirty_days_ago,
+            transaction_type__in=['BET', 'WIN']
+        ).annotate(
+            date=TruncDate('created_at')
+        ).values('date', 'transaction_type').annotate(
+            daily_amount=Sum('amount')
+        ).order_by('date')
+    else:
+        # Totals and chart come from the daily rollup (a few rows per day)
+        type_totals = {
+            row['transaction_type']: (row['total'] or 0, row['count'] or 0)
+            for row in DailyFinancialSummary.objects.values('transaction_type').annotate(
+                total=Sum('total_amount'), count=Sum('transaction_count')
+            ).order_by()
+        }
+        daily_stats = DailyFinancialSummary.objects.filter(
+            date__gte=thirty_days_ago,
+            transaction_type__in=['BET', 'WIN']
+        ).values('date', 'transaction_type').annotate(
+            daily_amount=Sum('total_amount')
+        ).order_by('date')
+
+    total_transactions = sum(count for _, count in type_totals.values())
+    total_deposits = type_totals.get('DEPOSIT', (0, 0))[0]
+    total_withdraws = type_totals.get('WITHDRAW', (0, 0))[0]
+    total_bets = type_totals.get('BET', (0, 0))[0]
+    total_wins = type_totals.get('WIN', (0, 0))[0]
     admin_profit = total_bets - total_wins
 
-    # Calculate last 30 days profit data for chart
-    from datetime import timedelta
-    from django.db.models.functions import TruncDate
-    
-    thirty_days_ago = timezone.now().date() - timedelta(days=29)
-    daily_stats = transactions_query.filter(
-        created_at__date__gte=thirty_days_ago,
-        transaction_type__in=['BET', 'WIN']
-    ).annotate(
-        date=TruncDate('created_at')
-    ).values('date', 'transaction_type').annotate(
-        daily_amount=Sum('amount')
-    ).order_by('date')
-
     # Process daily stats into a format for the chart
     profit_data_map = {}
     for i in range(30):
@@ -1362,6 +1423,8 @@ def transactions(request):
     for stat in daily_stats:
         date = stat['date']
         amount = stat['daily_amount']
+        if date not in profit_data_map:
+            continue
         if stat['transaction_type'] == 'BET':
             profit_data_map[date] += amount
         else:
@@ -2059,3 +2122,80 @@ def toggle_payment_method(request, pk):
     status = "activated" if method.is_active else "deactivated"
     messages.success(request, f'Payment method "{method.name}" {status} successfully!')
     return redirect('payment_methods')
+
+
+# ----------------------------------------------------------------------
+# CSV exports (streamed, same filters as the pages)
+# ----------------------------------------------------------------------
+
+@admin_required
+def export_bets_csv(request):
+    """Stream bets matching the All Bets filters (``?user_id=`` for one player) as CSV"""
+    if not has_menu_permission(request.user, 'all_bets'):
+        messages.error(request, 'You do not have permission to view all bets.')
+        return redirect('admin_dashboard')
+    return stream_csv(
+        'bets',
+        ['Bet ID', 'Created', 'Round', 'User', 'Number', 'Chip Amount', 'Payout', 'Winner'],
+        _filter_bets(request),
+        ['id', 'created_at', 'round__round_id', 'user__username', 'number', 'chip_amount', 'payout_amount', 'is_winner'],
+        {1: format_datetime},
+    )
+
+
+@admin_required
+def export_wallets_csv(request):
+    """Stream wallets matching the Wallets page filters as CSV"""
+    if not has_menu_permission(request.user, 'wallets'):
+        messages.error(request, 'You do not have permission to view wallets.')
+        return redirect('admin_dashboard')
+    return stream_csv(
+        'wallets',
+        ['User ID', 'User', 'Phone', 'Balance', 'Updated'],
+        _filter_wallets(request),
+        ['user_id', 'user__username', 'user__phone_number', 'balance', 'updated_at'],
+        {4: format_datetime},
+    )
+
+
+@admin_required
+def export_transactions_csv(request):
+    """Stream transactions as CSV: Reports search (``?search=``), ``?user_id=`` and ``?type=``"""
+    if not has_menu_permission(request.user, 'transactions'):
+        messages.error(request, 'You do not have permission to view reports.')
+        return redirect('admin_dashboard')
+    transactions_query = Transaction.objects.order_by('-created_at')
+    search_query = request.GET.get('search', '').strip()
+    if search_query:
+        transactions_query = transactions_query.filter(
+            Q(user__username__icontains=search_query) |
+            Q(user__phone_number__icontains=search_query)
+        )
+    if request.GET.get('user_id', '').isdigit():
+        transactions_query = transactions_query.filter(user_id=int(request.GET['user_id']))
+    transaction_type = request.GET.get('type', '').strip().upper()
+    if transaction_type:
+        transactions_query = transactions_query.filter(transaction_type=transaction_type)
+    return stream_csv(
+        'transactions',
+        ['Transaction ID', 'Created', 'User', 'Type', 'Amount', 'Balance Before', 'Balance After', 'Description'],
+        transactions_query,
+        ['id', 'created_at', 'user__username', 'transaction_type', 'amount', 'balance_before', 'balance_after', 'description'],
+        {1: format_datetime},
+    )
+
+
+@admin_required
+def export_deposit_requests_csv(request):
+    """Stream deposit requests matching the Deposit Requests filters as CSV"""
+    if not has_menu_permission(request.user, 'deposit_requests'):
+        messages.error(request, 'You do not have permission to view deposit requests.')
+        return redirect('admin_dashboard')
+    return stream_csv(
+        'deposit_requests',
+        ['Request ID', 'Created', 'User', 'Amount', 'Status', 'Payment Reference', 'Processed By', 'Processed At', 'Admin Note'],
+        _filter_deposit_requests(request),
+        ['id', 'created_at', 'user__username', 'amount', 'status', 'payment_reference',
+         'processed_by__username', 'processed_at', 'admin_note'],
+        {1: format_datetime, 7: format_datetime},
+    )
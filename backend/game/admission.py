@@ -0,0 +1,171 @@
+"""
+Admission control for GameConsumer sockets, per ASGI process.
+
+After a deploy or a Redis blip every client reconnects at once. Each connect
+joins channel-layer groups and loads the round state, so an unthrottled storm
+saturates the channel layer and the database. Connects are admitted by:
+
+- a token bucket (WS_ACCEPT_RATE per second, bursts of WS_ACCEPT_BURST)
+- a cap on open sockets per process (WS_MAX_CONNECTIONS)
+
+A rejected client is told when to come back. The socket is accepted, sent a
+``reconnect`` message, and closed with code RETRY_CLOSE_CODE_BASE + seconds, so
+clients that only see the close code still get the hint. When the bucket is
+empty, rejected clients get a queue position: the Nth one is asked to wait
+about N / WS_ACCEPT_RATE seconds, with jitter, so retries arrive spread out
+instead of as a second wave.
+
+On SIGTERM the process stops admitting, closes its sockets in WS_DRAIN_WAVES
+staggered waves over WS_DRAIN_SECONDS, each with a jittered hint, and then
+hands the signal to the server's own handler.
+"""
+import asyncio
+import logging
+import os
+import random
+import signal
+import threading
+import time
+
+from django.conf import settings
+
+logger = logging.getLogger('game.websocket')
+
+# Close code 4100 + N: reconnect in N seconds
+RETRY_CLOSE_CODE_BASE = 4100
+MAX_RETRY_AFTER = 120
+# Hint range when this process is full or draining (other workers have room)
+FULL_RETRY_AFTER = (5, 30)
+JITTER = 0.2
+
+
+class TokenBucket:
+    """
+    Token bucket that hands rejected callers a place in line: ``take()`` returns
+    0 when a token is available now, else the seconds until the caller's turn.
+    Rejections never consume tokens, so clients returning on their hint find
+    the tokens that refilled meanwhile. The line drains at ``rate`` per second
+    (as the clients it was told about come back) and is bounded to ``max_wait``
+    seconds.
+    """
+    def __init__(self, rate, burst, max_wait=MAX_RETRY_AFTER):
+        self.rate = rate
+        self.burst = burst
+        self.max_queued = rate * max_wait
+        self.tokens = burst
+        self.queued = 0
+        self.updated_at = time.monotonic()
+
+    def take(self):
+        now = time.monotonic()
+        elapsed = now - self.updated_at
+        self.tokens = min(self.burst, self.tokens + elapsed * self.rate)
+        self.queued = max(0, self.queued - elapsed * self.rate)
+        self.updated_at = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0
+        self.queued = min(self.max_queued, self.queued + 1)
+        return (self.queued - self.tokens) / self.rate
+
+
+_bucket = None
+_connections = set()
+_draining = False
+_drain_handler_installed = False
+
+
+def _get_bucket():
+    global _bucket
+    if _bucket is None:
+        _bucket = TokenBucket(settings.WS_ACCEPT_RATE, settings.WS_ACCEPT_BURST)
+    return _bucket
+
+
+def _jittered(seconds):
+    seconds *= random.uniform(1 - JITTER, 1 + JITTER)
+    return max(1, min(MAX_RETRY_AFTER, round(seconds)))
+
+
+def close_code(retry_after):
+    return RETRY_CLOSE_CODE_BASE + retry_after
+
+
+def connection_count():
+    return len(_connections)
+
+
+def is_draining():
+    return _draining
+
+
+def admit(consumer):
+    """
+    Admit a connecting consumer (returns None) or return the seconds it should
+    wait before reconnecting. Admitted consumers must call ``release()`` on
+    disconnect.
+    """
+    if _draining:
+        return _jittered(random.uniform(*FULL_RETRY_AFTER))
+    if len(_connections) >= settings.WS_MAX_CONNECTIONS:
+        logger.warning(f"WebSocket connection cap reached ({len(_connections)}), rejecting connect")
+        return _jittered(random.uniform(*FULL_RETRY_AFTER))
+    wait = _get_bucket().take()
+    if wait:
+        return _jittered(wait)
+    _connections.add(consumer)
+    _install_drain_handler()
+    return None
+
+
+def release(consumer):
+    _connections.discard(consumer)
+
+
+async def drain():
+    """Close every admitted socket in staggered waves, each with a reconnect hint."""
+    global _draining
+    _draining = True
+    consumers = list(_connections)
+    random.shuffle(consumers)
+    waves = max(1, settings.WS_DRAIN_WAVES)
+    interval = settings.WS_DRAIN_SECONDS / waves
+    logger.info(f"Draining {len(consumers)} WebSocket connections in {waves} waves")
+    for wave in range(waves):
+        batch = consumers[wave::waves]
+        await asyncio.gather(
+            *(consumer.reject(_jittered(random.uniform(1, settings.WS_DRAIN_SECONDS)), 'draining') for consumer in batch),
+            return_exceptions=True
+        )
+        if wave < waves - 1:
+            await asyncio.sleep(interval)
+    logger.info("WebSocket drain complete")
+
+
+def _install_drain_handler():
+    """
+    Wrap the server's SIGTERM handler (Daphne installs one at startup) so the
+    sockets are drained before it runs. Only possible from the main thread,
+    i.e. not under the autoreloading runserver.
+    """
+    global _drain_handler_installed
+    if _drain_handler_installed or threading.current_thread() is not threading.main_thread():
+        return
+    _drain_handler_installed = True
+    loop = asyncio.get_running_loop()
+    previous = signal.getsignal(signal.SIGTERM)
+
+    def shut_down(_task=None):
+        signal.signal(signal.SIGTERM, previous if previous is not None else signal.SIG_DFL)
+        os.kill(os.getpid(), signal.SIGTERM)
+
+    def handle_sigterm(signum, frame):
+        global _draining
+        if _draining:
+            # Second SIGTERM: stop waiting for the drain
+            return shut_down()
+        _draining = True
+        logger.info("SIGTERM received, draining WebSocket connections")
+        loop.call_soon_threadsafe(lambda: loop.create_task(drain()).add_done_callback(shut_down))
+
+    signal.signal(signal.SIGTERM, handle_sigterm)
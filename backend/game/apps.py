@@ -6,6 +6,8 @@ class GameConfig(AppConfig):
     name = 'game'
 
     def ready(self):
+        import game.signals  # noqa
+
         # Explicitly unregister GameSettings from admin when app is ready
         from django.contrib import admin
         from .models import GameSettings
@@ -0,0 +1,80 @@
+"""
+Hot/cold archival of completed rounds.
+
+Completed rounds older than the retention window are copied, together with
+their bets and dice result, into ArchivedRound/ArchivedBet and deleted from
+GameRound, Bet and DiceResult. The live tables then only hold recent rounds,
+so the dashboard's counts and aggregates stay fast. Archived rows keep their
+round_id and bet ids and are still shown by round_details and user_details.
+
+Rounds that still have PendingPayment rows are left in place: those reference
+the live Bet and would be cascade-deleted with it.
+"""
+import logging
+
+from django.db import transaction
+
+from accounts.models import PendingPayment
+from .models import GameRound, Bet, DiceResult, ArchivedRound, ArchivedBet
+
+logger = logging.getLogger('game')
+
+ROUND_FIELDS = [
+    'round_id', 'table', 'status', 'dice_result',
+    'dice_1', 'dice_2', 'dice_3', 'dice_4', 'dice_5', 'dice_6',
+    'start_time', 'result_time', 'end_time', 'total_bets', 'total_amount',
+]
+BET_FIELDS = ['id', 'user_id', 'number', 'chip_amount', 'payout_amount', 'is_winner', 'created_at']
+
+
+def archivable_rounds(cutoff):
+    """Completed rounds that started before ``cutoff`` and can be archived."""
+    return (
+        GameRound.objects.filter(status='COMPLETED', start_time__lt=cutoff)
+        .exclude(id__in=PendingPayment.objects.values('round_id'))
+        .order_by('start_time')
+    )
+
+
+def archive_batch(cutoff, batch_size=500):
+    """
+    Archive up to ``batch_size`` of the oldest archivable rounds in one
+    transaction. Returns ``(rounds, bets)`` archived; ``(0, 0)`` when done.
+    """
+    with transaction.atomic():
+        rounds = list(archivable_rounds(cutoff).select_for_update(skip_locked=True)[:batch_size])
+        if not rounds:
+            return 0, 0
+        round_ids = [r.id for r in rounds]
+        results = {
+            d.round_id: d for d in DiceResult.objects.filter(round_id__in=round_ids)
+        }
+
+        archived = ArchivedRound.objects.bulk_create([
+            ArchivedRound(
+                **{field: getattr(r, field) for field in ROUND_FIELDS},
+                result_set_by_id=results[r.id].set_by_id if r.id in results else None,
+                result_set_at=results[r.id].set_at if r.id in results else None,
+            )
+            for r in rounds
+        ])
+        # bulk_create doesn't return primary keys on every backend
+        archived_ids = dict(
+            ArchivedRound.objects.filter(round_id__in=[a.round_id for a in archived])
+            .values_list('round_id', 'id')
+        )
+        live_to_archived = {r.id: archived_ids[r.round_id] for r in rounds}
+
+        bets = Bet.objects.filter(round_id__in=round_ids).values_list('round_id', *BET_FIELDS)
+        archived_bets = [
+            ArchivedBet(round_id=live_to_archived[row[0]], **dict(zip(BET_FIELDS, row[1:])))
+            for row in bets.iterator(chunk_size=2000)
+        ]
+        ArchivedBet.objects.bulk_create(archived_bets, batch_size=2000)
+
+        Bet.objects.filter(round_id__in=round_ids).delete()
+        DiceResult.objects.filter(round_id__in=round_ids).delete()
+        GameRound.objects.filter(id__in=round_ids).delete()
+
+    logger.info(f"Archived {len(rounds)} rounds and {len(archived_bets)} bets (up to {rounds[-1].round_id})")
+    return len(rounds), len(archived_bets)
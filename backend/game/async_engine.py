@@ -0,0 +1,331 @@
+"""
+asyncio variant of the deadline round scheduler (``start_game_timer --mode async``).
+
+The round logic is the same as DeadlineRoundRunner; what changes is how I/O is
+done:
+
+- broadcasts await ``channel_layer.group_send`` on one long-lived event loop
+  instead of spinning up ``async_to_sync`` for every message
+- Redis writes go through ``redis.asyncio``
+- every database call runs in a small, bounded thread pool
+  (GAME_TIMER_DB_WORKERS), so the tick loop never waits on a DB round-trip
+- settlement runs in the background once the dice are stored: ``dice_result`` is
+  broadcast right away and timer ticks keep flowing while payouts are written.
+  The round does not complete until its settlement has finished.
+"""
+import asyncio
+import functools
+import json
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import redis.asyncio as aioredis
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils import timezone
+
+from .round_scheduler import DeadlineRoundRunner, RoundSchedule, retry_delay
+from .timer_lease import LeaseLost
+from .bet_pool import queue_new_pool
+from .broadcast import with_frame
+from .tables import round_key, timer_key, group_name
+
+logger = logging.getLogger('game.timer')
+
+
+def _run_db(fn, *args):
+    """Run ``fn`` in an executor thread, the way a request would: fresh connection state."""
+    close_old_connections()
+    try:
+        return fn(*args)
+    finally:
+        close_old_connections()
+
+
+def run_tables(tables, *args, **kwargs):
+    """Drive every table from one event loop, sharing a single bounded DB executor."""
+    db_executor = ThreadPoolExecutor(
+        max_workers=getattr(settings, 'GAME_TIMER_DB_WORKERS', 2),
+        thread_name_prefix='game-timer-db',
+    )
+    engines = [AsyncRoundEngine(*args, table=table, db_executor=db_executor, **kwargs) for table in tables]
+    engines[0].stdout.write(engines[0].style.SUCCESS(
+        f'Async engine started for tables: {", ".join(tables)} (DB work in a bounded executor)'
+    ))
+
+    async def main():
+        # One failing table must not cancel the others
+        await asyncio.gather(*(engine._supervised() for engine in engines), return_exceptions=True)
+    asyncio.run(main())
+
+
+class AsyncRoundEngine(DeadlineRoundRunner):
+    def __init__(self, *args, db_executor=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.db_executor = db_executor or ThreadPoolExecutor(
+            max_workers=getattr(settings, 'GAME_TIMER_DB_WORKERS', 2),
+            thread_name_prefix='game-timer-db',
+        )
+        self.aredis = None
+
+    def run(self):
+        self.stdout.write(self.style.SUCCESS('Async engine started (DB work in a bounded executor)'))
+        asyncio.run(self._supervised())
+
+    async def _supervised(self):
+        """Run ``_main`` forever, restarting it if anything escapes its own retry loop."""
+        failures = 0
+        while True:
+            try:
+                await self._main()
+            except Exception as e:
+                failures += 1
+                logger.exception(f"Async game engine for table {self.table} stopped: {e} - restarting")
+                await asyncio.sleep(retry_delay(failures))
+
+    async def _main(self):
+        self.aredis = self._connect_redis()
+        # round_obj None means "pick the current round back up from the database";
+        # that recovery runs inside the try so its own failures are retried too.
+        round_obj, resumed = None, False
+        failures = 0
+        while True:
+            try:
+                if round_obj is None:
+                    self._check_lease()
+                    round_obj, resumed = await self._resume_or_create_round()
+                round_obj = await self._run_round(round_obj, resumed)
+                resumed = False
+                failures = 0
+            except LeaseLost:
+                self.stdout.write(self.style.WARNING('Game timer lease lost - standing by'))
+                await asyncio.get_running_loop().run_in_executor(None, self.lease.wait_for_leadership)
+                self.stdout.write(self.style.SUCCESS(f'Acquired game timer lease (epoch {self.lease.epoch}) - resuming rounds'))
+                round_obj = None
+            except Exception as e:
+                failures += 1
+                logger.exception(f"Critical error in async game engine: {e}")
+                self.stdout.write(self.style.ERROR(f'Error: {e}'))
+                await asyncio.sleep(retry_delay(failures))
+                self.channel_layer = self.get_channel_layer()
+                self.aredis = self._connect_redis()
+                round_obj = None
+
+    def _connect_redis(self):
+        if not self.redis_client:
+            return None
+        redis_kwargs = {
+            'host': settings.REDIS_HOST,
+            'port': settings.REDIS_PORT,
+            'db': settings.REDIS_DB,
+            'decode_responses': True,
+            'socket_connect_timeout': 5,
+            'socket_timeout': 5,
+        }
+        if getattr(settings, 'REDIS_PASSWORD', None):
+            redis_kwargs['password'] = settings.REDIS_PASSWORD
+        return aioredis.Redis(**redis_kwargs)
+
+    async def _db(self, fn, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.db_executor, functools.partial(_run_db, fn, *args))
+
+    # ------------------------------------------------------------------
+    # Round lifecycle
+    # ------------------------------------------------------------------
+
+    async def _run_round(self, round_obj, resumed):
+        schedule = RoundSchedule(round_obj)
+        round_data = self._round_data(round_obj)
+
+        first_timer = schedule.timer_at(time.monotonic())
+        betting_closed = round_obj.status != 'BETTING'
+        dice_roll_sent = resumed and first_timer > schedule.dice_roll
+        result_done = resumed and await self._dice_result_already_sent(round_obj)
+        game_start_timer = None if resumed else first_timer
+        settlement = None
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Schedule for {round_obj.round_id}: close>{schedule.betting_close}s, '
+            f'roll@{schedule.dice_roll}s, result@{schedule.dice_result}s, end@{schedule.round_end}s'
+        ))
+        if self.schedule_protocol:
+            await self._group_send(self._schedule_message(round_obj))
+
+        try:
+            while True:
+                self._check_lease()
+                now = time.monotonic()
+                if now >= schedule.end_deadline:
+                    if settlement is not None:
+                        try:
+                            await settlement
+                        except Exception as e:
+                            logger.exception(f"Settlement failed for round {round_obj.round_id}: {e}")
+                    return await self._finish_round(round_obj, schedule)
+
+                timer = schedule.timer_at(now)
+
+                if not betting_closed and timer > schedule.betting_close:
+                    await self._db(self._close_betting, round_obj)
+                    betting_closed = True
+                    if self.schedule_protocol:
+                        await self._group_send(self._betting_closed_message(round_obj))
+
+                if (not dice_roll_sent and schedule.dice_roll <= timer < schedule.dice_result):
+                    await self._send_dice_roll(round_obj, schedule, timer)
+                    dice_roll_sent = True
+
+                if not result_done and timer >= schedule.dice_result:
+                    settlement = await self._announce_result(round_obj, schedule, round_data)
+                    result_done = True
+
+                status = schedule.status_for(timer)
+                await self._publish_tick(round_obj, round_data, timer, status,
+                                         broadcast=(not self.schedule_protocol
+                                                    and timer != game_start_timer and timer != schedule.round_end))
+
+                next_deadline = min(schedule.deadline(timer + 1), schedule.end_deadline)
+                await asyncio.sleep(max(0.0, next_deadline - time.monotonic()))
+        finally:
+            if settlement is not None and not settlement.done():
+                # Leaving early (error or lost lease): let the payouts finish on
+                # their own; settlement is idempotent if the round is picked up again.
+                settlement.add_done_callback(self._log_settlement_error)
+
+    async def _resume_or_create_round(self):
+        round_obj = await self._db(self._find_live_round)
+        if round_obj:
+            return round_obj, True
+        return await self._start_new_round(), False
+
+    async def _start_new_round(self):
+        now = timezone.now()
+        for message in await self._db(self._complete_stale_rounds, now):
+            await self._group_send(message)
+        round_obj = await self._db(self._create_round, now)
+
+        if self.aredis:
+            try:
+                async with self.aredis.pipeline(transaction=False) as pipe:
+                    pipe.delete(f'dice_result_sent_{round_obj.round_id}')
+                    pipe.set(round_key(self.table), json.dumps({
+                        'round_id': round_obj.round_id,
+                        'status': 'BETTING',
+                        'start_time': round_obj.start_time.isoformat(),
+                        'timer': 1,
+                    }))
+                    pipe.set(timer_key(self.table), '1')
+                    queue_new_pool(pipe, round_obj.round_id)
+                    await pipe.execute()
+            except Exception as e:
+                self.stdout.write(self.style.WARNING(f'Redis write error: {e}'))
+
+        await self._group_send({
+            'type': 'game_start',
+            'round_id': round_obj.round_id,
+            'status': 'BETTING',
+            'timer': 1,
+        })
+        logger.info(f"New round created: {round_obj.round_id}")
+        self.stdout.write(self.style.SUCCESS(f'New round started: {round_obj.round_id}'))
+        return round_obj
+
+    async def _finish_round(self, round_obj, schedule):
+        message = await self._db(self._complete_round, round_obj, schedule)
+        if await self._group_send(message):
+            self.stdout.write(self.style.SUCCESS(f'📤 Sent game_end message for round {round_obj.round_id}'))
+        return await self._start_new_round()
+
+    # ------------------------------------------------------------------
+    # Phase transitions
+    # ------------------------------------------------------------------
+
+    async def _send_dice_roll(self, round_obj, schedule, timer):
+        if await self._group_send({
+            'type': 'dice_roll',
+            'round_id': round_obj.round_id,
+            'timer': timer,
+            'dice_roll_time': schedule.dice_roll,
+        }):
+            self.stdout.write(self.style.SUCCESS(f'📤 Sent dice_roll at timer {timer}s (animation start)'))
+
+    async def _announce_result(self, round_obj, schedule, round_data):
+        """Store the dice, start settlement in the background and broadcast the result."""
+        dice_values = await self._db(self._resolve_dice, round_obj, schedule)
+        self._check_lease()
+        settlement = asyncio.ensure_future(self._db(self._settle, round_obj, dice_values))
+        self._record_result(round_data, round_obj, dice_values)
+
+        lock_acquired = True
+        if self.aredis:
+            try:
+                lock_acquired = await self.aredis.set(
+                    f'dice_result_sent_{round_obj.round_id}', '1', ex=300, nx=True
+                )
+            except Exception as e:
+                self.stdout.write(self.style.WARNING(f'Redis lock error: {e}'))
+
+        if lock_acquired:
+            if await self._group_send(self._dice_result_message(round_obj, schedule, dice_values)):
+                self.stdout.write(self.style.SUCCESS(f'📤 Sent dice_result at timer {schedule.dice_result}s (result display)'))
+        else:
+            self.stdout.write(self.style.WARNING(f'⚠️ Dice_result already sent (lock exists) for round {round_obj.round_id}'))
+        return settlement
+
+    def _log_settlement_error(self, future):
+        if not future.cancelled() and future.exception():
+            logger.error(f"Settlement failed: {future.exception()}")
+
+    async def _dice_result_already_sent(self, round_obj):
+        if not self.aredis:
+            return False
+        try:
+            return bool(await self.aredis.get(f'dice_result_sent_{round_obj.round_id}'))
+        except Exception:
+            return False
+
+    # ------------------------------------------------------------------
+    # Per-second output (Redis + WebSocket, no database)
+    # ------------------------------------------------------------------
+
+    async def _publish_tick(self, round_obj, round_data, timer, status, broadcast=True):
+        round_data['status'] = status
+        round_data['timer'] = timer
+
+        if self.aredis:
+            try:
+                async with self.aredis.pipeline(transaction=False) as pipe:
+                    pipe.set(timer_key(self.table), str(timer))
+                    pipe.set(round_key(self.table), json.dumps(round_data))
+                    await pipe.execute()
+            except Exception as e:
+                self.stdout.write(self.style.WARNING(f'Redis write error: {e}'))
+
+        if broadcast:
+            if await self._group_send({
+                'type': 'game_timer',
+                'timer': timer,
+                'status': status,
+                'round_id': round_obj.round_id,
+            }):
+                logger.debug(f"Broadcasted timer: {timer}s, Status: {status}")
+                if timer % 10 == 0:
+                    self.stdout.write(self.style.SUCCESS(f'📤 Broadcast timer: {timer}s, Status: {status}'))
+
+        self.stdout.write(f"Timer: {timer}s, Status: {status}, Round: {round_obj.round_id}")
+
+    async def _group_send(self, message):
+        """Broadcast to the game room; returns False (and never raises) on failure."""
+        if not self.channel_layer:
+            return False
+        if self.lease and not self.lease.is_leader:
+            return False
+        try:
+            await self.channel_layer.group_send(group_name(self.table), with_frame(message))
+            return True
+        except Exception as e:
+            logger.error(f"Failed to broadcast {message.get('type')}: {e}")
+            self.channel_layer = self.get_channel_layer()
+            return False
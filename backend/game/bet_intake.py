@@ -0,0 +1,315 @@
+"""
+Redis bet intake with write-behind persistence (BET_INTAKE_MODE = 'redis').
+
+In the default 'db' mode every bet runs a handful of queries and updates the
+round row, so the last-second rush serializes on one GameRound row. In 'redis'
+mode place_bet/remove_bet only run a Lua script that, atomically:
+
+- rejects the bet if the round's betting cutoff has passed (Redis server time)
+  or the round has already been flushed
+- checks the user's wallet balance minus what they have reserved in every
+  round not yet flushed, on any table (the wallet is shared across tables)
+- accumulates the bet and the reservation, and appends to the round's event log
+
+Amounts are kept in integer cents. When betting closes, flush_round_bets()
+persists the round in one transaction: bulk_create of the Bet rows, one BET (and
+REFUND) Transaction per logged event with a proper balance chain, one debit per
+user wallet and a single update of the round totals. Settlement flushes first as
+well, so pending bets are never missed by calculate_payouts. The same transaction
+sets GameRound.bets_flushed; a flush finding it set (a retry after a crash
+between the commit and the Redis cleanup) writes nothing and only finishes the
+cleanup, so nothing is debited twice. The round's keys are cleared, and the
+users' reservations released, only once the transaction commits; until then the
+debited amount counts twice against the balance, which only errs towards
+rejecting a bet.
+
+Keys per round: ``bet_intake:{round_id}:bets`` (hash "user:number" -> cents),
+``:log`` (list "user:number:cents:B|R") and ``:closed`` (fence set before
+flushing). Per user: ``bet_intake:reserved:{user_id}`` (cents reserved by
+pending bets across rounds and tables).
+"""
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from accounts.models import Wallet, Transaction
+from accounts.financial_summary import add_to_daily_summary
+from accounts.notifications import push_to_users
+from .models import GameRound, Bet
+from .betting_stats import apply_stats
+
+logger = logging.getLogger('game')
+
+KEY_TTL_SECONDS = 3600
+CENTS = Decimal('100')
+
+# KEYS: bets, log, closed, user reservation
+# ARGV: user_id, number, amount_cents, balance_cents, close_at_ms, ttl
+ACCEPT_SCRIPT = """
+if redis.call('EXISTS', KEYS[3]) == 1 then return {-1, 0, 0} end
+local t = redis.call('TIME')
+local now_ms = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+if now_ms >= tonumber(ARGV[5]) then return {-1, 0, 0} end
+local amount = tonumber(ARGV[3])
+local reserved = tonumber(redis.call('GET', KEYS[4]) or '0')
+if tonumber(ARGV[4]) - reserved < amount then return {-2, reserved, 0} end
+local total = redis.call('HINCRBY', KEYS[1], ARGV[1] .. ':' .. ARGV[2], amount)
+reserved = redis.call('INCRBY', KEYS[4], amount)
+redis.call('RPUSH', KEYS[2], ARGV[1] .. ':' .. ARGV[2] .. ':' .. amount .. ':B')
+for _, i in ipairs({1, 2, 4}) do redis.call('EXPIRE', KEYS[i], tonumber(ARGV[6])) end
+return {1, reserved, total}
+"""
+
+# KEYS: bets, log, closed, user reservation
+# ARGV: user_id, number, close_at_ms
+CANCEL_SCRIPT = """
+if redis.call('EXISTS', KEYS[3]) == 1 then return {-1, 0} end
+local t = redis.call('TIME')
+local now_ms = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+if now_ms >= tonumber(ARGV[3]) then return {-1, 0} end
+local field = ARGV[1] .. ':' .. ARGV[2]
+local amount = tonumber(redis.call('HGET', KEYS[1], field) or '0')
+if amount == 0 then return {0, 0} end
+redis.call('HDEL', KEYS[1], field)
+if redis.call('DECRBY', KEYS[4], amount) <= 0 then redis.call('DEL', KEYS[4]) end
+redis.call('RPUSH', KEYS[2], field .. ':' .. amount .. ':R')
+return {1, amount}
+"""
+
+# KEYS: user reservation
+# ARGV: amount_cents
+RELEASE_SCRIPT = """
+local left = redis.call('DECRBY', KEYS[1], ARGV[1])
+if left <= 0 then redis.call('DEL', KEYS[1]) end
+return left
+"""
+
+ACCEPTED = 1
+CUTOFF_PASSED = -1
+INSUFFICIENT_BALANCE = -2
+
+
+def intake_enabled():
+    return getattr(settings, 'BET_INTAKE_MODE', 'db') == 'redis'
+
+
+def _keys(round_id):
+    prefix = f'bet_intake:{round_id}'
+    return [f'{prefix}:bets', f'{prefix}:log', f'{prefix}:closed']
+
+
+def _reserved_key(user_id):
+    return f'bet_intake:reserved:{user_id}'
+
+
+def to_cents(amount):
+    return int((Decimal(str(amount)) * CENTS).to_integral_value())
+
+
+def from_cents(cents):
+    return Decimal(int(cents)) / CENTS
+
+
+def betting_close_ms(round_data, default_betting_close):
+    """
+    Epoch milliseconds after which the round takes no more bets.
+    Same cutoff as the DB path: bets are accepted while the timer is below
+    betting_close, i.e. until ``betting_close - 1`` seconds after the start.
+    """
+    start_time = datetime.fromisoformat(round_data['start_time'])
+    betting_close = round_data.get('betting_close_seconds') or default_betting_close
+    return int((start_time + timedelta(seconds=betting_close - 1)).timestamp() * 1000)
+
+
+def accept_bet(redis_client, round_id, user_id, number, chip_amount, balance, close_at_ms):
+    """
+    Atomically validate and record a bet.
+    Returns ``(result, reserved, total)``: result is ACCEPTED, CUTOFF_PASSED or
+    INSUFFICIENT_BALANCE; reserved is the user's pending stake in all unflushed
+    rounds and total their stake on ``number`` in this round (both Decimal).
+    """
+    result, reserved, total = redis_client.eval(
+        ACCEPT_SCRIPT, 4, *_keys(round_id), _reserved_key(user_id),
+        user_id, number, to_cents(chip_amount), to_cents(balance), close_at_ms, KEY_TTL_SECONDS,
+    )
+    return int(result), from_cents(reserved), from_cents(total)
+
+
+def cancel_bet(redis_client, round_id, user_id, number, close_at_ms):
+    """Drop a pending bet. Returns ``(result, refunded_amount)``; result 0 means no such bet."""
+    result, amount = redis_client.eval(
+        CANCEL_SCRIPT, 4, *_keys(round_id), _reserved_key(user_id), user_id, number, close_at_ms
+    )
+    return int(result), from_cents(amount)
+
+
+def pending_bets(redis_client, round_id, user_id):
+    """``{number: amount}`` of the user's not yet persisted bets in the round."""
+    bets = {}
+    prefix = f'{user_id}:'
+    for field, cents in redis_client.hgetall(_keys(round_id)[0]).items():
+        if field.startswith(prefix):
+            bets[int(field[len(prefix):])] = from_cents(cents)
+    return bets
+
+
+def pending_pool(redis_client, round_id):
+    """``{number: (cents, bets)}`` over all users' not yet persisted bets in the round."""
+    pool = defaultdict(lambda: (0, 0))
+    for field, cents in redis_client.hgetall(_keys(round_id)[0]).items():
+        number = int(field.split(':')[1])
+        if int(cents) > 0:
+            total, count = pool[number]
+            pool[number] = (total + int(cents), count + 1)
+    return dict(pool)
+
+
+def pending_reserved(redis_client, user_id):
+    """The user's stake in bets not yet persisted, across rounds and tables."""
+    return from_cents(redis_client.get(_reserved_key(user_id)) or 0)
+
+
+def _clear_round(redis_client, round_id, released):
+    """Drop a flushed round's keys and release ``{user_id: cents}`` of reservations."""
+    bets_key, log_key, _ = _keys(round_id)
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.delete(bets_key, log_key)
+        for user_id, cents in released.items():
+            pipe.eval(RELEASE_SCRIPT, 1, _reserved_key(user_id), cents)
+        pipe.execute()
+    except Exception as e:
+        logger.warning(f"Bet intake: could not clear Redis state for round {round_id}: {e}")
+
+
+def flush_round_bets(round_obj, redis_client):
+    """
+    Persist the round's pending bets. Fences the round first so no script can
+    accept another bet, then writes everything in one transaction; the Redis
+    state is cleared after it commits. Returns the number of Bet rows written.
+    """
+    if not redis_client:
+        return 0
+    bets_key, log_key, closed_key = _keys(round_obj.round_id)
+    try:
+        redis_client.set(closed_key, '1', ex=KEY_TTL_SECONDS)
+        pipe = redis_client.pipeline()
+        pipe.hgetall(bets_key)
+        pipe.lrange(log_key, 0, -1)
+        stakes, events = pipe.execute()
+    except Exception as e:
+        logger.error(f"Bet intake flush for round {round_obj.round_id} could not read Redis: {e}")
+        return 0
+    if not stakes and not events:
+        return 0
+
+    # Final stake per (user, number), and net debit per user
+    final = {}
+    net = defaultdict(int)
+    for field, cents in stakes.items():
+        user_id, number = (int(part) for part in field.split(':'))
+        if int(cents) > 0:
+            final[(user_id, number)] = int(cents)
+            net[user_id] += int(cents)
+
+    round_id = round_obj.round_id
+    with transaction.atomic():
+        # Concurrent flushes of the round (betting close, settlement) queue up here
+        flushed = GameRound.objects.select_for_update().filter(pk=round_obj.pk).values_list('bets_flushed', flat=True).get()
+        if flushed:
+            # An earlier flush committed but its Redis cleanup never ran: the
+            # fence froze the keys, so they hold exactly what it persisted
+            logger.warning(f"Bet intake: round {round_id} was already flushed; only clearing its Redis state")
+            transaction.on_commit(lambda: _clear_round(redis_client, round_id, dict(net)))
+            return 0
+        balances = dict(
+            Wallet.objects.select_for_update()
+            .filter(user_id__in=list(net))
+            .values_list('user_id', 'balance')
+        )
+        rejected = {user_id for user_id, cents in net.items()
+                    if user_id not in balances or balances[user_id] < from_cents(cents)}
+        for user_id in rejected:
+            logger.warning(
+                f"Bet intake: user {user_id} can no longer cover {from_cents(net[user_id])} "
+                f"in round {round_id}; their bets are dropped"
+            )
+        # One grouped debit per distinct amount, like settlement credits
+        users_by_amount = defaultdict(list)
+        for user_id, cents in net.items():
+            if user_id not in rejected:
+                users_by_amount[cents].append(user_id)
+        now = timezone.now()
+        for cents, user_ids in users_by_amount.items():
+            Wallet.objects.filter(user_id__in=user_ids).update(
+                balance=F('balance') - from_cents(cents), updated_at=now
+            )
+
+        Bet.objects.bulk_create([
+            Bet(user_id=user_id, round=round_obj, number=number, chip_amount=from_cents(cents))
+            for (user_id, number), cents in final.items()
+            if user_id not in rejected
+        ], batch_size=2000)
+        stats = defaultdict(lambda: [0, Decimal('0.00'), 0, 0])
+        for (user_id, _), cents in final.items():
+            if user_id not in rejected:
+                stats[user_id][0] += 1
+                stats[user_id][1] += from_cents(cents)
+        apply_stats(stats)
+
+        # Replay the event log to give every BET/REFUND its balance before/after
+        running = {user_id: balance for user_id, balance in balances.items() if user_id not in rejected}
+        transactions = []
+        bet_count = 0
+        for event in events:
+            user_id, number, cents, kind = event.split(':')
+            user_id = int(user_id)
+            if user_id not in running:
+                continue
+            amount = from_cents(cents)
+            balance_before = running[user_id]
+            if kind == 'B':
+                bet_count += 1
+                balance_after = balance_before - amount
+                transactions.append(Transaction(
+                    user_id=user_id, transaction_type='BET', amount=amount,
+                    balance_before=balance_before, balance_after=balance_after,
+                    description=f"Bet on number {number} in round {round_obj.round_id}",
+                ))
+            else:
+                bet_count -= 1
+                balance_after = balance_before + amount
+                transactions.append(Transaction(
+                    user_id=user_id, transaction_type='REFUND', amount=amount,
+                    balance_before=balance_before, balance_after=balance_after,
+                    description=f"Refund bet on number {number} in round {round_obj.round_id}",
+                ))
+            running[user_id] = balance_after
+        Transaction.objects.bulk_create(transactions, batch_size=2000)
+        add_to_daily_summary(transactions)
+
+        accepted = [cents for (user_id, _), cents in final.items() if user_id not in rejected]
+        GameRound.objects.filter(pk=round_obj.pk).update(
+            total_bets=F('total_bets') + bet_count,
+            total_amount=F('total_amount') + from_cents(sum(accepted)),
+            bets_flushed=True,
+        )
+
+        # Rejected users' reservations are released too: their bets are gone
+        transaction.on_commit(lambda: _clear_round(redis_client, round_id, dict(net)))
+        push_to_users(
+            (user_id, {'type': 'notification', 'message': f'Your bets in round {round_id} were cancelled: insufficient balance'})
+            for user_id in rejected
+        )
+
+    logger.info(
+        f"Bet intake flushed round {round_obj.round_id}: {len(accepted)} bets, "
+        f"{len(transactions)} transactions, {len(rejected)} users rejected"
+    )
+    return len(accepted)
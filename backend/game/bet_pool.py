@@ -0,0 +1,166 @@
+"""
+Live per-number bet pool of the current round, kept in Redis.
+
+The admin dashboard and dice control pages show, for each number, how much is
+staked and how many bets there are. Instead of running six aggregate/count pairs
+on Bet for every poll, place_bet/remove_bet update a per-round hash
+``bet_pool:{round_id}`` (fields ``amount:{n}`` in cents and ``count:{n}``) and
+the pages read it with a single HGETALL.
+
+The round runners create the zeroed hash together with the round, and
+increments only apply once it exists. If it is missing anyway (Redis restart,
+eviction), the first reader seeds it from one grouped query plus, with the Redis
+bet intake on, the stakes still pending there. When betting closes the hash is
+reconciled with the database, which stays the source of truth.
+"""
+import logging
+from decimal import Decimal
+
+from django.db.models import Sum, Count
+
+from . import bet_intake
+from .models import Bet
+
+logger = logging.getLogger('game')
+
+POOL_TTL_SECONDS = 3600
+NUMBERS = range(1, 7)
+CENTS = Decimal('100')
+
+# KEYS: pool; ARGV: number, amount_cents, count_delta, ttl
+INCR_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then return 0 end
+redis.call('HINCRBY', KEYS[1], 'amount:' .. ARGV[1], ARGV[2])
+redis.call('HINCRBY', KEYS[1], 'count:' .. ARGV[1], ARGV[3])
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+return 1
+"""
+
+
+def pool_key(round_id):
+    return f'bet_pool:{round_id}'
+
+
+def _to_cents(amount):
+    return int((Decimal(str(amount)) * CENTS).to_integral_value())
+
+
+def record_bet(redis_client, round_id, number, amount, new_bet):
+    """Add ``amount`` on ``number``; ``new_bet`` is True when this created a Bet row."""
+    _incr(redis_client, round_id, number, _to_cents(amount), 1 if new_bet else 0)
+
+
+def record_removal(redis_client, round_id, number, amount):
+    """Take a removed bet of ``amount`` on ``number`` out of the pool."""
+    _incr(redis_client, round_id, number, -_to_cents(amount), -1)
+
+
+def _incr(redis_client, round_id, number, cents, count_delta):
+    if not redis_client:
+        return
+    try:
+        redis_client.eval(INCR_SCRIPT, 1, pool_key(round_id), number, cents, count_delta, POOL_TTL_SECONDS)
+    except Exception as e:
+        logger.warning(f"Bet pool update failed for round {round_id}: {e}")
+
+
+def _db_pool(round_obj):
+    """``{number: (amount_cents, count)}`` from one grouped query."""
+    pool = {number: (0, 0) for number in NUMBERS}
+    rows = (
+        Bet.objects.filter(round=round_obj)
+        .values('number')
+        .annotate(amount=Sum('chip_amount'), count=Count('id'))
+    )
+    for row in rows:
+        pool[row['number']] = (_to_cents(row['amount'] or 0), row['count'])
+    return pool
+
+
+def _queue_write(pipe, round_id, pool):
+    mapping = {}
+    for number, (cents, count) in pool.items():
+        mapping[f'amount:{number}'] = cents
+        mapping[f'count:{number}'] = count
+    pipe.hset(pool_key(round_id), mapping=mapping)
+    pipe.expire(pool_key(round_id), POOL_TTL_SECONDS)
+
+
+def _write_pool(redis_client, round_id, pool):
+    pipe = redis_client.pipeline()
+    _queue_write(pipe, round_id, pool)
+    pipe.execute()
+
+
+def queue_new_pool(pipe, round_id):
+    """Queue the empty pool of a new round on ``pipe`` (sync or asyncio pipeline)."""
+    _queue_write(pipe, round_id, {number: (0, 0) for number in NUMBERS})
+
+
+def _seed_pool(redis_client, round_obj):
+    """Database totals plus, with the Redis intake on, its not yet flushed stakes."""
+    pool = _db_pool(round_obj)
+    if redis_client and bet_intake.intake_enabled():
+        for number, (cents, count) in bet_intake.pending_pool(redis_client, round_obj.round_id).items():
+            db_cents, db_count = pool.get(number, (0, 0))
+            pool[number] = (db_cents + cents, db_count + count)
+    return pool
+
+
+def get_bet_pool(redis_client, round_obj):
+    """
+    Pool of ``round_obj`` as ``(bets_by_number_list, total_bets, total_amount)``.
+    Each list item is ``{'number', 'amount' (Decimal), 'count'}``. Falls back to
+    the database (and seeds Redis) when the hash is missing.
+    """
+    raw = None
+    if redis_client:
+        try:
+            raw = redis_client.hgetall(pool_key(round_obj.round_id))
+        except Exception as e:
+            logger.warning(f"Bet pool read failed for round {round_obj.round_id}: {e}")
+            redis_client = None
+
+    if raw:
+        pool = {
+            number: (int(raw.get(f'amount:{number}', 0)), int(raw.get(f'count:{number}', 0)))
+            for number in NUMBERS
+        }
+    else:
+        try:
+            pool = _seed_pool(redis_client, round_obj)
+        except Exception as e:
+            logger.warning(f"Bet pool read of pending intake bets failed for round {round_obj.round_id}: {e}")
+            pool = _db_pool(round_obj)
+        if redis_client:
+            try:
+                _write_pool(redis_client, round_obj.round_id, pool)
+            except Exception as e:
+                logger.warning(f"Bet pool seed failed for round {round_obj.round_id}: {e}")
+
+    bets_by_number_list = [
+        {'number': number, 'amount': Decimal(cents) / CENTS, 'count': count}
+        for number, (cents, count) in pool.items()
+    ]
+    total_bets = sum(item['count'] for item in bets_by_number_list)
+    total_amount = sum((item['amount'] for item in bets_by_number_list), Decimal('0'))
+    return bets_by_number_list, total_bets, total_amount
+
+
+def reconcile_bet_pool(round_obj, redis_client):
+    """Overwrite the round's pool with the database totals, logging any drift."""
+    if not redis_client:
+        return
+    pool = _db_pool(round_obj)
+    try:
+        raw = redis_client.hgetall(pool_key(round_obj.round_id))
+        if raw:
+            drift = [
+                number for number, (cents, count) in pool.items()
+                if int(raw.get(f'amount:{number}', 0)) != cents or int(raw.get(f'count:{number}', 0)) != count
+            ]
+            if drift:
+                logger.warning(f"Bet pool for round {round_obj.round_id} drifted on numbers {drift}; reset from database")
+        _write_pool(redis_client, round_obj.round_id, pool)
+    except Exception as e:
+        logger.warning(f"Bet pool reconcile failed for round {round_obj.round_id}: {e}")
@@ -0,0 +1,98 @@
+"""
+Incremental maintenance of UserBettingStats.
+
+Every path that writes bets applies its deltas inside its own transaction, so
+the stats commit or roll back together with the bets:
+
+- place_bet / remove_bet: one user, +/-1 bet and the stake
+- bet intake flush: bets and stakes of every user in the round
+- settlement: wins and payouts of every winner
+
+Bulk callers are grouped by identical deltas (like the wallet credits in
+settlement), so a round costs one INSERT ... ON CONFLICT DO NOTHING plus a
+handful of UPDATEs. ``rebuild_betting_stats`` recomputes everything from the
+live and archived bets.
+"""
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import F, Sum, Count, Q
+
+from .models import Bet, ArchivedBet, UserBettingStats
+
+ID_CHUNK_SIZE = 900
+FIELDS = ('total_bets', 'total_wagered', 'total_wins', 'total_payouts')
+
+
+def _update(user_ids, delta):
+    expressions = {field: F(field) + value for field, value in zip(FIELDS, delta) if value}
+    if not expressions:
+        return 0
+    return UserBettingStats.objects.filter(user_id__in=user_ids).update(**expressions)
+
+
+def apply_stats(deltas):
+    """
+    Add ``{user_id: (bets, wagered, wins, payouts)}`` to the users' stats,
+    creating missing rows. Call inside the transaction that writes the bets.
+    """
+    deltas = {
+        user_id: (int(bets), Decimal(wagered), int(wins), Decimal(payouts))
+        for user_id, (bets, wagered, wins, payouts) in deltas.items()
+    }
+    if len(deltas) == 1:
+        (user_id, delta), = deltas.items()
+        if _update([user_id], delta):
+            return
+
+    user_ids = list(deltas)
+    UserBettingStats.objects.bulk_create(
+        [UserBettingStats(user_id=user_id) for user_id in user_ids],
+        ignore_conflicts=True, batch_size=ID_CHUNK_SIZE
+    )
+    users_by_delta = defaultdict(list)
+    for user_id, delta in deltas.items():
+        users_by_delta[delta].append(user_id)
+    for delta, ids in users_by_delta.items():
+        for start in range(0, len(ids), ID_CHUNK_SIZE):
+            _update(ids[start:start + ID_CHUNK_SIZE], delta)
+
+
+def record_placed(user_id, amount, new_bet):
+    apply_stats({user_id: (1 if new_bet else 0, amount, 0, 0)})
+
+
+def record_removed(user_id, amount):
+    apply_stats({user_id: (-1, -amount, 0, 0)})
+
+
+def get_betting_stats(user_id):
+    """Lifetime stats of a user as a dict (zeros if they never bet)."""
+    row = UserBettingStats.objects.filter(pk=user_id).values(*FIELDS).first()
+    return row or {'total_bets': 0, 'total_wagered': Decimal('0.00'), 'total_wins': 0, 'total_payouts': Decimal('0.00')}
+
+
+def rebuild_betting_stats():
+    """Recompute every user's stats from Bet and ArchivedBet. Returns the number of rows written."""
+    totals = defaultdict(lambda: [0, Decimal('0.00'), 0, Decimal('0.00')])
+    for model in (Bet, ArchivedBet):
+        rows = (
+            model.objects.values('user_id')
+            .annotate(bets=Count('id'), wagered=Sum('chip_amount'),
+                      wins=Count('id', filter=Q(is_winner=True)), payouts=Sum('payout_amount'))
+            .order_by()
+        )
+        for row in rows.iterator(chunk_size=2000):
+            total = totals[row['user_id']]
+            total[0] += row['bets']
+            total[1] += row['wagered'] or 0
+            total[2] += row['wins']
+            total[3] += row['payouts'] or 0
+    with transaction.atomic():
+        UserBettingStats.objects.all().delete()
+        UserBettingStats.objects.bulk_create(
+            [UserBettingStats(user_id=user_id, **dict(zip(FIELDS, total))) for user_id, total in totals.items()],
+            batch_size=2000
+        )
+    return len(totals)
@@ -0,0 +1,200 @@
+"""
+Client-facing WebSocket frames for game_room group events.
+
+Group events sent by the timer carry the fields the consumer needs to build the
+JSON it pushes to the browser. Building and serializing that JSON once per socket
+means 20k identical ``json.dumps`` calls per tick with 20k connections, so the
+sender attaches the finished frame under ``FRAME_KEY`` and GameConsumer forwards
+it unchanged. Events without a frame (older senders) are still encoded by the
+consumer with ``build_client_message``, so both paths produce the same bytes.
+
+Clients choose the wire format with a WebSocket subprotocol: ``dice.msgpack.v1``
+gets the same messages as MessagePack binary frames (attached under
+PACKED_FRAME_KEY), ``dice.json.v1`` or no subprotocol gets JSON text frames.
+"""
+import json
+from datetime import timedelta
+
+import msgpack
+from asgiref.sync import async_to_sync
+from django.utils import timezone
+
+FRAME_KEY = 'frame'
+PACKED_FRAME_KEY = 'packed_frame'
+
+MSGPACK_SUBPROTOCOL = 'dice.msgpack.v1'
+JSON_SUBPROTOCOL = 'dice.json.v1'
+SUBPROTOCOLS = (MSGPACK_SUBPROTOCOL, JSON_SUBPROTOCOL)
+
+DICE_KEYS = [f'dice_{i}' for i in range(1, 7)]
+
+
+def negotiate_subprotocol(offered):
+    """The first subprotocol the client offered that we speak, or None (JSON, no subprotocol)."""
+    for subprotocol in offered or ():
+        if subprotocol in SUBPROTOCOLS:
+            return subprotocol
+    return None
+
+
+def pack(message):
+    return msgpack.packb(message, use_bin_type=True)
+
+
+def unpack(data):
+    return msgpack.unpackb(data, raw=False)
+
+
+def build_client_message(event):
+    """Return the dict sent to the client for a game_room event, or None if unknown."""
+    event_type = event.get('type')
+
+    if event_type == 'game_start':
+        return {
+            'type': 'game_start',
+            'timer': event.get('timer', 1),
+            'status': event.get('status', 'BETTING'),
+            'round_id': event.get('round_id'),
+        }
+
+    if event_type in ('timer', 'game_timer'):
+        # Timer messages never include dice values; those go out only in dice_result
+        return {
+            'type': 'timer',
+            'timer': event.get('timer', 0),
+            'status': event.get('status', 'BETTING'),
+            'round_id': event.get('round_id'),
+        }
+
+    if event_type == 'dice_result':
+        message = {
+            'type': 'dice_result',
+            'timer': event.get('timer'),
+            'status': event.get('status', 'RESULT'),
+            'round_id': event.get('round_id'),
+        }
+        if 'dice_values' in event:
+            message['dice_values'] = event['dice_values']
+        for dice_key in DICE_KEYS:
+            if dice_key in event:
+                message[dice_key] = event[dice_key]
+        if 'result' in event:
+            message['result'] = event['result']
+        return message
+
+    if event_type == 'result':
+        return {
+            'type': 'result',
+            'timer': event.get('timer', 0),
+            'status': event.get('status', 'RESULT'),
+            'round_id': event.get('round_id'),
+            'dice_values': event.get('dice_values'),
+        }
+
+    if event_type == 'game_end':
+        message = {
+            'type': 'game_end',
+            'timer': event.get('timer', 0),
+            'status': event.get('status', 'COMPLETED'),
+            'round_id': event.get('round_id'),
+        }
+        for key in ('end_time', 'start_time', 'result_time', 'dice_values'):
+            if key in event:
+                message[key] = event[key]
+        for dice_key in DICE_KEYS:
+            if dice_key in event:
+                message[dice_key] = event[dice_key]
+        if 'result' in event:
+            message['result'] = event['result']
+        return message
+
+    if event_type == 'dice_roll':
+        return {
+            'type': 'dice_roll',
+            'timer': event.get('timer', 0),
+            'status': event.get('status') or 'CLOSED',
+            'round_id': event.get('round_id'),
+            'dice_roll_time': event.get('dice_roll_time'),
+        }
+
+    if event_type == 'round_update':
+        return {
+            'type': 'round_update',
+            'round_id': event.get('round_id'),
+            'status': event.get('status'),
+        }
+
+    if event_type in ('round_schedule', 'leaderboard_update'):
+        return {key: value for key, value in event.items() if key != FRAME_KEY}
+
+    if event_type == 'game_state':
+        return {
+            'type': 'game_state',
+            'round_id': event.get('round_id'),
+            'status': event.get('status'),
+            'timer': event.get('timer'),
+        }
+
+    return None
+
+
+def round_schedule_message(round_id, status, start_time, betting_close, dice_roll, dice_result, round_end):
+    """
+    One message describing a whole round so clients can count down locally
+    (GAME_WS_PROTOCOL = 'schedule').
+
+    Absolute boundaries follow the timer convention (timer = elapsed seconds + 1):
+    betting is open while timer <= betting_close, the dice roll starts when timer
+    reaches dice_roll, the result shows when it reaches dice_result, and the round
+    ends round_end seconds after start. ``server_time`` lets clients correct for
+    clock skew.
+    """
+    def at(seconds):
+        return (start_time + timedelta(seconds=seconds)).isoformat()
+
+    return {
+        'type': 'round_schedule',
+        'round_id': round_id,
+        'status': status,
+        'server_time': timezone.now().isoformat(),
+        'start_time': start_time.isoformat(),
+        'betting_close_time': betting_close,
+        'dice_roll_time': dice_roll,
+        'dice_result_time': dice_result,
+        'round_end_time': round_end,
+        'betting_close_at': at(betting_close),
+        'dice_roll_at': at(dice_roll - 1),
+        'dice_result_at': at(dice_result - 1),
+        'round_end_at': at(round_end),
+    }
+
+
+def with_frame(event):
+    """
+    Return a copy of ``event`` with the pre-encoded client frames (JSON and
+    MessagePack) attached, and with the status clients are sent (dice_roll and
+    dice_result events carry none) so consumers' round snapshots can read it.
+
+    dice_result events without a timer get no frame: the consumer fills the
+    timer in from settings before encoding.
+    """
+    message = build_client_message(event)
+    if message is None:
+        return event
+    framed = dict(event)
+    if not framed.get('status') and message.get('status'):
+        framed['status'] = message['status']
+    if event.get('type') == 'dice_result' and not event.get('timer'):
+        return framed
+    framed[FRAME_KEY] = json.dumps(message)
+    framed[PACKED_FRAME_KEY] = pack(message)
+    return framed
+
+
+def sync_group_send(channel_layer):
+    """``async_to_sync(channel_layer.group_send)`` that attaches the client frame."""
+    group_send = async_to_sync(channel_layer.group_send)
+
+    def send(group, event):
+        return group_send(group, with_frame(event))
+    return send
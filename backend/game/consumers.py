@@ -1,17 +1,25 @@
 import json
 import asyncio
 import logging
+from datetime import datetime
+from urllib.parse import parse_qs
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
 from django.utils import timezone
 from django.conf import settings
 import redis
 from .models import GameRound, Bet
+from .tables import normalize_table, group_name, round_key, timer_key
+from .broadcast import (
+    FRAME_KEY, PACKED_FRAME_KEY, MSGPACK_SUBPROTOCOL, build_client_message, round_schedule_message,
+    negotiate_subprotocol, pack, unpack,
+)
+from . import round_state, admission
+from accounts.notifications import user_group
 
 logger = logging.getLogger('game.websocket')
 from .utils import (
-    generate_random_dice_values,
-    apply_dice_values_to_round,
+    resolve_round_dice,
     extract_dice_values,
     sync_database_to_redis,
     sync_round_to_redis,
@@ -39,13 +47,35 @@ try:
 except (redis.ConnectionError, redis.TimeoutError, AttributeError):
     redis_client = None  # Use None if Redis unavailable
 
+# Clients count down from a round_schedule message instead of per-second timer ticks
+SCHEDULE_PROTOCOL = getattr(settings, 'GAME_WS_PROTOCOL', 'ticks') == 'schedule'
+
 
 class GameConsumer(AsyncWebsocketConsumer):
+    # Wire format negotiated on connect (see game/broadcast.py); JSON by default
+    subprotocol = None
+    packed = False
+
     async def connect(self):
+        self.subprotocol = negotiate_subprotocol(self.scope.get('subprotocols'))
+        self.packed = self.subprotocol == MSGPACK_SUBPROTOCOL
+        retry_after = admission.admit(self)
+        if retry_after is not None:
+            # Accept first: a close before accept reaches the client as HTTP 403, without the hint
+            await self.accept(self.subprotocol)
+            await self.reject(retry_after, 'draining' if admission.is_draining() else 'busy')
+            return
         # NEVER close connection on errors - keep it alive
         try:
-            await self.accept()
-            self.room_group_name = 'game_room'
+            await self.accept(self.subprotocol)
+            query = parse_qs(self.scope.get('query_string', b'').decode())
+            self.table = normalize_table(query.get('table', [None])[0])
+            if self.table is None:
+                logger.warning(f"WebSocket requested unknown table: {query.get('table')}")
+                await self.send_message({'type': 'error', 'message': 'Unknown table'})
+                await self.close(code=4004)
+                return
+            self.room_group_name = group_name(self.table)
             self.admin_notifications_group = 'admin_notifications'
             
             user = self.scope.get('user')
@@ -78,6 +108,14 @@ class GameConsumer(AsyncWebsocketConsumer):
                     logger.warning(f"Failed to join admin group: {admin_group_error}")
             else:
                 logger.debug(f"User {user} is NOT staff, skipping admin notifications group")
+
+            # Per-user group: bet confirmations, balances, wins, deposit/withdraw updates
+            if user and getattr(user, 'is_authenticated', False):
+                try:
+                    self.user_group_name = user_group(user.id)
+                    await self.channel_layer.group_add(self.user_group_name, self.channel_name)
+                except Exception as user_group_error:
+                    logger.warning(f"Failed to join user group: {user_group_error}")
             
             logger.info(f"WebSocket connected successfully: {self.channel_name}")
             
@@ -89,7 +127,13 @@ class GameConsumer(AsyncWebsocketConsumer):
         except Exception as e:
             logger.exception(f"WebSocket connect error: {e}")
 
+    async def reject(self, retry_after, reason):
+        """Close with a reconnect hint (admission control and shutdown drain)."""
+        await self.send_message({'type': 'reconnect', 'reason': reason, 'retry_after': retry_after})
+        await self.close(code=admission.close_code(retry_after))
+
     async def disconnect(self, close_code):
+        admission.release(self)
         # Leave room groups
         user = self.scope.get('user')
         logger.info(f"WebSocket disconnected for user {user}: {self.channel_name} (Code: {close_code})")
@@ -104,14 +148,16 @@ class GameConsumer(AsyncWebsocketConsumer):
                     self.admin_notifications_group,
                     self.channel_name
                 )
+            if hasattr(self, 'user_group_name'):
+                await self.channel_layer.group_discard(self.user_group_name, self.channel_name)
         except Exception as e:
             logger.exception(f"WebSocket disconnect error: {e}")
 
-    async def receive(self, text_data):
+    async def receive(self, text_data=None, bytes_data=None):
         """Handle incoming WebSocket messages - NEVER closes connection on error"""
         user = self.scope.get('user')
         try:
-            data = json.loads(text_data)
+            data = unpack(bytes_data) if bytes_data is not None else json.loads(text_data)
             message_type = data.get('type')
             logger.debug(f"WebSocket message received from {user}: {message_type}")
 
@@ -119,7 +165,7 @@ class GameConsumer(AsyncWebsocketConsumer):
                 await self.send_current_state()
             elif message_type == 'ping':
                 # Respond to ping with pong to keep connection alive
-                await self.send(text_data=json.dumps({'type': 'pong'}))
+                await self.send_message({'type': 'pong'})
         except json.JSONDecodeError as e:
             logger.warning(f"Invalid JSON received from {user}: {e}, but keeping connection alive")
         except Exception as e:
@@ -128,132 +174,181 @@ class GameConsumer(AsyncWebsocketConsumer):
     async def send_current_state(self):
         """Send current game state to client - NEVER closes connection on error"""
         try:
-            # Try Redis first, fallback to database
-            round_data = None
-            timer = 0
-            
-            if redis_client:
-                try:
-                    # Use Redis pipeline for efficient batch reads (reduces round trips)
+            # Answer from this process's round snapshot when it is fresh; otherwise
+            # one connection per table reloads it from Redis/DB while the rest wait
+            messages = round_state.current_messages(self.table, SCHEDULE_PROTOCOL)
+            if messages is None:
+                async with round_state.refresh_lock(self.table):
+                    messages = round_state.current_messages(self.table, SCHEDULE_PROTOCOL)
+                    if messages is None:
+                        messages = await self.load_current_state()
+                        round_state.remember(self.table, messages)
+            for message in messages:
+                await self.send_message(message)
+        except Exception as e:
+            # CRITICAL: Never let errors in send_current_state close the connection
+            logger.error(f"Error in send_current_state (connection remains open): {e}", exc_info=True)
+            # Send minimal state to keep connection alive
+            try:
+                await self.send_message({
+                    'type': 'game_state',
+                    'status': 'WAITING',
+                    'timer': 1,
+                })
+            except Exception:
+                pass  # If we can't even send this, connection might be truly dead
+
+    async def load_current_state(self):
+        """Build the current game state messages from Redis, falling back to the database"""
+        messages = []
+        # Try Redis first, fallback to database
+        round_data = None
+        timer = 0
+        
+        if redis_client:
+            try:
+                # Use Redis pipeline for efficient batch reads (reduces round trips)
+                pipe = redis_client.pipeline()
+                pipe.get(round_key(self.table))
+                pipe.get(timer_key(self.table))
+                results = pipe.execute()
+                
+                round_data = results[0]
+                timer_raw = int(results[1] or '1')
+                # Get round_end_time from settings - always fresh from database
+                from .utils import get_game_setting
+                round_end_time = await database_sync_to_async(get_game_setting)('ROUND_END_TIME', 80)
+                # Convert 0-(round_end_time-1) to 1-round_end_time format
+                timer = round_end_time if timer_raw == 0 else timer_raw
+                
+                # If Redis has no data, sync from database
+                if not round_data:
+                    await self.sync_db_to_redis()
+                    # Read again after sync
                     pipe = redis_client.pipeline()
-                    pipe.get('current_round')
-                    pipe.get('round_timer')
+                    pipe.get(round_key(self.table))
+                    pipe.get(timer_key(self.table))
                     results = pipe.execute()
-                    
                     round_data = results[0]
-                    timer_raw = int(results[1] or '1')
-                    # Get round_end_time from settings - always fresh from database
-                    from .utils import get_game_setting
-                    round_end_time = await database_sync_to_async(get_game_setting)('ROUND_END_TIME', 80)
-                    # Convert 0-(round_end_time-1) to 1-round_end_time format
-                    timer = round_end_time if timer_raw == 0 else timer_raw
-                    
-                    # If Redis has no data, sync from database
-                    if not round_data:
-                        await self.sync_db_to_redis()
-                        # Read again after sync
-                        pipe = redis_client.pipeline()
-                        pipe.get('current_round')
-                        pipe.get('round_timer')
-                        results = pipe.execute()
-                        round_data = results[0]
-                        if round_data:
-                            timer_raw = int(results[1] or '1')
-                            from .utils import get_game_setting
-                            round_end_time = await database_sync_to_async(get_game_setting)('ROUND_END_TIME', 80)
-                            timer = round_end_time if timer_raw == 0 else timer_raw
-                except Exception as e:
-                    logger.warning(f"Redis read error (using fallback): {e}")
-                    round_data = None
-        
-            # Fallback to database if Redis unavailable
-            if not round_data:
-                try:
-                    round_obj = await self.get_current_round_from_db()
-                    if round_obj:
+                    if round_data:
+                        timer_raw = int(results[1] or '1')
                         from .utils import get_game_setting
                         round_end_time = await database_sync_to_async(get_game_setting)('ROUND_END_TIME', 80)
-                        elapsed = (timezone.now() - round_obj.start_time).total_seconds()
-                        # If round is older than round_end_time seconds, it should be completed
-                        if elapsed >= round_end_time:
-                            timer = 1  # Start new round at 1
-                            status = 'WAITING'
-                        else:
-                            # Calculate timer using helper (1 to round_end_time)
-                            timer = calculate_current_timer(round_obj.start_time, round_end_time)
-                            status = round_obj.status
-                        # Try to sync to Redis if available
-                        if redis_client:
-                            try:
-                                await self.sync_round_to_redis_async(round_obj)
-                            except Exception:
-                                pass  # Non-critical
-                        await self.send(text_data=json.dumps({
-                            'type': 'game_state',
-                            'round_id': round_obj.round_id,
-                            'status': status,
-                            'timer': timer,
-                        }))
-                        return
-                    else:
-                        # No active round - check if we need to create one
-                        latest_round = await self.get_latest_round_from_db()
-                        if latest_round and latest_round.status == 'COMPLETED':
-                            # All rounds completed, game timer should create a new one
-                            await self.send(text_data=json.dumps({
-                                'type': 'game_state',
-                                'status': 'WAITING',
-                                'timer': 1,
-                            }))
-                            return
-                except Exception as db_error:
-                    logger.warning(f"Database error getting round (sending default state): {db_error}")
-            
-            if round_data:
-                try:
-                    round_data = json.loads(round_data)
-                    # Ensure timer is in 1-round_end_time format (convert 0 to round_end_time)
+                        timer = round_end_time if timer_raw == 0 else timer_raw
+            except Exception as e:
+                logger.warning(f"Redis read error (using fallback): {e}")
+                round_data = None
+    
+        # Fallback to database if Redis unavailable
+        if not round_data:
+            try:
+                round_obj = await self.get_current_round_from_db()
+                if round_obj:
                     from .utils import get_game_setting
                     round_end_time = await database_sync_to_async(get_game_setting)('ROUND_END_TIME', 80)
-                    if timer == 0:
-                        timer = round_end_time
-                    await self.send(text_data=json.dumps({
+                    elapsed = (timezone.now() - round_obj.start_time).total_seconds()
+                    # If round is older than round_end_time seconds, it should be completed
+                    if elapsed >= round_end_time:
+                        timer = 1  # Start new round at 1
+                        status = 'WAITING'
+                    else:
+                        # Calculate timer using helper (1 to round_end_time)
+                        timer = calculate_current_timer(round_obj.start_time, round_end_time)
+                        status = round_obj.status
+                    # Try to sync to Redis if available
+                    if redis_client:
+                        try:
+                            await self.sync_round_to_redis_async(round_obj)
+                        except Exception:
+                            pass  # Non-critical
+                    messages.append({
                         'type': 'game_state',
-                        'round_id': round_data.get('round_id'),
-                        'status': round_data.get('status'),
+                        'round_id': round_obj.round_id,
+                        'status': status,
                         'timer': timer,
-                    }))
-                except Exception as parse_error:
-                    logger.warning(f"Error parsing round_data, sending default state: {parse_error}")
-                    await self.send(text_data=json.dumps({
-                        'type': 'game_state',
-                        'status': 'WAITING',
-                        'timer': 1,
-                    }))
-            else:
-                await self.send(text_data=json.dumps({
-                    'type': 'game_state',
-                    'status': 'WAITING',
-                    'timer': 1,
-                }))
-        except Exception as e:
-            # CRITICAL: Never let errors in send_current_state close the connection
-            logger.error(f"Error in send_current_state (connection remains open): {e}", exc_info=True)
-            # Send minimal state to keep connection alive
+                    })
+                    if SCHEDULE_PROTOCOL and status != 'WAITING':
+                        messages.append(round_schedule_message(
+                            round_obj.round_id, status, round_obj.start_time,
+                            round_obj.betting_close_seconds, round_obj.dice_roll_seconds,
+                            round_obj.dice_result_seconds, round_obj.round_end_seconds,
+                        ))
+                    return messages
+                else:
+                    # No active round - check if we need to create one
+                    latest_round = await self.get_latest_round_from_db()
+                    if latest_round and latest_round.status == 'COMPLETED':
+                        # All rounds completed, game timer should create a new one
+                        messages.append({
+                            'type': 'game_state',
+                            'status': 'WAITING',
+                            'timer': 1,
+                        })
+                        return messages
+            except Exception as db_error:
+                logger.warning(f"Database error getting round (sending default state): {db_error}")
+        
+        if round_data:
             try:
-                await self.send(text_data=json.dumps({
+                round_data = json.loads(round_data)
+                # Ensure timer is in 1-round_end_time format (convert 0 to round_end_time)
+                from .utils import get_game_setting
+                round_end_time = await database_sync_to_async(get_game_setting)('ROUND_END_TIME', 80)
+                if timer == 0:
+                    timer = round_end_time
+                messages.append({
+                    'type': 'game_state',
+                    'round_id': round_data.get('round_id'),
+                    'status': round_data.get('status'),
+                    'timer': timer,
+                })
+                if SCHEDULE_PROTOCOL and round_data.get('start_time'):
+                    messages.append(await self.build_round_schedule(round_data))
+            except Exception as parse_error:
+                logger.warning(f"Error parsing round_data, sending default state: {parse_error}")
+                messages = [{
                     'type': 'game_state',
                     'status': 'WAITING',
                     'timer': 1,
-                }))
-            except Exception:
-                pass  # If we can't even send this, connection might be truly dead
-    
+                }]
+        else:
+            messages.append({
+                'type': 'game_state',
+                'status': 'WAITING',
+                'timer': 1,
+            })
+        return messages
+
+    async def build_round_schedule(self, round_data):
+        """Build a round_schedule message from the cached round in Redis"""
+        from .utils import get_game_setting
+        phases = {}
+        for key, setting_key, default in (
+            ('betting_close_seconds', 'BETTING_CLOSE_TIME', 30),
+            ('dice_roll_seconds', 'DICE_ROLL_TIME', 7),
+            ('dice_result_seconds', 'DICE_RESULT_TIME', 51),
+            ('round_end_seconds', 'ROUND_END_TIME', 80),
+        ):
+            phases[key] = round_data.get(key)
+            if phases[key] is None:
+                phases[key] = await database_sync_to_async(get_game_setting)(setting_key, default)
+        return round_schedule_message(
+            round_data.get('round_id'),
+            round_data.get('status'),
+            datetime.fromisoformat(round_data['start_time']),
+            phases['betting_close_seconds'],
+            phases['dice_roll_seconds'],
+            phases['dice_result_seconds'],
+            phases['round_end_seconds'],
+        )
+
     @database_sync_to_async
     def get_current_round_from_db(self):
         """Get current round from database"""
         try:
-            return GameRound.objects.filter(status__in=['BETTING', 'CLOSED', 'RESULT']).order_by('-start_time').first()
+            return GameRound.objects.filter(
+                table=self.table, status__in=['BETTING', 'CLOSED', 'RESULT']
+            ).order_by('-start_time').first()
         except:
             return None
     
@@ -261,7 +356,7 @@ class GameConsumer(AsyncWebsocketConsumer):
     def get_latest_round_from_db(self):
         """Get latest round from database (any status)"""
         try:
-            return GameRound.objects.order_by('-start_time').first()
+            return GameRound.objects.filter(table=self.table).order_by('-start_time').first()
         except:
             return None
     
@@ -270,7 +365,7 @@ class GameConsumer(AsyncWebsocketConsumer):
         """Sync database to Redis"""
         if redis_client:
             from .utils import sync_database_to_redis
-            return sync_database_to_redis(redis_client)
+            return sync_database_to_redis(redis_client, self.table)
         return False
     
     @database_sync_to_async
@@ -281,36 +376,43 @@ class GameConsumer(AsyncWebsocketConsumer):
             return sync_round_to_redis(round_obj, redis_client)
         return False
 
+    async def send_message(self, message):
+        """Send one client message in the negotiated wire format."""
+        if self.packed:
+            await self.send(bytes_data=pack(message))
+        else:
+            await self.send(text_data=json.dumps(message))
+
+    async def send_event(self, event):
+        """Forward a game_room event: the sender's pre-encoded frame if present, else encode it here."""
+        round_state.observe(self.table, event)
+        if self.packed:
+            frame = event.get(PACKED_FRAME_KEY)
+            if frame is None:
+                frame = pack(build_client_message(event))
+            await self.send(bytes_data=frame)
+            return
+        frame = event.get(FRAME_KEY)
+        if frame is None:
+            frame = json.dumps(build_client_message(event))
+        await self.send(text_data=frame)
+
     async def game_start(self, event):
         """Send game start message to WebSocket - NEVER closes connection on error"""
         try:
-            await self.send(text_data=json.dumps({
-                'type': 'game_start',
-                'timer': event.get('timer', 1),
-                'status': event.get('status', 'BETTING'),
-                'round_id': event.get('round_id'),
-            }))
+            await self.send_event(event)
         except Exception as e:
             logger.warning(f"Error sending game_start message (connection remains open): {e}")
     
     async def timer(self, event):
         """Send timer update to WebSocket - NEVER closes connection on error"""
         try:
-            message = {
-                'type': 'timer',
-                'timer': event.get('timer', 0),
-                'status': event.get('status', 'BETTING'),
-                'round_id': event.get('round_id'),
-            }
-            
             # Timer messages should NOT include dice values
             # Dice values are sent ONLY via dedicated dice_result message type at dice_result_time
-            # This prevents dice values from appearing in every timer message
-            
-            await self.send(text_data=json.dumps(message))
+            await self.send_event(event)
             # Log every 10 seconds to avoid spam
-            if message.get('timer', 0) % 10 == 0:
-                logger.info(f"📤 Sent timer message: {message}")
+            if event.get('timer', 0) % 10 == 0:
+                logger.info(f"📤 Sent timer message: round_id={event.get('round_id')}, timer={event.get('timer')}")
         except Exception as e:
             # Log error but NEVER close connection - just skip this message
             logger.warning(f"Error sending timer message (connection remains open): {e}")
@@ -322,133 +424,80 @@ class GameConsumer(AsyncWebsocketConsumer):
     async def dice_result(self, event):
         """Send dice result to WebSocket - sent ONLY once at dice_result_time - NEVER closes connection on error"""
         try:
-            timer = event.get('timer')
             # Ensure timer is not 0 - use dice_result_time if timer is missing or 0
-            if not timer or timer == 0:
-                from .utils import get_game_setting
-                timer = await database_sync_to_async(get_game_setting)('DICE_RESULT_TIME', 51)
-            
-            message = {
-                'type': 'dice_result',
-                'timer': timer,
-                'status': event.get('status', 'RESULT'),
-                'round_id': event.get('round_id'),
-            }
-            
-            # Include dice_values if provided as array
-            if 'dice_values' in event:
-                message['dice_values'] = event['dice_values']
-            
-            # Include individual dice values if provided
-            for i in range(1, 7):
-                dice_key = f'dice_{i}'
-                if dice_key in event:
-                    message[dice_key] = event[dice_key]
-            
-            # Include dice_result (winning number) if provided
-            if 'result' in event:
-                message['result'] = event['result']
-            
-            await self.send(text_data=json.dumps(message))
+            if FRAME_KEY not in event and not event.get('timer'):
+                timer = round_state.get_phase(self.table, 'dice_result_time')
+                if timer is None:
+                    from .utils import get_game_setting
+                    timer = await database_sync_to_async(get_game_setting)('DICE_RESULT_TIME', 51)
+                event = dict(event, timer=timer)
+            await self.send_event(event)
         except Exception as e:
             logger.warning(f"Error sending dice_result message (connection remains open): {e}")
 
     async def result(self, event):
         """Send result message to WebSocket - NEVER closes connection on error"""
         try:
-            await self.send(text_data=json.dumps({
-                'type': 'result',
-                'timer': event.get('timer', 0),
-                'status': event.get('status', 'RESULT'),
-                'round_id': event.get('round_id'),
-                'dice_values': event.get('dice_values'),
-            }))
+            await self.send_event(event)
         except Exception as e:
             logger.warning(f"Error sending result message (connection remains open): {e}")
     
     async def game_end(self, event):
         """Send game end message to WebSocket - triggered when round ends - NEVER closes connection on error"""
         try:
-            message = {
-                'type': 'game_end',
-                'timer': event.get('timer', 0),
-                'status': event.get('status', 'COMPLETED'),
-                'round_id': event.get('round_id'),
-            }
-            
-            # Include time and date information
-            if 'end_time' in event:
-                message['end_time'] = event['end_time']
-            if 'start_time' in event:
-                message['start_time'] = event['start_time']
-            if 'result_time' in event:
-                message['result_time'] = event['result_time']
-            
-            # Include dice values if available
-            if 'dice_values' in event:
-                message['dice_values'] = event['dice_values']
-            
-            # Include individual dice values if available
-            for i in range(1, 7):
-                dice_key = f'dice_{i}'
-                if dice_key in event:
-                    message[dice_key] = event[dice_key]
-            
-            # Include dice_result (winning number) if available
-            if 'result' in event:
-                message['result'] = event['result']
-            
-            await self.send(text_data=json.dumps(message))
-            logger.info(f"📤 Sent game_end message: round_id={message.get('round_id')}, timer={message.get('timer')}")
+            await self.send_event(event)
+            logger.info(f"📤 Sent game_end message: round_id={event.get('round_id')}, timer={event.get('timer', 0)}")
         except Exception as e:
             logger.warning(f"Error sending game_end message (connection remains open): {e}")
 
     async def dice_roll(self, event):
         """Handle dice roll warning event - sent at configured dice_roll_time from dashboard - NEVER closes connection on error"""
         try:
-            message = {
-                'type': 'dice_roll',
-                'timer': event.get('timer', 0),
-                'status': event.get('status', 'CLOSED'),
-                'round_id': event.get('round_id'),
-                'dice_roll_time': event.get('dice_roll_time'),  # Seconds before dice result when warning is sent
-            }
-            # Ensure status is not None
-            if message['status'] is None:
-                message['status'] = 'CLOSED'
-            await self.send(text_data=json.dumps(message))
+            await self.send_event(event)
         except Exception as e:
             logger.warning(f"Error sending dice_roll message (connection remains open): {e}")
 
+    async def round_schedule(self, event):
+        """Send the round schedule (schedule protocol) - NEVER closes connection on error"""
+        try:
+            await self.send_event(event)
+        except Exception as e:
+            logger.warning(f"Error sending round_schedule message (connection remains open): {e}")
+
     async def round_update(self, event):
         """Send round update to WebSocket - NEVER closes connection on error"""
         try:
-            await self.send(text_data=json.dumps({
-                'type': 'round_update',
-                'round_id': event['round_id'],
-                'status': event['status'],
-            }))
+            await self.send_event(event)
         except Exception as e:
             logger.warning(f"Error sending round_update message (connection remains open): {e}")
 
     async def game_state(self, event):
         """Send game state to WebSocket - NEVER closes connection on error"""
         try:
-            await self.send(text_data=json.dumps({
-                'type': 'game_state',
-                'round_id': event.get('round_id'),
-                'status': event.get('status'),
-                'timer': event.get('timer'),
-            }))
+            await self.send_event(event)
         except Exception as e:
             logger.warning(f"Error sending game_state message (connection remains open): {e}")
 
+    async def leaderboard_update(self, event):
+        """Send the round/daily leaderboards after settlement - NEVER closes connection on error"""
+        try:
+            await self.send_event(event)
+        except Exception as e:
+            logger.warning(f"Error sending leaderboard_update message (connection remains open): {e}")
+
+    async def user_message(self, event):
+        """Send a push addressed to this socket's user - NEVER closes connection on error"""
+        try:
+            await self.send_message(event['message'])
+        except Exception as e:
+            logger.warning(f"Error sending user_message (connection remains open): {e}")
+
     async def admin_notification(self, event):
         """Send admin notification to WebSocket"""
         try:
             # Send the entire event data to the client
             # This ensures all fields like id, user_id, screenshot_url, etc. are included
-            await self.send(text_data=json.dumps(event))
+            await self.send_message(event)
         except Exception as e:
             logger.warning(f"Error sending admin_notification: {e}")
 
@@ -489,17 +538,9 @@ def get_or_set_random_result(round_id):
         round_obj = GameRound.objects.get(round_id=round_id)
         dice_values = None
         
-        # Check if dice values are actually set (dice_1 through dice_6)
-        dice_values_missing = any(
-            getattr(round_obj, f'dice_{i}', None) is None 
-            for i in range(1, 7)
-        )
-        
-        # Auto-roll if dice_result is missing OR if any individual dice values are missing
-        if not round_obj.dice_result or dice_values_missing:
-            dice_values, result = generate_random_dice_values()
-            apply_dice_values_to_round(round_obj, dice_values)
-            round_obj.dice_result = result
+        # Roll only if no dice are stored yet (conditional write, never overwrites a result)
+        dice_values, result, rolled = resolve_round_dice(round_obj)
+        if rolled:
             round_obj.status = 'RESULT'
             round_obj.result_time = timezone.now()
             round_obj.save()
@@ -515,10 +556,8 @@ def get_or_set_random_result(round_id):
             from .views import calculate_payouts
             calculate_payouts(round_obj, dice_result=result, dice_values=dice_values)
             return result, dice_values
-        
-        return round_obj.dice_result, extract_dice_values(
-            round_obj, fallback=round_obj.dice_result
-        )
+
+        return result, dice_values
     except GameRound.DoesNotExist:
         return None, None
 
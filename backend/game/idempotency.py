@@ -0,0 +1,116 @@
+"""
+Idempotency-Key support for retried API calls (place_bet).
+
+A client sends the same ``Idempotency-Key`` header on every retry of one
+logical request. The first request claims the key in Redis with SET NX and,
+once it has a response, stores that response under the key for the round's
+lifetime; retries get the stored response back without touching the database.
+A retry that arrives while the first request is still running gets 409, and a
+key reused with a different body gets 422. Server errors release the key so
+the client can retry.
+
+Keys are scoped per user. Without Redis, or without the header, requests run
+normally.
+"""
+import functools
+import hashlib
+import json
+import logging
+
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+logger = logging.getLogger('game')
+
+HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = 100
+# How long a claimed key may stay without a stored response (crashed worker)
+PENDING_TTL_SECONDS = 30
+PENDING = 'pending'
+
+
+def _redis_key(scope, user_id, key):
+    return f"idem:{scope}:{user_id}:{key}"
+
+
+def _fingerprint(request):
+    body = json.dumps(request.data, sort_keys=True, cls=JSONEncoder)
+    return hashlib.sha256(f"{request.path}|{body}".encode()).hexdigest()
+
+
+def _replay(stored, fingerprint):
+    record = json.loads(stored)
+    if record.get('state') == PENDING:
+        return Response({'error': 'A request with this Idempotency-Key is still being processed'},
+                        status=status.HTTP_409_CONFLICT)
+    if record.get('fingerprint') != fingerprint:
+        return Response({'error': 'Idempotency-Key was already used for a different request'},
+                        status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+    response = Response(record['body'], status=record['status'])
+    response['Idempotent-Replayed'] = 'true'
+    return response
+
+
+def _release(redis_client, redis_key):
+    try:
+        redis_client.delete(redis_key)
+    except Exception as e:
+        logger.error(f"Could not release idempotency key {redis_key}: {e}")
+
+
+def idempotent(scope, get_redis, get_ttl):
+    """
+    Decorator for DRF function views (below @api_view/@permission_classes).
+    ``get_redis()`` returns the Redis client or None; ``get_ttl()`` the number
+    of seconds a stored response is kept.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(request, *args, **kwargs):
+            key = request.headers.get(HEADER)
+            redis_client = get_redis()
+            if not key or not redis_client:
+                return view(request, *args, **kwargs)
+            if len(key) > MAX_KEY_LENGTH:
+                return Response({'error': f'{HEADER} must be at most {MAX_KEY_LENGTH} characters'},
+                                status=status.HTTP_400_BAD_REQUEST)
+
+            redis_key = _redis_key(scope, request.user.id, key)
+            fingerprint = _fingerprint(request)
+            try:
+                claimed = redis_client.set(
+                    redis_key, json.dumps({'state': PENDING, 'fingerprint': fingerprint}),
+                    nx=True, ex=PENDING_TTL_SECONDS,
+                )
+                if not claimed:
+                    stored = redis_client.get(redis_key)
+                    if stored:
+                        logger.info(f"Idempotent replay for user {request.user.id}, key {key}")
+                        return _replay(stored, fingerprint)
+                    # Expired between SET and GET: run as a new request
+            except Exception as e:
+                logger.error(f"Idempotency check failed for key {key}: {e}")
+                return view(request, *args, **kwargs)
+
+            try:
+                response = view(request, *args, **kwargs)
+            except Exception:
+                _release(redis_client, redis_key)
+                raise
+
+            if response.status_code >= 500:
+                _release(redis_client, redis_key)
+                return response
+            try:
+                redis_client.set(redis_key, json.dumps({
+                    'state': 'done',
+                    'fingerprint': fingerprint,
+                    'status': response.status_code,
+                    'body': response.data,
+                }, cls=JSONEncoder), ex=get_ttl())
+            except Exception as e:
+                logger.error(f"Could not store idempotent response for key {key}: {e}")
+            return response
+        return wrapper
+    return decorator
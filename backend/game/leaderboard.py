@@ -0,0 +1,196 @@
+"""
+Real-time leaderboards of net winnings (payouts minus stakes) in Redis sorted sets.
+
+    leaderboard:round:{round_id}     one round
+    leaderboard:daily:{YYYY-MM-DD}   local day the round was settled
+    leaderboard:weekly:{YYYY-Www}    ISO week
+
+record_round() runs once per settled round: one grouped query over the round's
+bets, then ZADD into the round board and ZINCRBY into the day and week boards in
+a single pipeline. Ranks are ZREVRANK lookups, O(log n). Keys expire a while
+after their period ends; ``snapshot_leaderboards`` copies finished days and
+weeks into LeaderboardSnapshot, which the API falls back to once Redis no
+longer has them.
+"""
+import logging
+from decimal import Decimal
+
+from channels.layers import get_channel_layer
+from django.db import transaction
+from django.db.models import Sum
+from django.utils import timezone
+
+from accounts.models import User
+from .broadcast import sync_group_send
+from .models import Bet, LeaderboardSnapshot
+from .tables import group_name
+
+logger = logging.getLogger('game')
+
+PERIODS = ('round', 'daily', 'weekly')
+TTL_SECONDS = {
+    'round': 24 * 3600,
+    'daily': 8 * 24 * 3600,
+    'weekly': 5 * 7 * 24 * 3600,
+}
+PUSH_SIZE = 10
+
+
+def daily_key(day):
+    return day.isoformat()
+
+
+def weekly_key(day):
+    year, week, _ = day.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def period_key(period, day=None, round_id=None):
+    if period == 'round':
+        return round_id
+    day = day or timezone.localdate()
+    return daily_key(day) if period == 'daily' else weekly_key(day)
+
+
+def board_key(period, key):
+    return f"leaderboard:{period}:{key}"
+
+
+def _recorded_key(round_id):
+    return f"leaderboard:recorded:{round_id}"
+
+
+def round_results(round_obj):
+    """``{user_id: net winnings}`` of every user who bet in the round."""
+    rows = (
+        Bet.objects.filter(round=round_obj)
+        .values('user_id')
+        .annotate(staked=Sum('chip_amount'), won=Sum('payout_amount'))
+        .order_by()
+    )
+    return {row['user_id']: (row['won'] or 0) - (row['staked'] or 0) for row in rows}
+
+
+def record_round(round_obj, redis_client):
+    """
+    Add a settled round to the round, daily and weekly boards. Runs at most
+    once per round (guarded by a Redis flag), so settling twice never counts
+    twice. Returns True if the boards were updated.
+    """
+    if not redis_client:
+        return False
+    results = round_results(round_obj)
+    if not results:
+        return False
+    today = timezone.localdate()
+    keys = {
+        'round': board_key('round', round_obj.round_id),
+        'daily': board_key('daily', daily_key(today)),
+        'weekly': board_key('weekly', weekly_key(today)),
+    }
+    try:
+        if not redis_client.set(_recorded_key(round_obj.round_id), '1', nx=True, ex=TTL_SECONDS['round']):
+            return False
+        pipe = redis_client.pipeline()
+        pipe.zadd(keys['round'], {user_id: float(net) for user_id, net in results.items()})
+        for period in ('daily', 'weekly'):
+            for user_id, net in results.items():
+                pipe.zincrby(keys[period], float(net), user_id)
+        for period, key in keys.items():
+            pipe.expire(key, TTL_SECONDS[period])
+        pipe.execute()
+    except Exception as e:
+        logger.error(f"Leaderboard update for round {round_obj.round_id} failed: {e}")
+        return False
+    return True
+
+
+def _money(score):
+    return str(Decimal(str(score)).quantize(Decimal('0.01')))
+
+
+def _entries(rows):
+    """``[(user_id, score)]`` from ZREVRANGE -> ranked API entries with usernames."""
+    names = dict(User.objects.filter(id__in=[int(user_id) for user_id, _ in rows]).values_list('id', 'username'))
+    return [
+        {'rank': rank, 'user_id': int(user_id), 'username': names.get(int(user_id), ''), 'net_winnings': _money(score)}
+        for rank, (user_id, score) in enumerate(rows, start=1)
+    ]
+
+
+def get_leaderboard(redis_client, period, key, limit=20, user_id=None):
+    """
+    Top ``limit`` of a board plus the rank of ``user_id``:
+    ``{'entries': [...], 'me': {...} or None, 'source': 'redis' | 'snapshot'}``.
+    Falls back to the database snapshot when Redis doesn't have the board.
+    """
+    if redis_client:
+        try:
+            redis_key = board_key(period, key)
+            pipe = redis_client.pipeline()
+            pipe.zrevrange(redis_key, 0, limit - 1, withscores=True)
+            if user_id is not None:
+                pipe.zrevrank(redis_key, user_id)
+                pipe.zscore(redis_key, user_id)
+            results = pipe.execute()
+            if results[0]:
+                me = None
+                if user_id is not None and results[1] is not None:
+                    me = {'rank': results[1] + 1, 'net_winnings': _money(results[2])}
+                return {'entries': _entries(results[0]), 'me': me, 'source': 'redis'}
+        except Exception as e:
+            logger.error(f"Leaderboard read for {period}:{key} failed: {e}")
+
+    snapshot = LeaderboardSnapshot.objects.filter(period=period, period_key=key)
+    entries = [
+        {'rank': row.rank, 'user_id': row.user_id, 'username': row.user.username, 'net_winnings': str(row.net_winnings)}
+        for row in snapshot.select_related('user').order_by('rank')[:limit]
+    ]
+    me = None
+    if user_id is not None:
+        mine = snapshot.filter(user_id=user_id).values('rank', 'net_winnings').first()
+        if mine:
+            me = {'rank': mine['rank'], 'net_winnings': str(mine['net_winnings'])}
+    return {'entries': entries, 'me': me, 'source': 'snapshot'}
+
+
+def leaderboard_message(round_obj, redis_client):
+    """leaderboard_update group event with the top of the round and today's board."""
+    return {
+        'type': 'leaderboard_update',
+        'round_id': round_obj.round_id,
+        'round': get_leaderboard(redis_client, 'round', round_obj.round_id, PUSH_SIZE)['entries'],
+        'daily': get_leaderboard(redis_client, 'daily', daily_key(timezone.localdate()), PUSH_SIZE)['entries'],
+    }
+
+
+def publish_round_leaderboards(round_obj, redis_client):
+    """Record a settled round and push the updated boards to its table's game room."""
+    if not record_round(round_obj, redis_client):
+        return
+    try:
+        channel_layer = get_channel_layer()
+        if channel_layer:
+            sync_group_send(channel_layer)(group_name(round_obj.table), leaderboard_message(round_obj, redis_client))
+    except Exception as e:
+        logger.warning(f"Leaderboard push for round {round_obj.round_id} failed: {e}")
+
+
+def snapshot_board(redis_client, period, key, top=100):
+    """
+    Copy the top ``top`` of a finished board into LeaderboardSnapshot
+    (replacing an earlier snapshot of it). Returns the number of rows written.
+    """
+    rows = redis_client.zrevrange(board_key(period, key), 0, top - 1, withscores=True)
+    if not rows:
+        return 0
+    with transaction.atomic():
+        LeaderboardSnapshot.objects.filter(period=period, period_key=key).delete()
+        LeaderboardSnapshot.objects.bulk_create([
+            LeaderboardSnapshot(
+                period=period, period_key=key, user_id=int(user_id), rank=rank,
+                net_winnings=Decimal(_money(score)),
+            )
+            for rank, (user_id, score) in enumerate(rows, start=1)
+        ])
+    return len(rows)
@@ -0,0 +1,55 @@
+"""
+Management command to move completed rounds older than the retention window,
+with their bets and dice results, into the archive tables (see game/archival.py).
+
+    python manage.py archive_rounds                  # ARCHIVE_RETENTION_DAYS (default 30)
+    python manage.py archive_rounds --days 7 --batch-size 200
+    python manage.py archive_rounds --dry-run
+
+Meant to run nightly from cron. Each batch is its own transaction, so the
+command can be stopped and resumed at any time.
+"""
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from game.archival import archivable_rounds, archive_batch
+from game.models import Bet
+
+
+class Command(BaseCommand):
+    help = 'Archive completed rounds, bets and dice results older than the retention window'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.ARCHIVE_RETENTION_DAYS,
+                            help=f'Keep rounds newer than this many days live (default: {settings.ARCHIVE_RETENTION_DAYS})')
+        parser.add_argument('--batch-size', type=int, default=500, help='Rounds per transaction (default: 500)')
+        parser.add_argument('--max-batches', type=int, default=None, help='Stop after this many batches')
+        parser.add_argument('--dry-run', action='store_true', help='Only report what would be archived')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        if options['dry_run']:
+            rounds = archivable_rounds(cutoff)
+            bets = Bet.objects.filter(round__in=rounds).count()
+            self.stdout.write(f'Would archive {rounds.count()} rounds and {bets} bets started before {cutoff:%Y-%m-%d %H:%M}')
+            return
+
+        self.stdout.write(f'Archiving completed rounds started before {cutoff:%Y-%m-%d %H:%M}...')
+        start = time.perf_counter()
+        total_rounds = total_bets = batches = 0
+        while options['max_batches'] is None or batches < options['max_batches']:
+            rounds, bets = archive_batch(cutoff, options['batch_size'])
+            if not rounds:
+                break
+            batches += 1
+            total_rounds += rounds
+            total_bets += bets
+            self.stdout.write(f'  batch {batches}: {rounds} rounds, {bets} bets')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'📦 Archived {total_rounds} rounds and {total_bets} bets in {time.perf_counter() - start:.1f}s'
+        ))
@@ -0,0 +1,82 @@
+"""
+Management command to measure the per-tick CPU cost of fanning a game_room event
+out to WebSocket consumers, with and without the pre-encoded frame.
+
+It runs the real GameConsumer handlers against N in-memory consumers whose send()
+only records the payload, so the numbers cover handler + serialization work and
+exclude the network. ``--format msgpack`` measures sockets that negotiated the
+MessagePack subprotocol; the frame sizes of both formats are printed either way.
+"""
+import asyncio
+import json
+import time
+
+from django.core.management.base import BaseCommand
+
+from game.broadcast import with_frame, build_client_message, pack
+from game.consumers import GameConsumer
+
+EVENTS = {
+    'game_timer': {'type': 'game_timer', 'timer': 17, 'status': 'BETTING', 'round_id': 'R1700000000'},
+    'dice_result': {
+        'type': 'dice_result', 'timer': 51, 'round_id': 'R1700000000',
+        'result': '2, 5', 'dice_values': [2, 5, 2, 3, 5, 6],
+    },
+    'game_end': {
+        'type': 'game_end', 'timer': 80, 'status': 'COMPLETED', 'round_id': 'R1700000000',
+        'start_time': '2024-01-01T00:00:00+00:00', 'end_time': '2024-01-01T00:01:20+00:00',
+        'result_time': '2024-01-01T00:00:51+00:00',
+    },
+}
+
+
+class _BenchConsumer(GameConsumer):
+    table = 'main'
+
+    async def send(self, text_data=None, bytes_data=None, close=False):
+        self.last_frame = text_data if text_data is not None else bytes_data
+
+
+class Command(BaseCommand):
+    help = 'Microbenchmark per-tick CPU cost of game_room fan-out per 10k connections'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--connections', type=int, default=10000, help='Simulated sockets (default: 10000)')
+        parser.add_argument('--ticks', type=int, default=20, help='Ticks per event type (default: 20)')
+        parser.add_argument('--format', choices=['json', 'msgpack'], default='json', help='Wire format of the sockets (default: json)')
+
+    def handle(self, *args, **options):
+        connections = options['connections']
+        ticks = options['ticks']
+        consumers = [_BenchConsumer() for _ in range(connections)]
+        for consumer in consumers:
+            consumer.packed = options['format'] == 'msgpack'
+        scale = 10000 / connections
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Fan-out of one event to {connections} {options["format"]} consumers, {ticks} ticks each '
+            f'(ms per tick per 10k connections)'
+        ))
+        for name, event in EVENTS.items():
+            before = asyncio.run(self._measure(consumers, event, ticks, framed=False))
+            after = asyncio.run(self._measure(consumers, event, ticks, framed=True))
+            assert consumers[0].last_frame is not None
+            self.stdout.write(
+                f'  {name:<12} before {before * scale * 1000:8.2f} ms   '
+                f'after {after * scale * 1000:8.2f} ms   ({before / after if after else 0:.1f}x)'
+            )
+
+        self.stdout.write(self.style.SUCCESS('Frame size per message (bytes)'))
+        for name, event in EVENTS.items():
+            message = build_client_message(event)
+            self.stdout.write(f'  {name:<12} json {len(json.dumps(message).encode()):5d}   msgpack {len(pack(message)):5d}')
+
+    async def _measure(self, consumers, event, ticks, framed):
+        handler_name = event['type']
+        start = time.process_time()
+        for _ in range(ticks):
+            # The sender encodes once per tick; each consumer then forwards the frame
+            tick_event = with_frame(event) if framed else dict(event)
+            for consumer in consumers:
+                await getattr(consumer, handler_name)(tick_event)
+        return (time.process_time() - start) / ticks
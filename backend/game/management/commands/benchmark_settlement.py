@@ -0,0 +1,88 @@
+"""
+Management command to benchmark round settlement (calculate_payouts).
+Creates throwaway users, wallets and winning bets inside a transaction, settles
+the round, reports the time and number of SQL statements, then rolls back.
+"""
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from accounts.models import User, Wallet
+from game.models import GameRound, Bet
+from game.views import calculate_payouts
+
+CHIP_AMOUNTS = [Decimal('10'), Decimal('50'), Decimal('100'), Decimal('500')]
+# Number 1 appears twice: every bet on 1 wins with a 2x multiplier
+DICE_VALUES = [1, 1, 2, 3, 4, 5]
+BATCH_SIZE = 5000
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Benchmark set-based settlement for a round with N winning bets (data is rolled back)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes',
+            type=int,
+            nargs='+',
+            default=[10000, 100000, 1000000],
+            help='Numbers of winning bets to settle (default: 10000 100000 1000000)'
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.SUCCESS(f'Benchmarking settlement on {connection.vendor}...'))
+        for size in options['sizes']:
+            try:
+                with transaction.atomic():
+                    self._run(size)
+                    raise _Rollback()
+            except _Rollback:
+                pass
+
+    def _run(self, size):
+        setup_start = time.perf_counter()
+        prefix = f'settle_bench_{size}_'
+        User.objects.bulk_create(
+            [User(username=f'{prefix}{i}', password='!') for i in range(size)],
+            batch_size=BATCH_SIZE
+        )
+        user_ids = list(
+            User.objects.filter(username__startswith=prefix).values_list('id', flat=True)
+        )
+        Wallet.objects.bulk_create(
+            [Wallet(user_id=user_id, balance=Decimal('1000.00')) for user_id in user_ids],
+            batch_size=BATCH_SIZE
+        )
+        round_obj = GameRound.objects.create(round_id=f'BENCH-{size}', status='RESULT')
+        Bet.objects.bulk_create(
+            [
+                Bet(user_id=user_id, round=round_obj, number=1,
+                    chip_amount=CHIP_AMOUNTS[i % len(CHIP_AMOUNTS)])
+                for i, user_id in enumerate(user_ids)
+            ],
+            batch_size=BATCH_SIZE
+        )
+        self.stdout.write(f'  {size:>9} bets: setup {time.perf_counter() - setup_start:.1f}s')
+
+        statements = [0]
+
+        def count_statements(execute, sql, params, many, context):
+            statements[0] += 1
+            return execute(sql, params, many, context)
+
+        start = time.perf_counter()
+        with connection.execute_wrapper(count_statements):
+            calculate_payouts(round_obj, dice_values=DICE_VALUES)
+        elapsed = time.perf_counter() - start
+
+        settled = Bet.objects.filter(round=round_obj, is_winner=True).count()
+        self.stdout.write(self.style.SUCCESS(
+            f'  {size:>9} bets: settled {settled} in {elapsed:.2f}s '
+            f'({statements[0]} statements, {settled / elapsed if elapsed else 0:,.0f} bets/s)'
+        ))
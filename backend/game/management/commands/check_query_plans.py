@@ -0,0 +1,151 @@
+"""
+Management command that checks the hot query shapes still use an index.
+
+Loads a synthetic dataset inside a transaction, runs ANALYZE, captures EXPLAIN
+for every hot query and fails (non-zero exit) if any of them falls back to a
+sequential scan of its table. Everything is rolled back afterwards. Run it in
+CI against PostgreSQL after schema changes:
+
+    python manage.py check_query_plans
+    python manage.py check_query_plans --rows 50000 --verbose
+"""
+import re
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from accounts.models import User, Transaction, DepositRequest, WithdrawRequest
+from game.models import GameRound, Bet
+
+BATCH_SIZE = 5000
+USERS = 200
+ROUNDS = 100
+ROUND_STATUSES = ['COMPLETED'] * 8 + ['RESULT', 'BETTING']
+TRANSACTION_TYPES = ['BET', 'BET', 'BET', 'WIN', 'DEPOSIT', 'WITHDRAW', 'REFUND']
+
+
+class _Rollback(Exception):
+    pass
+
+
+def hot_queries(user, round_obj):
+    """``(label, table, queryset)`` for every query shape the indexes are meant to serve."""
+    since = timezone.now() - timedelta(days=1)
+    return [
+        ('Bet by (round, number)', Bet._meta.db_table,
+         Bet.objects.filter(round=round_obj, number=3)),
+        ('Bet by (user, round, number)', Bet._meta.db_table,
+         Bet.objects.filter(user=user, round=round_obj, number=3)),
+        ('Bet history by (user, -created_at)', Bet._meta.db_table,
+         Bet.objects.filter(user=user).order_by('-created_at', '-id')[:50]),
+        ('Transaction history by (user, -created_at)', Transaction._meta.db_table,
+         Transaction.objects.filter(user=user).order_by('-created_at', '-id')[:50]),
+        ('Transaction by (transaction_type, created_at)', Transaction._meta.db_table,
+         Transaction.objects.filter(transaction_type='DEPOSIT', created_at__gte=since)),
+        ('GameRound by (status, -start_time)', GameRound._meta.db_table,
+         GameRound.objects.filter(status='BETTING').order_by('-start_time')[:1]),
+        ('DepositRequest by (status, id)', DepositRequest._meta.db_table,
+         DepositRequest.objects.filter(status='PENDING', id__gt=0).order_by('-id')[:10]),
+        ('WithdrawRequest by (status, id)', WithdrawRequest._meta.db_table,
+         WithdrawRequest.objects.filter(status='PENDING', id__gt=0).order_by('-id')[:10]),
+    ]
+
+
+def is_sequential_scan(plan, table):
+    """True if ``plan`` (EXPLAIN output) reads ``table`` without an index."""
+    if connection.vendor == 'postgresql':
+        return re.search(rf'Seq Scan on {re.escape(table)}\b', plan) is not None
+    if connection.vendor == 'sqlite':
+        # "SEARCH <table> USING INDEX ..." is an index lookup, "SCAN <table>" a full scan
+        return re.search(rf'\bSCAN {re.escape(table)}\b(?! USING (COVERING )?INDEX)', plan) is not None
+    return 'ALL' in plan.split()
+
+
+class Command(BaseCommand):
+    help = 'Fail if any hot query falls back to a sequential scan on a synthetic dataset (data is rolled back)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=20000,
+                            help='Bets and transactions to generate (default: 20000)')
+        parser.add_argument('--verbose', action='store_true', help='Print every plan, not just failures')
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.SUCCESS(f'Checking hot query plans on {connection.vendor}...'))
+        failures = []
+        try:
+            with transaction.atomic():
+                user, round_obj = self._load(options['rows'])
+                for label, table, queryset in hot_queries(user, round_obj):
+                    plan = queryset.explain()
+                    if is_sequential_scan(plan, table):
+                        failures.append(label)
+                        self.stdout.write(self.style.ERROR(f'❌ {label}: sequential scan on {table}'))
+                        self.stdout.write(plan)
+                    else:
+                        self.stdout.write(self.style.SUCCESS(f'✅ {label}'))
+                        if options['verbose']:
+                            self.stdout.write(plan)
+                raise _Rollback()
+        except _Rollback:
+            pass
+
+        if failures:
+            raise CommandError(f'{len(failures)} hot query(s) use a sequential scan: {", ".join(failures)}')
+        self.stdout.write(self.style.SUCCESS('✅ All hot queries use an index'))
+
+    def _load(self, rows):
+        prefix = 'plan_check_'
+        User.objects.bulk_create(
+            [User(username=f'{prefix}{i}', password='!') for i in range(USERS)],
+            batch_size=BATCH_SIZE
+        )
+        users = list(User.objects.filter(username__startswith=prefix).order_by('id'))
+        GameRound.objects.bulk_create(
+            [
+                GameRound(round_id=f'PLAN-CHECK-{i}', status=ROUND_STATUSES[i % len(ROUND_STATUSES)])
+                for i in range(ROUNDS)
+            ],
+            batch_size=BATCH_SIZE
+        )
+        rounds = list(GameRound.objects.filter(round_id__startswith='PLAN-CHECK-').order_by('id'))
+
+        # Unique (user, round, number) for up to USERS * ROUNDS * 6 bets
+        rows = min(rows, USERS * ROUNDS * 6)
+        Bet.objects.bulk_create(
+            [
+                Bet(user=users[i % USERS], round=rounds[(i // USERS) % ROUNDS],
+                    number=(i // (USERS * ROUNDS)) % 6 + 1, chip_amount=Decimal('10'))
+                for i in range(rows)
+            ],
+            batch_size=BATCH_SIZE
+        )
+        Transaction.objects.bulk_create(
+            [
+                Transaction(user=users[i % USERS], transaction_type=TRANSACTION_TYPES[i % len(TRANSACTION_TYPES)],
+                            amount=Decimal('10'), balance_before=Decimal('0'), balance_after=Decimal('10'))
+                for i in range(rows)
+            ],
+            batch_size=BATCH_SIZE
+        )
+        statuses = ['APPROVED'] * 8 + ['REJECTED', 'PENDING']
+        DepositRequest.objects.bulk_create(
+            [
+                DepositRequest(user=users[i % USERS], amount=Decimal('100'), status=statuses[i % len(statuses)])
+                for i in range(rows // 10)
+            ],
+            batch_size=BATCH_SIZE
+        )
+        WithdrawRequest.objects.bulk_create(
+            [
+                WithdrawRequest(user=users[i % USERS], amount=Decimal('100'), status=statuses[i % len(statuses)])
+                for i in range(rows // 10)
+            ],
+            batch_size=BATCH_SIZE
+        )
+
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        return users[0], rounds[0]
@@ -0,0 +1,102 @@
+"""
+Management command for the monthly partitions of game_bet and accounts_transaction
+(PostgreSQL only, see game/partitioning.py).
+
+    manage_partitions --convert          # one-off: partition the existing tables
+    manage_partitions                    # create partitions for the coming months
+    manage_partitions --detach-older-than 12
+
+Meant to run daily from cron; creating partitions is idempotent.
+"""
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from game.partitioning import (
+    PARTITIONED_TABLES, add_months, month_start, partition_name, is_postgres, is_partitioned,
+    list_partitions, create_partition_sql, detach_partition_sql, convert_sql,
+)
+
+
+class Command(BaseCommand):
+    help = 'Create future / detach old monthly partitions of Bet and Transaction (PostgreSQL)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--convert', action='store_true',
+                            help='Convert the plain tables to monthly partitioned tables (one-off)')
+        parser.add_argument('--months-ahead', type=int, default=3,
+                            help='Partitions to keep ready beyond the current month (default: 3)')
+        parser.add_argument('--detach-older-than', type=int, default=None, metavar='MONTHS',
+                            help='Detach partitions that end more than MONTHS months ago')
+        parser.add_argument('--dry-run', action='store_true', help='Print the SQL without running it')
+
+    def handle(self, *args, **options):
+        if not is_postgres():
+            self.stdout.write(self.style.WARNING(
+                f'⚠️ Partitioning needs PostgreSQL (current database: {connection.vendor}); nothing to do'
+            ))
+            return
+
+        today = timezone.now().date()
+        with connection.cursor() as cursor:
+            for table in PARTITIONED_TABLES:
+                if not is_partitioned(cursor, table):
+                    if not options['convert']:
+                        self.stdout.write(self.style.WARNING(
+                            f'{table} is not partitioned; run with --convert to partition it'
+                        ))
+                        continue
+                    self.stdout.write(f'Converting {table} to monthly partitions...')
+                    self._execute(cursor, convert_sql(cursor, table, today, options['months_ahead']), options['dry_run'])
+                    self.stdout.write(self.style.SUCCESS(f'✅ {table} partitioned (old table kept as {table}_legacy)'))
+                    continue
+
+                self._ensure_partitions(cursor, table, today, options)
+                if options['detach_older_than'] is not None:
+                    self._detach_partitions(cursor, table, today, options)
+
+    def _ensure_partitions(self, cursor, table, today, options):
+        existing = {name for name, _ in list_partitions(cursor, table)}
+        statements = []
+        for offset in range(options['months_ahead'] + 1):
+            month = add_months(month_start(today), offset)
+            if partition_name(table, month) not in existing:
+                statements.append(create_partition_sql(table, month))
+        self._execute(cursor, statements, options['dry_run'])
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ {table}: {len(statements)} partition(s) created, {len(existing)} already present'
+        ))
+
+        qn = connection.ops.quote_name
+        if f'{table}_default' in existing:
+            cursor.execute(f"SELECT COUNT(*) FROM {qn(table + '_default')}")
+            stray = cursor.fetchone()[0]
+            if stray:
+                self.stdout.write(self.style.WARNING(
+                    f'⚠️ {stray} row(s) in {table}_default - create the matching monthly partitions by hand'
+                ))
+
+    def _detach_partitions(self, cursor, table, today, options):
+        cutoff = add_months(month_start(today), -options['detach_older_than'])
+        cutoff_name = partition_name(table, cutoff)
+        statements = [
+            detach_partition_sql(table, name)
+            for name, is_default in list_partitions(cursor, table)
+            # Names sort chronologically: <table>_pYYYY_MM
+            if not is_default and name.startswith(f'{table}_p') and name < cutoff_name
+        ]
+        self._execute(cursor, statements, options['dry_run'])
+        if statements:
+            self.stdout.write(self.style.SUCCESS(
+                f'📦 {table}: detached {len(statements)} partition(s) older than {cutoff}; '
+                f'they remain as standalone tables for archiving'
+            ))
+
+    def _execute(self, cursor, statements, dry_run):
+        if dry_run:
+            for sql in statements:
+                self.stdout.write(f'{sql};')
+            return
+        with transaction.atomic():
+            for sql in statements:
+                cursor.execute(sql)
@@ -0,0 +1,19 @@
+"""
+Management command to (re)build UserBettingStats from the live and archived bets.
+
+Run once after deploying the stats table, and again if the stats ever drift:
+
+    python manage.py rebuild_betting_stats
+"""
+from django.core.management.base import BaseCommand
+
+from game.betting_stats import rebuild_betting_stats
+
+
+class Command(BaseCommand):
+    help = 'Rebuild per-user lifetime betting stats from bets'
+
+    def handle(self, *args, **options):
+        self.stdout.write('Rebuilding user betting stats...')
+        rows = rebuild_betting_stats()
+        self.stdout.write(self.style.SUCCESS(f'✅ User betting stats rebuilt: {rows} users'))
@@ -0,0 +1,45 @@
+"""
+Management command to snapshot finished leaderboard periods to the database
+(see game/leaderboard.py).
+
+    python manage.py snapshot_leaderboards                 # yesterday (and last week after a Sunday)
+    python manage.py snapshot_leaderboards --date 2026-01-31 --top 500
+
+Meant to run from cron shortly after midnight. Re-running replaces the snapshot.
+"""
+from datetime import date, timedelta
+
+import redis
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from game.leaderboard import daily_key, weekly_key, snapshot_board
+
+
+class Command(BaseCommand):
+    help = 'Snapshot the daily (and, at the end of a week, weekly) leaderboards from Redis to the database'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date', type=date.fromisoformat, default=None,
+                            help='Day to snapshot, YYYY-MM-DD (default: yesterday)')
+        parser.add_argument('--top', type=int, default=100, help='Entries to keep per board (default: 100)')
+
+    def handle(self, *args, **options):
+        try:
+            redis_client = redis.Redis(connection_pool=settings.REDIS_POOL)
+            redis_client.ping()
+        except Exception as e:
+            raise CommandError(f'Redis is not available: {e}')
+
+        day = options['date'] or timezone.localdate() - timedelta(days=1)
+        boards = [('daily', daily_key(day))]
+        if day.isoweekday() == 7:
+            boards.append(('weekly', weekly_key(day)))
+
+        for period, key in boards:
+            rows = snapshot_board(redis_client, period, key, options['top'])
+            if rows:
+                self.stdout.write(self.style.SUCCESS(f'🏆 {period} {key}: {rows} entries saved'))
+            else:
+                self.stdout.write(self.style.WARNING(f'⚠️ {period} {key}: no leaderboard in Redis'))
@@ -1,20 +1,25 @@
+import atexit
 import json
 import logging
+import signal
+import sys
 import time
 
 logger = logging.getLogger('game.timer')
 import redis
-from asgiref.sync import async_to_sync
 from channels.layers import get_channel_layer
 from django.conf import settings
 from django.core.management.base import BaseCommand
 from django.utils import timezone
 
 from game.models import GameRound, DiceResult
-from game.views import calculate_payouts, get_dice_mode
+from game.broadcast import sync_group_send
+from game.tables import DEFAULT_TABLE, get_tables, is_valid_table
+from game.views import calculate_payouts
+from game.bet_intake import intake_enabled, flush_round_bets
+from game.bet_pool import queue_new_pool, reconcile_bet_pool
 from game.utils import (
-    generate_random_dice_values,
-    apply_dice_values_to_round,
+    resolve_round_dice,
     extract_dice_values,
     get_game_setting,
     calculate_current_timer,
@@ -24,6 +29,34 @@ from game.utils import (
 class Command(BaseCommand):
     help = 'Start the game timer task'
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--mode',
+            choices=['poll', 'deadline', 'async'],
+            default=getattr(settings, 'GAME_TIMER_MODE', 'poll'),
+            help=(
+                'poll: legacy loop that re-reads the round from the database every second; '
+                'deadline: precomputed phase schedule with monotonic deadlines, '
+                'database writes only on phase transitions; '
+                'async: deadline scheduler on asyncio with DB work in a bounded executor'
+            ),
+        )
+        parser.add_argument(
+            '--tables',
+            nargs='+',
+            default=None,
+            help='Game tables to drive (default: all tables in GAME_TABLES); poll mode only drives the default table',
+        )
+        parser.add_argument(
+            '--leader-election',
+            action='store_true',
+            default=getattr(settings, 'GAME_TIMER_LEADER_ELECTION', False),
+            help=(
+                'Run as one of several redundant timers: only the holder of the Redis '
+                'lease runs rounds and broadcasts, the others stand by and take over on failure'
+            ),
+        )
+
     def handle(self, *args, **options):
         logger.info('Starting game timer management command')
         self.stdout.write(self.style.SUCCESS('Starting game timer...'))
@@ -87,6 +120,58 @@ class Command(BaseCommand):
         else:
             logger.warning('Channel layer not available for game timer - WebSocket broadcasts will be skipped')
             self.stdout.write(self.style.WARNING('Channel layer not available - WebSocket broadcasts will be skipped'))
+
+        lease = None
+        if options['leader_election']:
+            if redis_client:
+                from game.timer_lease import TimerLease
+                lease = TimerLease(get_or_reconnect_redis)
+                lease.start()
+                # Give the lease back on exit so a standby takes over at once
+                atexit.register(lease.release)
+                signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+                self.stdout.write(self.style.WARNING(f'Leader election enabled ({lease.owner}) - waiting for lease...'))
+                lease.wait_for_leadership()
+                self.stdout.write(self.style.SUCCESS(f'Acquired game timer lease (epoch {lease.epoch}) - this instance is the leader'))
+            else:
+                logger.warning('Leader election requested but Redis is not available - running as sole timer')
+                self.stdout.write(self.style.WARNING('Redis not available - leader election disabled'))
+
+        if getattr(settings, 'GAME_WS_PROTOCOL', 'ticks') == 'schedule' and options['mode'] == 'poll':
+            logger.warning('GAME_WS_PROTOCOL=schedule is not supported by the poll timer - per-second ticks are still sent')
+            self.stdout.write(self.style.WARNING('Schedule protocol needs --mode deadline or async; poll mode keeps sending ticks'))
+
+        tables = get_tables()
+        if options['tables']:
+            unknown = [t for t in options['tables'] if not is_valid_table(t)]
+            if unknown:
+                self.stdout.write(self.style.ERROR(f'Unknown table(s): {", ".join(unknown)} (configured: {", ".join(tables)})'))
+                return
+            tables = options['tables']
+
+        if options['mode'] == 'async':
+            from game.async_engine import run_tables
+            logger.info(f'Game timer running in async engine mode for tables: {tables}')
+            run_tables(
+                tables, self, redis_client, channel_layer,
+                get_or_reconnect_redis, get_or_reconnect_channel_layer,
+                lease=lease,
+            )
+            return
+
+        if options['mode'] == 'deadline':
+            from game.round_scheduler import run_tables
+            logger.info(f'Game timer running in deadline scheduler mode for tables: {tables}')
+            run_tables(
+                tables, self, redis_client, channel_layer,
+                get_or_reconnect_redis, get_or_reconnect_channel_layer,
+                lease=lease,
+            )
+            return
+
+        if tables != [DEFAULT_TABLE]:
+            logger.warning(f'Poll mode drives only the default table; ignoring {[t for t in tables if t != DEFAULT_TABLE]}')
+            self.stdout.write(self.style.WARNING('Poll mode drives only the default table - use --mode deadline or async for more tables'))
         
         # Log initial settings and track for changes
         last_betting_close = get_game_setting('BETTING_CLOSE_TIME', 30)
@@ -105,6 +190,10 @@ class Command(BaseCommand):
         iteration_count = 0
 
         while True:
+            if lease and not lease.is_leader:
+                self.stdout.write(self.style.WARNING('Game timer lease lost - standing by'))
+                lease.wait_for_leadership()
+                self.stdout.write(self.style.SUCCESS(f'Acquired game timer lease (epoch {lease.epoch}) - resuming rounds'))
             try:
                 # Track loop iteration start time for timing calculations
                 iteration_start = time.time()
@@ -139,6 +228,7 @@ class Command(BaseCommand):
                 # This prevents multiple active rounds from causing duplicate broadcasts
                 now = timezone.now()
                 old_rounds = GameRound.objects.filter(
+                    table=DEFAULT_TABLE,
                     status__in=['BETTING', 'CLOSED', 'RESULT']
                 ).exclude(
                     start_time__gte=now - timezone.timedelta(seconds=round_end_time)
@@ -149,7 +239,7 @@ class Command(BaseCommand):
                     for old_round in old_rounds:
                         if channel_layer:
                             try:
-                                async_to_sync(channel_layer.group_send)(
+                                sync_group_send(channel_layer)(
                                     'game_room',
                                     {
                                         'type': 'game_end',
@@ -177,6 +267,7 @@ class Command(BaseCommand):
                     with transaction.atomic():
                         # Use nowait=True to fail fast if row is locked, preventing blocking
                         round_obj = GameRound.objects.select_for_update(nowait=True).filter(
+                            table=DEFAULT_TABLE,
                             status__in=['BETTING', 'CLOSED', 'RESULT']
                         ).order_by('-start_time').first()
                         
@@ -212,10 +303,13 @@ class Command(BaseCommand):
                     # Reset flags for new round
                     round_obj._dice_roll_sent = False
                     round_obj._dice_result_sent = False
-                    # Clear Redis flags for previous round if any
+                    # Clear Redis flags for previous round if any, and start the round's bet pool
                     if redis_client:
                         try:
-                            redis_client.delete(f'dice_result_sent_{round_obj.round_id}')
+                            pipe = redis_client.pipeline()
+                            pipe.delete(f'dice_result_sent_{round_obj.round_id}')
+                            queue_new_pool(pipe, round_obj.round_id)
+                            pipe.execute()
                         except Exception:
                             pass
                     timer = 1  # Start at 1
@@ -240,7 +334,7 @@ class Command(BaseCommand):
                     # Send game_start message when new round starts
                     if channel_layer:
                         try:
-                            async_to_sync(channel_layer.group_send)(
+                            sync_group_send(channel_layer)(
                                 'game_room',
                                 {
                                     'type': 'game_start',
@@ -270,7 +364,7 @@ class Command(BaseCommand):
                         # Send game_end message with time and date
                         if channel_layer:
                             try:
-                                async_to_sync(channel_layer.group_send)(
+                                sync_group_send(channel_layer)(
                                     'game_room',
                                     {
                                         'type': 'game_end',
@@ -298,10 +392,13 @@ class Command(BaseCommand):
                         # Reset flags for new round
                         round_obj._dice_roll_sent = False
                         round_obj._dice_result_sent = False
-                        # Clear Redis flags for previous round if any
+                        # Clear Redis flags for previous round if any, and start the round's bet pool
                         if redis_client:
                             try:
-                                redis_client.delete(f'dice_result_sent_{round_obj.round_id}')
+                                pipe = redis_client.pipeline()
+                                pipe.delete(f'dice_result_sent_{round_obj.round_id}')
+                                queue_new_pool(pipe, round_obj.round_id)
+                                pipe.execute()
                             except Exception:
                                 pass
                         timer = 1  # Start new round at 1
@@ -310,7 +407,7 @@ class Command(BaseCommand):
                         # Send game_start message for new round
                         if channel_layer:
                             try:
-                                async_to_sync(channel_layer.group_send)(
+                                sync_group_send(channel_layer)(
                                     'game_room',
                                     {
                                         'type': 'game_start',
@@ -359,6 +456,9 @@ class Command(BaseCommand):
                             round_obj.status = status
                             if status == 'CLOSED' and not round_obj.betting_close_time:
                                 round_obj.betting_close_time = now
+                                if intake_enabled():
+                                    flush_round_bets(round_obj, redis_client)
+                                reconcile_bet_pool(round_obj, redis_client)
                             elif status == 'RESULT' and not round_obj.result_time:
                                 round_obj.result_time = now
                         
@@ -390,7 +490,7 @@ class Command(BaseCommand):
                     try:
                         # Send dice_roll event to trigger animation
                         # Note: dice_result may not exist yet - that's OK, we're just starting the animation
-                        async_to_sync(channel_layer.group_send)(
+                        sync_group_send(channel_layer)(
                             'game_room',
                             {
                                 'type': 'dice_roll',
@@ -409,21 +509,12 @@ class Command(BaseCommand):
                 if status == 'RESULT':
                     dice_values_for_broadcast = None
                     
-                    # Check if dice values are actually set (dice_1 through dice_6)
-                    dice_values_missing = any(
-                        getattr(round_obj, f'dice_{i}', None) is None 
-                        for i in range(1, 7)
-                    )
-                    
-                    # Auto-roll if dice_result is missing OR if any individual dice values are missing
+                    # Auto-roll if the dice are not stored yet
                     # Check when timer >= dice_result_time (not just ==) to handle missed checks
                     if timer >= dice_result_time:
-                        # If values are missing, auto-roll
-                        if not round_obj.dice_result or dice_values_missing:
-                            # Check dice mode – regardless of mode, ensure dice roll happens
-                            dice_mode = get_dice_mode()
-                            dice_values, result = generate_random_dice_values()
-                            apply_dice_values_to_round(round_obj, dice_values)
+                        # Conditional write: never re-rolls dice another timer (or an admin) already stored
+                        dice_values, result, rolled = resolve_round_dice(round_obj)
+                        if rolled:
                             for index, value in enumerate(dice_values, start=1):
                                 round_data[f'dice_{index}'] = value
 
@@ -433,7 +524,7 @@ class Command(BaseCommand):
                             round_data['dice_result'] = result
                             dice_values_for_broadcast = dice_values
 
-                            # CRITICAL: Save round_obj to database to persist dice values
+                            # Dice are already stored; persist result_time with the rest of the row
                             round_obj.save()
 
                             # Create dice result record
@@ -447,9 +538,6 @@ class Command(BaseCommand):
 
                             logger.info(f"Dice rolled automatically (random mode) at {timer}s for round {round_obj.round_id}: Result={result}")
                             self.stdout.write(self.style.SUCCESS(f'🎲 Dice rolled automatically (random mode) at {timer}s: {result}'))
-                        else:
-                            logger.info(f"Manual mode fallback: Auto-rolling at {timer}s for round {round_obj.round_id}: Result={result}")
-                            self.stdout.write(self.style.WARNING(f'⚠️ Manual mode fallback: No admin input detected by {timer}s, auto-rolling result {result}'))
                         
                         # If dice were already set (e.g., by admin pre-set), but payouts haven't been calculated for this round
                         # We use the dice_result_sent lock to ensure this only runs once at dice_result_time
@@ -530,7 +618,7 @@ class Command(BaseCommand):
                                     )
                                 
                                 # Send dice_result event to display the result
-                                async_to_sync(channel_layer.group_send)(
+                                sync_group_send(channel_layer)(
                                     'game_room',
                                     {
                                         'type': 'dice_result',
@@ -607,7 +695,7 @@ class Command(BaseCommand):
                         try:
                             # Use send_nowait=False to prevent blocking on full channels
                             # This ensures messages are queued even if channel is busy
-                            async_to_sync(channel_layer.group_send)(
+                            sync_group_send(channel_layer)(
                                 'game_room',
                                 timer_message
                             )
@@ -0,0 +1,59 @@
+"""
+Migration operations for adding indexes to the large, hot tables without
+blocking writes.
+
+On PostgreSQL the index is built with CREATE INDEX CONCURRENTLY. A partitioned
+table (see game/partitioning.py) can't be indexed concurrently, so the index is
+created ON ONLY the parent, built concurrently on every partition and then
+attached. Other databases get a plain CREATE INDEX.
+
+Migrations using these operations must set ``atomic = False``.
+"""
+from django.db.migrations.operations import AddIndex
+
+from .partitioning import is_partitioned, list_partitions
+
+
+class AddIndexConcurrentlyIfPostgres(AddIndex):
+    """AddIndex that doesn't lock the table against writes on PostgreSQL."""
+
+    def describe(self):
+        return f"Create index {self.index.name} on {self.model_name} (concurrently on PostgreSQL)"
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if not self.allow_migrate_model(schema_editor.connection.alias, model):
+            return
+        if schema_editor.connection.vendor != 'postgresql':
+            schema_editor.add_index(model, self.index)
+            return
+
+        table = model._meta.db_table
+        with schema_editor.connection.cursor() as cursor:
+            partitions = list_partitions(cursor, table) if is_partitioned(cursor, table) else None
+        if partitions is None:
+            schema_editor.add_index(model, self.index, concurrently=True)
+            return
+
+        qn = schema_editor.quote_name
+        parent = self.index.create_sql(model, schema_editor)
+        schema_editor.execute(str(parent).replace(' ON ', ' ON ONLY ', 1))
+        for partition, _ in partitions:
+            name = f"{partition}_{self.index.name}"[:63]
+            statement = self.index.create_sql(model, schema_editor, concurrently=True)
+            statement.parts['name'] = qn(name)
+            statement.parts['table'] = qn(partition)
+            schema_editor.execute(statement)
+            schema_editor.execute(f"ALTER INDEX {qn(self.index.name)} ATTACH PARTITION {qn(name)}")
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if not self.allow_migrate_model(schema_editor.connection.alias, model):
+            return
+        if schema_editor.connection.vendor != 'postgresql':
+            schema_editor.remove_index(model, self.index)
+            return
+        with schema_editor.connection.cursor() as cursor:
+            partitioned = is_partitioned(cursor, model._meta.db_table)
+        # DROP INDEX CONCURRENTLY isn't supported on partitioned indexes
+        schema_editor.remove_index(model, self.index, concurrently=not partitioned)
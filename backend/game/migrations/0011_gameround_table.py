@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-17 07:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('game', '0010_adminpermissions_can_manage_payment_methods'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='gameround',
+            name='table',
+            field=models.CharField(db_index=True, default='main', max_length=30),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.7 on 2026-10-17 07:45
+
+from django.db import migrations, models
+
+from game.migration_operations import AddIndexConcurrentlyIfPostgres
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('game', '0011_gameround_table'),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyIfPostgres(
+            model_name='bet',
+            index=models.Index(fields=['round', 'number'], name='bet_round_number_idx'),
+        ),
+        AddIndexConcurrentlyIfPostgres(
+            model_name='bet',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='bet_user_created_idx'),
+        ),
+        AddIndexConcurrentlyIfPostgres(
+            model_name='gameround',
+            index=models.Index(fields=['status', '-start_time'], name='round_status_start_idx'),
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 4.2.7 on 2026-10-17 07:42
+
+from decimal import Decimal
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('game', '0012_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedRound',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('round_id', models.CharField(max_length=50, unique=True)),
+                ('table', models.CharField(default='main', max_length=30)),
+                ('status', models.CharField(default='COMPLETED', max_length=10)),
+                ('dice_result', models.CharField(blank=True, max_length=50, null=True)),
+                ('dice_1', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('dice_2', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('dice_3', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('dice_4', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('dice_5', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('dice_6', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('start_time', models.DateTimeField()),
+                ('result_time', models.DateTimeField(blank=True, null=True)),
+                ('end_time', models.DateTimeField(blank=True, null=True)),
+                ('total_bets', models.IntegerField(default=0)),
+                ('total_amount', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=10)),
+                ('result_set_at', models.DateTimeField(blank=True, null=True)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('result_set_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-start_time'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedBet',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('number', models.PositiveSmallIntegerField()),
+                ('chip_amount', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('payout_amount', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=10)),
+                ('is_winner', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField()),
+                ('round', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='bets', to='game.archivedround')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_bets', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['user', '-created_at', '-id'], name='archbet_user_created_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.7 on 2026-10-17 07:43
+
+from decimal import Decimal
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0015_hot_query_indexes'),
+        ('game', '0013_archived_rounds'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserBettingStats',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='betting_stats', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('total_bets', models.IntegerField(default=0)),
+                ('total_wagered', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=16)),
+                ('total_wins', models.IntegerField(default=0)),
+                ('total_payouts', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=16)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
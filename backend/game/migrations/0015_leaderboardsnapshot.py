@@ -0,0 +1,33 @@
+# Generated by Django 4.2.7 on 2026-10-17 07:45
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('game', '0014_userbettingstats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeaderboardSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(choices=[('round', 'Round'), ('daily', 'Daily'), ('weekly', 'Weekly')], max_length=10)),
+                ('period_key', models.CharField(max_length=50)),
+                ('rank', models.IntegerField()),
+                ('net_winnings', models.DecimalField(decimal_places=2, max_digits=16)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard_snapshots', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['period', 'period_key', 'rank'],
+                'indexes': [models.Index(fields=['period', 'period_key', 'rank'], name='leaderboard_rank_idx')],
+                'unique_together': {('period', 'period_key', 'user')},
+            },
+        ),
+    ]
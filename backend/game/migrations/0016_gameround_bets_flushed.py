@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-17 08:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('game', '0015_leaderboardsnapshot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='gameround',
+            name='bets_flushed',
+            field=models.BooleanField(default=False),
+        ),
+    ]
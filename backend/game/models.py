@@ -14,6 +14,7 @@ class GameRound(models.Model):
     ]
 
     round_id = models.CharField(max_length=50, unique=True)
+    table = models.CharField(max_length=30, default='main', db_index=True)  # Game table (see game/tables.py)
     status = models.CharField(max_length=10, choices=ROUND_STATUS, default='WAITING')
     dice_result = models.CharField(max_length=50, null=True, blank=True)  # Stores winning number(s) as comma-separated string
     dice_1 = models.IntegerField(null=True, blank=True)  # Individual dice values (1-6)
@@ -34,9 +35,13 @@ class GameRound(models.Model):
     dice_roll_seconds = models.IntegerField(default=7)  # Time before dice result when warning is sent
     dice_result_seconds = models.IntegerField(default=51)  # Time when dice result is announced
     round_end_seconds = models.IntegerField(default=70)  # Total round duration
+    bets_flushed = models.BooleanField(default=False)  # Redis bet intake persisted (see game/bet_intake.py)
 
     class Meta:
         ordering = ['-start_time']
+        indexes = [
+            models.Index(fields=['status', '-start_time'], name='round_status_start_idx'),
+        ]
 
     def __str__(self):
         return f"Round {self.round_id} - {self.status}"
@@ -61,7 +66,11 @@ class Bet(models.Model):
 
     class Meta:
         ordering = ['-created_at']
-        unique_together = ['user', 'round', 'number']  # One bet per number per round per user
+        unique_together = ['user', 'round', 'number']  # One bet per number per round per user (also the (user, round, number) lookup index)
+        indexes = [
+            models.Index(fields=['round', 'number'], name='bet_round_number_idx'),
+            models.Index(fields=['user', '-created_at', '-id'], name='bet_user_created_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - Round {self.round.round_id} - Number {self.number} - {self.chip_amount}"
@@ -78,6 +87,109 @@ class DiceResult(models.Model):
         return f"Round {self.round.round_id} - Result: {self.result}"
 
 
+class UserBettingStats(models.Model):
+    """
+    Lifetime betting totals of a user, kept up to date by bet placement and
+    settlement (see game/betting_stats.py) so profile pages read one row.
+    Archiving rounds doesn't change them.
+    """
+    user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, primary_key=True, related_name='betting_stats')
+    total_bets = models.IntegerField(default=0)
+    total_wagered = models.DecimalField(max_digits=16, decimal_places=2, default=Decimal('0.00'))
+    total_wins = models.IntegerField(default=0)
+    total_payouts = models.DecimalField(max_digits=16, decimal_places=2, default=Decimal('0.00'))
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.user_id} - {self.total_bets} bets, {self.total_wins} wins"
+
+
+class LeaderboardSnapshot(models.Model):
+    """Final standings of a finished leaderboard period (see game/leaderboard.py)"""
+    PERIODS = [
+        ('round', 'Round'),
+        ('daily', 'Daily'),
+        ('weekly', 'Weekly'),
+    ]
+
+    period = models.CharField(max_length=10, choices=PERIODS)
+    period_key = models.CharField(max_length=50)  # round_id, YYYY-MM-DD or YYYY-Www
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='leaderboard_snapshots')
+    rank = models.IntegerField()
+    net_winnings = models.DecimalField(max_digits=16, decimal_places=2)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['period', 'period_key', 'rank']
+        unique_together = ['period', 'period_key', 'user']
+        indexes = [
+            models.Index(fields=['period', 'period_key', 'rank'], name='leaderboard_rank_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.period} {self.period_key} #{self.rank} - {self.user_id}: {self.net_winnings}"
+
+
+class ArchivedRound(models.Model):
+    """
+    Completed round moved out of GameRound by ``archive_rounds``, with its
+    DiceResult folded in. Field names match GameRound so the admin pages can
+    render either.
+    """
+    round_id = models.CharField(max_length=50, unique=True)
+    table = models.CharField(max_length=30, default='main')
+    status = models.CharField(max_length=10, default='COMPLETED')
+    dice_result = models.CharField(max_length=50, null=True, blank=True)
+    dice_1 = models.PositiveSmallIntegerField(null=True, blank=True)
+    dice_2 = models.PositiveSmallIntegerField(null=True, blank=True)
+    dice_3 = models.PositiveSmallIntegerField(null=True, blank=True)
+    dice_4 = models.PositiveSmallIntegerField(null=True, blank=True)
+    dice_5 = models.PositiveSmallIntegerField(null=True, blank=True)
+    dice_6 = models.PositiveSmallIntegerField(null=True, blank=True)
+    start_time = models.DateTimeField()
+    result_time = models.DateTimeField(null=True, blank=True)
+    end_time = models.DateTimeField(null=True, blank=True)
+    total_bets = models.IntegerField(default=0)
+    total_amount = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
+    result_set_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    result_set_at = models.DateTimeField(null=True, blank=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-start_time']
+
+    def __str__(self):
+        return f"Archived round {self.round_id}"
+
+    @property
+    def dice_result_list(self):
+        """Returns dice_result as a list of strings"""
+        if not self.dice_result:
+            return []
+        return [r.strip() for r in str(self.dice_result).split(',') if r.strip()]
+
+
+class ArchivedBet(models.Model):
+    """Bet of an archived round; keeps the original Bet id"""
+    id = models.BigIntegerField(primary_key=True)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='archived_bets')
+    round = models.ForeignKey(ArchivedRound, on_delete=models.CASCADE, related_name='bets')
+    number = models.PositiveSmallIntegerField()
+    chip_amount = models.DecimalField(max_digits=10, decimal_places=2)
+    payout_amount = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
+    is_winner = models.BooleanField(default=False)
+    created_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at', '-id'], name='archbet_user_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} - Archived round {self.round_id} - Number {self.number} - {self.chip_amount}"
+
+
 class GameSettings(models.Model):
     """Game configuration settings"""
     key = models.CharField(max_length=50, unique=True)
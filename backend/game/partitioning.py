@@ -0,0 +1,175 @@
+"""
+Optional monthly range partitioning of the Bet and Transaction tables (PostgreSQL).
+
+Both tables get thousands of rows per round and are read newest-first. Once a
+table is partitioned by ``created_at``, queries with a recent ``created_at``
+filter are pruned to the hot partitions, and an ordered scan with LIMIT stops
+after the newest partitions. Old months can be detached and archived without a
+big DELETE.
+
+Converting is a one-off operation (``manage_partitions --convert``):
+
+- the existing table is renamed to ``<table>_legacy`` and kept as a backup
+- a partitioned table with the same columns, defaults, foreign keys and
+  non-unique indexes takes its name; the primary key becomes (id, created_at)
+  because PostgreSQL requires the partition key in every unique constraint
+- monthly partitions cover the existing data plus the coming months, with a
+  DEFAULT partition as a safety net, and the rows are copied over
+
+Bet's (user, round, number) uniqueness cannot be a database constraint on a
+table partitioned by time, and get_or_create alone does not serialize without
+one: two requests can both miss the row and both insert. Writers of a bet
+take ``lock_bet()`` first, a transaction-scoped advisory lock on (user, round,
+number), so the second one finds the first one's row. For the same reason
+foreign keys pointing *at* a converted table (PendingPayment.bet) cannot
+reference ``id`` alone; they are dropped rather than left pointing at the
+legacy table.
+
+Django's model state is unchanged, so no migration is involved and SQLite
+development databases are unaffected.
+"""
+from datetime import date
+
+from django.db import connection
+
+PARTITIONED_TABLES = ['game_bet', 'accounts_transaction']
+
+
+def month_start(day):
+    return date(day.year, day.month, 1)
+
+
+def add_months(day, months):
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table, month):
+    return f'{table}_p{month.year}_{month.month:02d}'
+
+
+def is_postgres():
+    return connection.vendor == 'postgresql'
+
+
+def lock_bet(user_id, round_pk, number):
+    """
+    Serialize writers of one (user, round, number) bet until the current
+    transaction ends; stands in for the unique constraint a partitioned
+    game_bet cannot have. A no-op outside PostgreSQL.
+    """
+    if not is_postgres():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_advisory_xact_lock(hashtext(%s))", [f'game_bet:{user_id}:{round_pk}:{number}'])
+
+
+def is_partitioned(cursor, table):
+    cursor.execute(
+        "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s)", [table]
+    )
+    return cursor.fetchone() is not None
+
+
+def list_partitions(cursor, table):
+    """``[(partition_name, is_default)]`` of a partitioned table."""
+    cursor.execute(
+        """
+        SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) = 'DEFAULT'
+        FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = to_regclass(%s)
+        ORDER BY c.relname
+        """,
+        [table],
+    )
+    return cursor.fetchall()
+
+
+def create_partition_sql(table, month):
+    qn = connection.ops.quote_name
+    return (
+        f"CREATE TABLE IF NOT EXISTS {qn(partition_name(table, month))} PARTITION OF {qn(table)} "
+        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+    )
+
+
+def detach_partition_sql(table, partition):
+    qn = connection.ops.quote_name
+    return f"ALTER TABLE {qn(table)} DETACH PARTITION {qn(partition)}"
+
+
+def convert_sql(cursor, table, today, months_ahead):
+    """Statements that turn ``table`` into a monthly partitioned table (run in one transaction)."""
+    qn = connection.ops.quote_name
+    legacy = f'{table}_legacy'
+
+    cursor.execute(f"SELECT MIN(created_at) FROM {qn(table)}")
+    oldest = cursor.fetchone()[0]
+    first_month = month_start(oldest.date() if oldest else today)
+
+    # Non-unique indexes and foreign keys to recreate on the partitioned table
+    cursor.execute(
+        "SELECT indexdef FROM pg_indexes WHERE tablename = %s AND indexdef NOT LIKE 'CREATE UNIQUE%%'",
+        [table],
+    )
+    index_defs = [row[0].split(' USING ', 1)[1] for row in cursor.fetchall()]
+    cursor.execute(
+        "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+        "WHERE conrelid = to_regclass(%s) AND contype = 'f'",
+        [table],
+    )
+    foreign_keys = cursor.fetchall()
+    cursor.execute(
+        "SELECT attidentity FROM pg_attribute WHERE attrelid = to_regclass(%s) AND attname = 'id'",
+        [table],
+    )
+    identity = (cursor.fetchone() or [''])[0]
+    cursor.execute("SELECT pg_get_serial_sequence(%s, 'id')", [table])
+    sequence = cursor.fetchone()[0]
+    cursor.execute(
+        "SELECT conname FROM pg_constraint WHERE conrelid = to_regclass(%s) AND contype = 'p'", [table]
+    )
+    primary_key = cursor.fetchone()[0]
+    cursor.execute(
+        "SELECT conrelid::regclass::text, conname FROM pg_constraint "
+        "WHERE confrelid = to_regclass(%s) AND contype = 'f'",
+        [table],
+    )
+    inbound_keys = cursor.fetchall()
+
+    statements = [
+        f"LOCK TABLE {qn(table)} IN ACCESS EXCLUSIVE MODE",
+    ]
+    for referencing_table, name in inbound_keys:
+        statements.append(f"ALTER TABLE {referencing_table} DROP CONSTRAINT {qn(name)}")
+    statements += [
+        f"ALTER TABLE {qn(table)} RENAME TO {qn(legacy)}",
+        # Free the primary key name for the new table
+        f"ALTER TABLE {qn(legacy)} RENAME CONSTRAINT {qn(primary_key)} TO {qn(legacy + '_pkey')}",
+        f"CREATE TABLE {qn(table)} (LIKE {qn(legacy)} INCLUDING DEFAULTS INCLUDING IDENTITY) "
+        f"PARTITION BY RANGE (created_at)",
+        f"ALTER TABLE {qn(table)} ADD PRIMARY KEY (id, created_at)",
+    ]
+    for name, definition in foreign_keys:
+        statements.append(f"ALTER TABLE {qn(table)} ADD CONSTRAINT {qn(name + '_p')} {definition}")
+    for index_def in index_defs:
+        statements.append(f"CREATE INDEX ON {qn(table)} USING {index_def}")
+
+    month = first_month
+    last_month = add_months(month_start(today), months_ahead)
+    while month <= last_month:
+        statements.append(create_partition_sql(table, month))
+        month = add_months(month, 1)
+    statements.append(f"CREATE TABLE {qn(table + '_default')} PARTITION OF {qn(table)} DEFAULT")
+
+    statements.append(f"INSERT INTO {qn(table)} SELECT * FROM {qn(legacy)}")
+    if identity:
+        # The new table has its own identity sequence: continue after the copied ids
+        statements.append(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+            f"(SELECT COALESCE(MAX(id), 0) + 1 FROM {qn(table)}), false)"
+        )
+    elif sequence:
+        # serial column: the default still points at the old sequence; move its ownership
+        statements.append(f"ALTER SEQUENCE {sequence} OWNED BY {qn(table)}.id")
+    return statements
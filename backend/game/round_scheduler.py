@@ -0,0 +1,510 @@
+"""
+Deadline-driven round scheduler for the game timer.
+
+The legacy timer loop (``start_game_timer --mode poll``) wakes up roughly once a
+second, re-reads the active round with ``select_for_update`` and saves the whole
+row on every iteration. This module computes every phase boundary of a round once,
+from the timing columns stored on the GameRound row, and then sleeps until absolute
+``time.monotonic()`` deadlines. The database is only touched when the round really
+changes phase (betting closes, result is announced, round ends), while Redis and the
+channel layer still receive one update per second.
+"""
+import json
+import logging
+import threading
+import time
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils import timezone
+
+from .models import GameRound, DiceResult
+from .timer_lease import LeaseLost
+from .bet_intake import intake_enabled, flush_round_bets
+from .bet_pool import queue_new_pool, reconcile_bet_pool
+from .broadcast import with_frame, round_schedule_message
+from .tables import DEFAULT_TABLE, round_key, timer_key, group_name, make_round_id
+from .utils import (
+    DICE_FIELDS,
+    resolve_round_dice,
+    extract_dice_values,
+    get_game_setting,
+)
+
+logger = logging.getLogger('game.timer')
+
+ACTIVE_STATUSES = ['BETTING', 'CLOSED', 'RESULT']
+# Seconds between attempts to recover after an error: 1, 2, 4, ... up to this
+MAX_RETRY_DELAY = 30
+
+
+def retry_delay(failures):
+    """Backoff before recovery attempt number ``failures`` (1-based)."""
+    return min(MAX_RETRY_DELAY, 2 ** (failures - 1))
+
+
+def supervise(runner):
+    """Run ``runner.run`` forever, restarting it if anything escapes its own retry loop."""
+    failures = 0
+    while True:
+        try:
+            runner.run()
+        except Exception as e:
+            failures += 1
+            logger.exception(f"Round runner for table {runner.table} stopped: {e} - restarting")
+            time.sleep(retry_delay(failures))
+
+
+def run_tables(tables, *args, **kwargs):
+    """Drive several tables from one process: one supervised runner thread per extra table."""
+    runners = [DeadlineRoundRunner(*args, table=table, **kwargs) for table in tables]
+    for runner in runners[1:]:
+        threading.Thread(target=supervise, args=(runner,), name=f'game-table-{runner.table}', daemon=True).start()
+    supervise(runners[0])
+
+
+class RoundSchedule:
+    """
+    Phase boundaries of a single round, anchored to the monotonic clock.
+
+    Timer values follow the same convention as ``calculate_current_timer``:
+    the timer shows ``int(elapsed) + 1`` and runs from 1 to ``round_end``.
+    """
+
+    def __init__(self, round_obj):
+        self.round_id = round_obj.round_id
+        self.betting_close = round_obj.betting_close_seconds
+        self.dice_roll = round_obj.dice_roll_seconds
+        self.dice_result = round_obj.dice_result_seconds
+        self.round_end = round_obj.round_end_seconds
+
+        # Translate the wall-clock start time into a monotonic origin once,
+        # so later clock adjustments cannot shift the remaining deadlines.
+        elapsed = (timezone.now() - round_obj.start_time).total_seconds()
+        self.origin = time.monotonic() - max(0.0, elapsed)
+
+    def deadline(self, timer):
+        """Monotonic time at which the displayed timer reaches ``timer``."""
+        return self.origin + (timer - 1)
+
+    @property
+    def end_deadline(self):
+        """Monotonic time at which the round is over and the next one starts."""
+        return self.origin + self.round_end
+
+    def timer_at(self, now):
+        """Displayed timer value (1..round_end) for monotonic time ``now``."""
+        timer = int(now - self.origin) + 1
+        return max(1, min(timer, self.round_end))
+
+    def status_for(self, timer):
+        """Round status for a timer value (same rules as the polling loop)."""
+        if timer <= self.betting_close:
+            return 'BETTING'
+        if timer < self.dice_result:
+            return 'CLOSED'
+        return 'RESULT'
+
+
+class DeadlineRoundRunner:
+    """
+    Runs rounds back to back using precomputed schedules.
+
+    Per round the database sees: one INSERT for the new round, one conditional
+    UPDATE when betting closes, the result write plus payouts, and one UPDATE
+    when the round completes. Everything else is served from memory.
+    """
+
+    def __init__(self, command, redis_client, channel_layer, get_redis, get_channel_layer, lease=None,
+                 table=DEFAULT_TABLE):
+        self.stdout = command.stdout
+        self.style = command.style
+        self.redis_client = redis_client
+        self.channel_layer = channel_layer
+        # Reconnect helpers from the management command
+        self.get_redis = get_redis
+        self.get_channel_layer = get_channel_layer
+        # TimerLease when running redundant timers; None means we are the only one
+        self.lease = lease
+        # Game table this runner drives (rounds, Redis keys and WebSocket group)
+        self.table = table
+        # 'schedule': one round_schedule message per round instead of per-second ticks
+        self.schedule_protocol = getattr(settings, 'GAME_WS_PROTOCOL', 'ticks') == 'schedule'
+
+    def run(self):
+        self.stdout.write(self.style.SUCCESS('Deadline scheduler started (DB writes on phase transitions only)'))
+        # round_obj None means "pick the current round back up from the database";
+        # that recovery runs inside the try so its own failures are retried too.
+        round_obj, resumed = None, False
+        failures = 0
+        while True:
+            try:
+                if round_obj is None:
+                    self._check_lease()
+                    round_obj, resumed = self._resume_or_create_round()
+                round_obj = self._run_round(round_obj, resumed)
+                resumed = False
+                failures = 0
+            except LeaseLost:
+                self.stdout.write(self.style.WARNING('Game timer lease lost - standing by'))
+                self.lease.wait_for_leadership()
+                self.stdout.write(self.style.SUCCESS(f'Acquired game timer lease (epoch {self.lease.epoch}) - resuming rounds'))
+                close_old_connections()
+                self.channel_layer = self.get_channel_layer()
+                round_obj = None
+            except Exception as e:
+                failures += 1
+                logger.exception(f"Critical error in deadline scheduler: {e}")
+                self.stdout.write(self.style.ERROR(f'Error: {e}'))
+                # Drop the DB connection only if it is broken, back off, then
+                # pick the current round back up from the database.
+                close_old_connections()
+                time.sleep(retry_delay(failures))
+                self.channel_layer = self.get_channel_layer()
+                round_obj = None
+
+    # ------------------------------------------------------------------
+    # Round lifecycle
+    # ------------------------------------------------------------------
+
+    def _run_round(self, round_obj, resumed):
+        schedule = RoundSchedule(round_obj)
+        round_data = self._round_data(round_obj)
+
+        first_timer = schedule.timer_at(time.monotonic())
+        betting_closed = round_obj.status != 'BETTING'
+        dice_roll_sent = resumed and first_timer > schedule.dice_roll
+        result_done = resumed and self._dice_result_already_sent(round_obj)
+        game_start_timer = None if resumed else first_timer
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Schedule for {round_obj.round_id}: close>{schedule.betting_close}s, '
+            f'roll@{schedule.dice_roll}s, result@{schedule.dice_result}s, end@{schedule.round_end}s'
+        ))
+        if self.schedule_protocol:
+            self._group_send(self._schedule_message(round_obj))
+
+        while True:
+            self._check_lease()
+            now = time.monotonic()
+            if now >= schedule.end_deadline:
+                return self._finish_round(round_obj, schedule)
+
+            timer = schedule.timer_at(now)
+
+            if not betting_closed and timer > schedule.betting_close:
+                self._close_betting(round_obj)
+                betting_closed = True
+                if self.schedule_protocol:
+                    self._group_send(self._betting_closed_message(round_obj))
+
+            if (not dice_roll_sent and schedule.dice_roll <= timer < schedule.dice_result):
+                self._send_dice_roll(round_obj, schedule, timer)
+                dice_roll_sent = True
+
+            if not result_done and timer >= schedule.dice_result:
+                self._announce_result(round_obj, schedule, round_data)
+                result_done = True
+
+            status = schedule.status_for(timer)
+            self._publish_tick(round_obj, round_data, timer, status,
+                               broadcast=(not self.schedule_protocol
+                                          and timer != game_start_timer and timer != schedule.round_end))
+
+            # Sleep to the next absolute deadline; time spent above never accumulates.
+            next_deadline = min(schedule.deadline(timer + 1), schedule.end_deadline)
+            time.sleep(max(0.0, next_deadline - time.monotonic()))
+
+    @staticmethod
+    def _round_data(round_obj):
+        """Initial ``current_round`` payload mirrored to Redis every tick."""
+        round_data = {
+            'round_id': round_obj.round_id,
+            'table': round_obj.table,
+            'status': round_obj.status,
+            'start_time': round_obj.start_time.isoformat(),
+            # Phase lengths let WebSocket consumers build a round_schedule without the DB
+            'betting_close_seconds': round_obj.betting_close_seconds,
+            'dice_roll_seconds': round_obj.dice_roll_seconds,
+            'dice_result_seconds': round_obj.dice_result_seconds,
+            'round_end_seconds': round_obj.round_end_seconds,
+        }
+        for index, value in enumerate(extract_dice_values(round_obj), start=1):
+            if value is not None:
+                round_data[f'dice_{index}'] = value
+        return round_data
+
+    def _resume_or_create_round(self):
+        """Return ``(round, resumed)`` - the running round if still live, else a new one."""
+        round_obj = self._find_live_round()
+        if round_obj:
+            return round_obj, True
+        return self._start_new_round(), False
+
+    def _find_live_round(self):
+        """The active round if it is still within its duration, else None."""
+        now = timezone.now()
+        round_obj = GameRound.objects.filter(table=self.table, status__in=ACTIVE_STATUSES).order_by('-start_time').first()
+        if round_obj and (now - round_obj.start_time).total_seconds() < round_obj.round_end_seconds:
+            logger.info(f"Resuming round {round_obj.round_id} in deadline scheduler")
+            self.stdout.write(self.style.SUCCESS(f'Resuming round: {round_obj.round_id}'))
+            return round_obj
+        return None
+
+    def _complete_stale_rounds(self, now):
+        """Mark every still-active round as COMPLETED; returns their game_end messages."""
+        stale_rounds = list(GameRound.objects.filter(table=self.table, status__in=ACTIVE_STATUSES))
+        if not stale_rounds:
+            return []
+        GameRound.objects.filter(pk__in=[r.pk for r in stale_rounds]).update(status='COMPLETED', end_time=now)
+        self.stdout.write(self.style.WARNING(f'Marked {len(stale_rounds)} old round(s) as COMPLETED'))
+        return [
+            {
+                'type': 'game_end',
+                'round_id': stale.round_id,
+                'status': 'COMPLETED',
+                'timer': stale.round_end_seconds,
+                'end_time': now.isoformat(),
+                'start_time': stale.start_time.isoformat(),
+                'result_time': stale.result_time.isoformat() if stale.result_time else None,
+            }
+            for stale in stale_rounds
+        ]
+
+    def _create_round(self, now):
+        return GameRound.objects.create(
+            round_id=make_round_id(self.table, now),
+            table=self.table,
+            status='BETTING',
+            betting_close_seconds=get_game_setting('BETTING_CLOSE_TIME', 30),
+            dice_roll_seconds=get_game_setting('DICE_ROLL_TIME', 7),
+            dice_result_seconds=get_game_setting('DICE_RESULT_TIME', 51),
+            round_end_seconds=get_game_setting('ROUND_END_TIME', 80)
+        )
+
+    def _start_new_round(self):
+        now = timezone.now()
+        for message in self._complete_stale_rounds(now):
+            self._group_send(message)
+        round_obj = self._create_round(now)
+
+        if self.redis_client:
+            try:
+                pipe = self.redis_client.pipeline()
+                pipe.delete(f'dice_result_sent_{round_obj.round_id}')
+                pipe.set(round_key(self.table), json.dumps({
+                    'round_id': round_obj.round_id,
+                    'status': 'BETTING',
+                    'start_time': round_obj.start_time.isoformat(),
+                    'timer': 1,
+                }))
+                pipe.set(timer_key(self.table), '1')
+                queue_new_pool(pipe, round_obj.round_id)
+                pipe.execute()
+            except Exception as e:
+                self.stdout.write(self.style.WARNING(f'Redis write error: {e}, reconnecting...'))
+                self.redis_client = self.get_redis()
+
+        self._group_send({
+            'type': 'game_start',
+            'round_id': round_obj.round_id,
+            'status': 'BETTING',
+            'timer': 1,
+        })
+        logger.info(f"New round created: {round_obj.round_id}")
+        self.stdout.write(self.style.SUCCESS(f'New round started: {round_obj.round_id}'))
+        return round_obj
+
+    def _finish_round(self, round_obj, schedule):
+        if self._group_send(self._complete_round(round_obj, schedule)):
+            self.stdout.write(self.style.SUCCESS(f'📤 Sent game_end message for round {round_obj.round_id}'))
+
+        return self._start_new_round()
+
+    def _complete_round(self, round_obj, schedule):
+        """Mark the round COMPLETED; returns its game_end message."""
+        end_time = timezone.now()
+        GameRound.objects.filter(pk=round_obj.pk).update(status='COMPLETED', end_time=end_time)
+        round_obj.status = 'COMPLETED'
+        round_obj.end_time = end_time
+        return {
+            'type': 'game_end',
+            'round_id': round_obj.round_id,
+            'status': 'COMPLETED',
+            'timer': schedule.round_end,
+            'end_time': end_time.isoformat(),
+            'start_time': round_obj.start_time.isoformat(),
+            'result_time': round_obj.result_time.isoformat() if round_obj.result_time else None,
+        }
+
+    # ------------------------------------------------------------------
+    # Phase transitions
+    # ------------------------------------------------------------------
+
+    def _close_betting(self, round_obj):
+        now = timezone.now()
+        # Conditional update: never downgrade a round an admin already moved to RESULT.
+        GameRound.objects.filter(pk=round_obj.pk, status='BETTING').update(
+            status='CLOSED', betting_close_time=now
+        )
+        if round_obj.status == 'BETTING':
+            round_obj.status = 'CLOSED'
+            round_obj.betting_close_time = now
+        self.stdout.write(self.style.SUCCESS(f'🔒 Betting closed for round {round_obj.round_id}'))
+        if intake_enabled():
+            flushed = flush_round_bets(round_obj, self.redis_client)
+            if flushed:
+                self.stdout.write(self.style.SUCCESS(f'💾 Persisted {flushed} pending bets for round {round_obj.round_id}'))
+        reconcile_bet_pool(round_obj, self.redis_client)
+
+    def _send_dice_roll(self, round_obj, schedule, timer):
+        if self._group_send({
+            'type': 'dice_roll',
+            'round_id': round_obj.round_id,
+            'timer': timer,
+            'dice_roll_time': schedule.dice_roll,
+        }):
+            self.stdout.write(self.style.SUCCESS(f'📤 Sent dice_roll at timer {timer}s (animation start)'))
+
+    def _announce_result(self, round_obj, schedule, round_data):
+        dice_values = self._resolve_dice(round_obj, schedule)
+        self._settle(round_obj, dice_values)
+        self._record_result(round_data, round_obj, dice_values)
+
+        # Keep the Redis NX lock so a concurrently running poll-mode timer
+        # (or a restarted scheduler) cannot broadcast the result twice.
+        lock_acquired = True
+        if self.redis_client:
+            try:
+                lock_acquired = self.redis_client.set(
+                    f'dice_result_sent_{round_obj.round_id}', '1', ex=300, nx=True
+                )
+            except Exception as e:
+                self.stdout.write(self.style.WARNING(f'Redis lock error: {e}'))
+
+        if lock_acquired:
+            if self._group_send(self._dice_result_message(round_obj, schedule, dice_values)):
+                self.stdout.write(self.style.SUCCESS(f'📤 Sent dice_result at timer {schedule.dice_result}s (result display)'))
+        else:
+            self.stdout.write(self.style.WARNING(f'⚠️ Dice_result already sent (lock exists) for round {round_obj.round_id}'))
+
+    def _resolve_dice(self, round_obj, schedule):
+        """Use pre-set dice or roll them, and store the result; returns the six values."""
+        # Admins may have pre-set the dice from the dashboard since the round started.
+        # A previous leader may also have rolled them already; resolve_round_dice
+        # only rolls when no dice are stored and never overwrites stored ones.
+        round_obj.refresh_from_db(fields=DICE_FIELDS + ['dice_result', 'status', 'result_time'])
+        dice_values, result, auto_rolled = resolve_round_dice(round_obj)
+
+        if auto_rolled:
+            logger.info(f"Dice rolled automatically at {schedule.dice_result}s for round {round_obj.round_id}: Result={result}")
+            self.stdout.write(self.style.SUCCESS(f'🎲 Dice rolled automatically at {schedule.dice_result}s: {result}'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'🎲 Using stored dice for round {round_obj.round_id}: {result}'))
+
+        round_obj.status = 'RESULT'
+        if not round_obj.result_time:
+            round_obj.result_time = timezone.now()
+        round_obj.save(update_fields=['status', 'result_time'])
+
+        if auto_rolled:
+            DiceResult.objects.update_or_create(
+                round=round_obj,
+                defaults={'result': round_obj.dice_result}
+            )
+        return dice_values
+
+    def _settle(self, round_obj, dice_values):
+        from .views import calculate_payouts
+
+        # The lease may have been lost while the dice were stored; the new leader settles then
+        self._check_lease()
+        calculate_payouts(round_obj, dice_result=round_obj.dice_result, dice_values=dice_values)
+        self.stdout.write(self.style.SUCCESS(f'💰 Payouts calculated for round {round_obj.round_id}: {round_obj.dice_result}'))
+
+    @staticmethod
+    def _record_result(round_data, round_obj, dice_values):
+        round_data['dice_result'] = round_obj.dice_result
+        for index, value in enumerate(dice_values, start=1):
+            round_data[f'dice_{index}'] = value
+
+    @staticmethod
+    def _schedule_message(round_obj):
+        return round_schedule_message(
+            round_obj.round_id, round_obj.status, round_obj.start_time,
+            round_obj.betting_close_seconds, round_obj.dice_roll_seconds,
+            round_obj.dice_result_seconds, round_obj.round_end_seconds,
+        )
+
+    @staticmethod
+    def _betting_closed_message(round_obj):
+        return {'type': 'round_update', 'round_id': round_obj.round_id, 'status': 'CLOSED'}
+
+    @staticmethod
+    def _dice_result_message(round_obj, schedule, dice_values):
+        return {
+            'type': 'dice_result',
+            'result': round_obj.dice_result,
+            'round_id': round_obj.round_id,
+            'timer': schedule.dice_result,
+            'dice_values': dice_values,
+        }
+
+    def _dice_result_already_sent(self, round_obj):
+        if not self.redis_client:
+            return False
+        try:
+            return bool(self.redis_client.get(f'dice_result_sent_{round_obj.round_id}'))
+        except Exception:
+            return False
+
+    # ------------------------------------------------------------------
+    # Per-second output (Redis + WebSocket, no database)
+    # ------------------------------------------------------------------
+
+    def _publish_tick(self, round_obj, round_data, timer, status, broadcast=True):
+        round_data['status'] = status
+        round_data['timer'] = timer
+
+        if self.redis_client:
+            try:
+                pipe = self.redis_client.pipeline()
+                pipe.set(timer_key(self.table), str(timer))
+                pipe.set(round_key(self.table), json.dumps(round_data))
+                pipe.execute()
+            except Exception as e:
+                self.stdout.write(self.style.WARNING(f'Redis write error: {e}, reconnecting...'))
+                self.redis_client = self.get_redis()
+
+        if broadcast:
+            if self._group_send({
+                'type': 'game_timer',
+                'timer': timer,
+                'status': status,
+                'round_id': round_obj.round_id,
+            }):
+                logger.debug(f"Broadcasted timer: {timer}s, Status: {status}")
+                if timer % 10 == 0:
+                    self.stdout.write(self.style.SUCCESS(f'📤 Broadcast timer: {timer}s, Status: {status}'))
+
+        self.stdout.write(f"Timer: {timer}s, Status: {status}, Round: {round_obj.round_id}")
+
+    def _check_lease(self):
+        if self.lease and not self.lease.is_leader:
+            raise LeaseLost()
+
+    def _group_send(self, message):
+        """Broadcast to the game room; returns False (and never raises) on failure."""
+        if not self.channel_layer:
+            return False
+        if self.lease and not self.lease.is_leader:
+            # Another instance may already own the round; never double-broadcast
+            return False
+        try:
+            async_to_sync(self.channel_layer.group_send)(group_name(self.table), with_frame(message))
+            return True
+        except Exception as e:
+            logger.error(f"Failed to broadcast {message.get('type')}: {e}")
+            self.channel_layer = self.get_channel_layer()
+            return False
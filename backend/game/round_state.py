@@ -0,0 +1,113 @@
+"""
+Process-local snapshot of each table's round state for GameConsumer.
+
+Every game_room event a consumer forwards (game_start, timer, dice_roll,
+dice_result, game_end, round_schedule, ...) also updates this snapshot, so an
+ASGI process always knows the current round, status and timer of the tables
+its sockets watch. Connects and ``get_state`` requests during a reconnect storm
+are answered from memory, without Redis or database round-trips.
+
+The snapshot is trusted while it is fresh: the last timer was seen less than
+STALE_AFTER_SECONDS ago (tick protocol), or the round schedule says the round is
+still running (schedule protocol). Otherwise the consumer falls back to Redis
+and the database once - one connection at a time per table - and seeds the
+snapshot with the answer.
+"""
+import asyncio
+import time
+from datetime import datetime
+
+from django.utils import timezone
+
+from .broadcast import round_schedule_message
+
+# A timer tick is broadcast every second; after this long without one the
+# snapshot is no longer trusted on its own
+STALE_AFTER_SECONDS = 3
+
+SCHEDULE_FIELDS = ('betting_close_time', 'dice_roll_time', 'dice_result_time', 'round_end_time')
+
+_states = {}
+_locks = {}
+
+
+def observe(table, event):
+    """Update the table's snapshot from a game_room event or a game_state message."""
+    round_id = event.get('round_id')
+    if not round_id:
+        return
+    state = _states.get(table)
+    if state is None or state['round_id'] != round_id:
+        state = _states[table] = {'round_id': round_id, 'status': None, 'timer': None, 'timer_at': None, 'schedule': None}
+    # with_frame() fills in the status of dice_roll/dice_result events
+    if event.get('status'):
+        state['status'] = event['status']
+    if event.get('timer'):
+        state['timer'] = int(event['timer'])
+        state['timer_at'] = time.monotonic()
+    if event.get('type') == 'round_schedule' and event.get('start_time'):
+        state['schedule'] = {
+            'start_time': datetime.fromisoformat(event['start_time']),
+            **{field: event.get(field) for field in SCHEDULE_FIELDS},
+        }
+    state['updated_at'] = time.monotonic()
+
+
+def get_phase(table, field):
+    """A phase length (e.g. 'dice_result_time') of the table's current round, if known."""
+    state = _states.get(table)
+    if state and state['schedule']:
+        return state['schedule'].get(field)
+    return None
+
+
+def _current_timer(state):
+    schedule = state['schedule']
+    if schedule:
+        elapsed = (timezone.now() - schedule['start_time']).total_seconds()
+        if 0 <= elapsed < schedule['round_end_time']:
+            return int(elapsed) + 1
+        return None
+    if state['timer'] is None or time.monotonic() - state['timer_at'] > STALE_AFTER_SECONDS:
+        return None
+    if state['status'] == 'COMPLETED':
+        # game_end carries the round's final timer
+        return state['timer']
+    return state['timer'] + int(time.monotonic() - state['timer_at'])
+
+
+def current_messages(table, with_schedule=False):
+    """
+    Messages to send a newly connected client (game_state, plus round_schedule
+    when ``with_schedule``), or None if the snapshot isn't fresh.
+    """
+    state = _states.get(table)
+    if not state or not state['status']:
+        return None
+    timer = _current_timer(state)
+    if timer is None:
+        return None
+    messages = [{'type': 'game_state', 'round_id': state['round_id'], 'status': state['status'], 'timer': timer}]
+    if with_schedule:
+        schedule = state['schedule']
+        if schedule is None:
+            return None
+        messages.append(round_schedule_message(
+            state['round_id'], state['status'], schedule['start_time'],
+            *(schedule[field] for field in SCHEDULE_FIELDS),
+        ))
+    return messages
+
+
+def remember(table, messages):
+    """Seed the snapshot from messages built by the Redis/database fallback."""
+    for message in messages:
+        observe(table, message)
+
+
+def refresh_lock(table):
+    """asyncio.Lock letting one connection per table refresh a stale snapshot."""
+    lock = _locks.get(table)
+    if lock is None:
+        lock = _locks[table] = asyncio.Lock()
+    return lock
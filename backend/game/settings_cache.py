@@ -0,0 +1,189 @@
+"""
+Process-local snapshot of the GameSettings table.
+
+Each process (ASGI workers, the game timer) keeps one in-memory copy of every
+settings row. Saving a setting bumps a version counter in Redis and publishes it on
+a pub/sub channel; a daemon thread in every process listens on that channel and
+marks the snapshot stale, so the next read reloads all rows with a single query.
+Hot paths (timer ticks, place_bet, WebSocket handlers) therefore do no settings
+queries at all.
+
+If Redis is unavailable the listener cannot run and the snapshot instead expires
+after GAME_SETTINGS_FALLBACK_TTL seconds (1 second by default), which keeps the old
+"changes apply on the next tick" behaviour.
+"""
+import logging
+import threading
+import time
+
+import redis
+from django.conf import settings
+
+logger = logging.getLogger('game')
+
+SETTINGS_VERSION_KEY = 'game_settings:version'
+SETTINGS_CHANNEL = 'game_settings:changed'
+
+# Settings stored as text in the database that callers expect as integers
+NUMERIC_KEYS = [
+    'BETTING_CLOSE_TIME', 'DICE_ROLL_TIME', 'DICE_RESULT_TIME', 'ROUND_END_TIME',
+    'BETTING_DURATION', 'RESULT_SELECTION_DURATION',
+    'RESULT_DISPLAY_DURATION', 'TOTAL_ROUND_DURATION',
+    'RESULT_ANNOUNCE_TIME'
+]
+
+_lock = threading.Lock()
+_snapshot = None
+_dirty = True
+_listener_thread = None
+_listener_connected = False
+
+
+def _get_redis_client():
+    try:
+        if hasattr(settings, 'REDIS_POOL') and settings.REDIS_POOL:
+            return redis.Redis(connection_pool=settings.REDIS_POOL)
+    except AttributeError:
+        pass
+    return None
+
+
+def _coerce(key, value):
+    if key in NUMERIC_KEYS:
+        try:
+            return int(value)
+        except (ValueError, TypeError):
+            pass
+    return value
+
+
+def _max_age():
+    if _listener_connected:
+        return getattr(settings, 'GAME_SETTINGS_CACHE_TTL', 300)
+    return getattr(settings, 'GAME_SETTINGS_FALLBACK_TTL', 1)
+
+
+def get_settings_snapshot():
+    """
+    Return the current snapshot: ``{'version': int, 'values': {key: value}}``.
+
+    Values come straight from the GameSettings table (numeric keys converted to
+    int); defaults from settings.GAME_SETTINGS are applied by the callers.
+    """
+    snapshot = _snapshot
+    if snapshot is not None and not _dirty and time.monotonic() - snapshot['loaded_at'] < _max_age():
+        return snapshot
+
+    with _lock:
+        snapshot = _snapshot
+        if snapshot is not None and not _dirty and time.monotonic() - snapshot['loaded_at'] < _max_age():
+            return snapshot
+        return _reload()
+
+
+def _reload():
+    global _snapshot, _dirty
+    from .models import GameSettings
+
+    _start_listener()
+    # Clear the flag before querying: an invalidation that arrives while we
+    # are loading marks the new snapshot stale again instead of being lost.
+    _dirty = False
+
+    version = 0
+    redis_client = _get_redis_client()
+    if redis_client:
+        try:
+            version = int(redis_client.get(SETTINGS_VERSION_KEY) or 0)
+        except Exception:
+            pass
+
+    try:
+        rows = GameSettings.objects.values_list('key', 'value')
+        values = {key: _coerce(key, value) for key, value in rows}
+    except Exception as e:
+        logger.error(f"Error loading game settings snapshot: {e}")
+        _dirty = True
+        if _snapshot is not None:
+            return _snapshot
+        values = {}
+
+    _snapshot = {
+        'version': version,
+        'values': values,
+        'loaded_at': time.monotonic(),
+    }
+    return _snapshot
+
+
+def invalidate_settings_snapshot():
+    """Mark this process's snapshot stale; the next read reloads it."""
+    global _dirty
+    _dirty = True
+
+
+def publish_settings_change():
+    """
+    Invalidate the snapshot in this process and tell every other process.
+    Call after the GameSettings change has been committed.
+    """
+    invalidate_settings_snapshot()
+    redis_client = _get_redis_client()
+    if not redis_client:
+        return None
+    try:
+        version = redis_client.incr(SETTINGS_VERSION_KEY)
+        redis_client.publish(SETTINGS_CHANNEL, str(version))
+        logger.info(f"Published game settings version {version}")
+        return version
+    except Exception as e:
+        logger.warning(f"Failed to publish game settings change: {e}")
+        return None
+
+
+def _start_listener():
+    global _listener_thread
+    if _listener_thread is not None and _listener_thread.is_alive():
+        return
+    if not _get_redis_client():
+        return
+    _listener_thread = threading.Thread(
+        target=_listen_for_changes,
+        name='game-settings-listener',
+        daemon=True,
+    )
+    _listener_thread.start()
+
+
+def _listen_for_changes():
+    """Background thread: mark the snapshot stale whenever a change is published."""
+    global _listener_connected
+    while True:
+        pubsub = None
+        try:
+            redis_client = _get_redis_client()
+            if not redis_client:
+                return
+            pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(SETTINGS_CHANNEL)
+            _listener_connected = True
+            # Changes may have been published while we were not subscribed
+            invalidate_settings_snapshot()
+            while True:
+                message = pubsub.get_message(timeout=1.0)
+                if message and message.get('type') == 'message':
+                    invalidate_settings_snapshot()
+        except Exception as e:
+            if _listener_connected:
+                logger.warning(f"Game settings listener disconnected: {e}")
+            else:
+                logger.debug(f"Game settings listener could not connect: {e}")
+        finally:
+            _listener_connected = False
+            if pubsub is not None:
+                try:
+                    pubsub.close()
+                except Exception:
+                    pass
+        invalidate_settings_snapshot()
+        time.sleep(1)
@@ -0,0 +1,151 @@
+"""
+Set-based settlement of a finished round.
+
+settle_round() pays every winning bet of a round with a bounded number of
+statements instead of 4-5 queries per winner:
+
+1. one SELECT of the unsettled winning bets (locked on databases that support it)
+2. one UPDATE per winning number marking bets as winners with their payout
+3. grouped ``balance = balance + X`` UPDATEs, one per distinct credit amount
+   (chunked by user id), so concurrent wallet writes are never overwritten
+4. one SELECT of the resulting balances
+5. bulk_create of the WIN transactions, with balance_before/balance_after
+   derived from the post-credit balance so a user winning on several numbers
+   gets a consistent chain of transactions
+6. grouped UserBettingStats updates for the winners' wins and payouts
+7. after commit, one ``win`` push per winner with their new balance
+
+Bets already marked as winners are skipped, so settling a round twice does not
+pay twice.
+"""
+import logging
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from accounts.models import Wallet, Transaction
+from accounts.financial_summary import add_to_daily_summary
+from accounts.notifications import push_to_users
+from .models import Bet
+from .betting_stats import apply_stats
+
+logger = logging.getLogger('game')
+
+# Max ids per IN (...) clause; keeps well under SQLite's parameter limit
+ID_CHUNK_SIZE = 900
+TRANSACTION_BATCH_SIZE = 2000
+
+
+def _chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def settle_round(round_obj, multipliers, describe):
+    """
+    Pay out all unsettled winning bets of ``round_obj``.
+
+    Args:
+        round_obj: GameRound instance
+        multipliers: {winning_number: Decimal multiplier}; payout = chip_amount * multiplier
+        describe: callable(number, multiplier, payout) -> transaction description
+
+    Returns:
+        Number of bets settled.
+    """
+    if not multipliers:
+        return 0
+
+    with transaction.atomic():
+        bets = list(
+            Bet.objects.select_for_update()
+            .filter(round=round_obj, number__in=list(multipliers), is_winner=False)
+            .order_by('user_id', 'number')
+            .values_list('user_id', 'number', 'chip_amount')
+        )
+        if not bets:
+            return 0
+
+        # Mark bets as winners: one UPDATE per winning number
+        for number, multiplier in multipliers.items():
+            Bet.objects.filter(round=round_obj, number=number, is_winner=False).update(
+                is_winner=True,
+                payout_amount=F('chip_amount') * multiplier,
+            )
+
+        # Total credit per user, then group users by credit amount
+        credits = defaultdict(Decimal)
+        for user_id, number, chip_amount in bets:
+            credits[user_id] += chip_amount * multipliers[number]
+
+        users_by_credit = defaultdict(list)
+        for user_id, amount in credits.items():
+            users_by_credit[amount].append(user_id)
+
+        now = timezone.now()
+        for amount, user_ids in users_by_credit.items():
+            for chunk in _chunks(user_ids, ID_CHUNK_SIZE):
+                Wallet.objects.filter(user_id__in=chunk).update(
+                    balance=F('balance') + amount,
+                    updated_at=now,
+                )
+
+        balances = {}
+        user_ids = list(credits)
+        for chunk in _chunks(user_ids, ID_CHUNK_SIZE):
+            balances.update(
+                Wallet.objects.filter(user_id__in=chunk).values_list('user_id', 'balance')
+            )
+
+        # Walk each user's bets in order so balance_before/after chain up
+        # to the balance we just read back.
+        transactions = []
+        running = {}
+        for user_id, number, chip_amount in bets:
+            if user_id not in balances:
+                logger.warning(f"Round {round_obj.round_id}: no wallet for user {user_id}, win not credited")
+                continue
+            multiplier = multipliers[number]
+            payout = chip_amount * multiplier
+            balance_before = running.get(user_id, balances[user_id] - credits[user_id])
+            balance_after = balance_before + payout
+            running[user_id] = balance_after
+            transactions.append(Transaction(
+                user_id=user_id,
+                transaction_type='WIN',
+                amount=payout,
+                balance_before=balance_before,
+                balance_after=balance_after,
+                description=describe(number, multiplier, payout),
+            ))
+        Transaction.objects.bulk_create(transactions, batch_size=TRANSACTION_BATCH_SIZE)
+        add_to_daily_summary(transactions)
+
+        wins = defaultdict(lambda: [0, 0, 0, Decimal('0.00')])
+        for user_id, number, chip_amount in bets:
+            wins[user_id][2] += 1
+            wins[user_id][3] += chip_amount * multipliers[number]
+        apply_stats(wins)
+
+        winning_bets = defaultdict(list)
+        for user_id, number, chip_amount in bets:
+            winning_bets[user_id].append({'number': number, 'payout': str(chip_amount * multipliers[number])})
+        push_to_users([
+            (user_id, {
+                'type': 'win',
+                'round_id': round_obj.round_id,
+                'payout': str(credits[user_id]),
+                'bets': winning_bets[user_id],
+                'wallet_balance': str(balances[user_id]),
+            })
+            for user_id in credits if user_id in balances
+        ])
+
+    logger.info(
+        f"Round {round_obj.round_id}: settled {len(bets)} winning bets "
+        f"for {len(credits)} users ({len(users_by_credit)} credit groups)"
+    )
+    return len(bets)
@@ -0,0 +1,15 @@
+"""
+Django signals for the game app
+"""
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import GameSettings
+from .settings_cache import publish_settings_change
+
+
+@receiver(post_save, sender=GameSettings)
+@receiver(post_delete, sender=GameSettings)
+def broadcast_game_settings_change(sender, instance, **kwargs):
+    """Invalidate every process's settings snapshot once the change is committed"""
+    transaction.on_commit(publish_settings_change)
@@ -0,0 +1,71 @@
+"""
+Game tables: independent dice rooms driven by the same engine.
+
+Every table has its own rounds (GameRound.table), its own Redis keys and its own
+WebSocket group. The default table keeps the original names ('current_round',
+'round_timer', 'game_room'), so single-table deployments and older clients are
+unaffected.
+
+Tables are configured with GAME_TABLES (comma-separated ids, default 'main') and
+optional per-table stakes in GAME_TABLE_BET_LIMITS.
+"""
+import re
+
+from django.conf import settings
+
+DEFAULT_TABLE = 'main'
+
+# Table ids end up in Redis keys and channel group names
+TABLE_ID_RE = re.compile(r'^[a-z0-9_-]{1,30}$')
+
+
+def get_tables():
+    """Configured table ids, default table first."""
+    tables = [t for t in getattr(settings, 'GAME_TABLES', [DEFAULT_TABLE]) if TABLE_ID_RE.match(t)]
+    if DEFAULT_TABLE in tables:
+        tables.remove(DEFAULT_TABLE)
+    return [DEFAULT_TABLE] + tables
+
+
+def is_valid_table(table):
+    return table in get_tables()
+
+
+def normalize_table(table):
+    """Return a configured table id for ``table`` (None/blank means the default table), else None."""
+    if not table:
+        return DEFAULT_TABLE
+    table = str(table).strip().lower()
+    return table if is_valid_table(table) else None
+
+
+def request_table(request):
+    """Table requested by an API call (``?table=`` or ``table`` in the body), else None if unknown."""
+    table = request.query_params.get('table')
+    if table is None and hasattr(request, 'data') and hasattr(request.data, 'get'):
+        table = request.data.get('table')
+    return normalize_table(table)
+
+
+def round_key(table=DEFAULT_TABLE):
+    return 'current_round' if table == DEFAULT_TABLE else f'current_round:{table}'
+
+
+def timer_key(table=DEFAULT_TABLE):
+    return 'round_timer' if table == DEFAULT_TABLE else f'round_timer:{table}'
+
+
+def group_name(table=DEFAULT_TABLE):
+    return 'game_room' if table == DEFAULT_TABLE else f'game_room_{table}'
+
+
+def make_round_id(table, now):
+    """Round ids stay unique when several tables start a round in the same second."""
+    round_id = f"R{int(now.timestamp())}"
+    return round_id if table == DEFAULT_TABLE else f"{round_id}-{table}"
+
+
+def bet_limits(table=DEFAULT_TABLE):
+    """``(min_bet, max_bet)`` for a table; either may be None (no limit)."""
+    limits = getattr(settings, 'GAME_TABLE_BET_LIMITS', {}).get(table) or [None, None]
+    return limits[0], limits[1]
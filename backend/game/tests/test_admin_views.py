@@ -0,0 +1,71 @@
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.messages import get_messages
+from django.test import TestCase
+from django.utils import timezone
+from django.urls import reverse
+
+from accounts.models import User
+from game.models import GameRound, DiceResult, Bet, ArchivedRound, ArchivedBet
+from game.betting_stats import apply_stats
+
+
+@mock.patch('game.admin_views.redis_client', None)
+class SetIndividualDiceViewTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(username='dice_admin', password='x', is_staff=True)
+        self.client.force_login(self.admin)
+        self.round = GameRound.objects.create(round_id='RDICE1', status='BETTING')
+        self.url = reverse('set_individual_dice_view')
+
+    def post_dice(self, values):
+        return self.client.post(self.url, {f'dice_{i}': value for i, value in enumerate(values, start=1)})
+
+    def test_presets_all_six_dice(self):
+        response = self.post_dice([2, 2, 5, 1, 3, 6])
+
+        self.assertRedirects(response, reverse('dice_control'), fetch_redirect_response=False)
+        self.round.refresh_from_db()
+        self.assertEqual(
+            [self.round.dice_1, self.round.dice_2, self.round.dice_3, self.round.dice_4, self.round.dice_5, self.round.dice_6],
+            [2, 2, 5, 1, 3, 6],
+        )
+        self.assertEqual(self.round.status, 'BETTING')
+        self.assertEqual(DiceResult.objects.get(round=self.round).set_by, self.admin)
+        self.assertIn('D1:2, D2:2, D3:5, D4:1, D5:3, D6:6', [str(m) for m in get_messages(response.wsgi_request)][0])
+
+    def test_rejects_out_of_range_value(self):
+        response = self.post_dice([2, 2, 5, 1, 3, 9])
+
+        self.assertRedirects(response, reverse('dice_control'), fetch_redirect_response=False)
+        self.round.refresh_from_db()
+        self.assertIsNone(self.round.dice_1)
+        self.assertEqual([str(m) for m in get_messages(response.wsgi_request)], ['Dice 6 value must be between 1-6'])
+
+
+@mock.patch('game.admin_views.redis_client', None)
+class AllBetsTotalsTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(username='bets_admin', password='x', is_staff=True, is_superuser=True)
+        self.client.force_login(self.admin)
+        player = User.objects.create_user(username='player', password='x')
+        live = GameRound.objects.create(round_id='RLIVE1', status='COMPLETED')
+        archived = ArchivedRound.objects.create(round_id='RARCH1', start_time=timezone.now())
+        Bet.objects.create(user=player, round=live, number=1, chip_amount=Decimal('10.00'),
+                           payout_amount=Decimal('20.00'), is_winner=True)
+        Bet.objects.create(user=player, round=live, number=2, chip_amount=Decimal('5.00'))
+        ArchivedBet.objects.create(id=900, user=player, round=archived, number=3, chip_amount=Decimal('8.00'),
+                                   payout_amount=Decimal('16.00'), is_winner=True, created_at=timezone.now())
+        # Lifetime stats as bet placement and settlement keep them
+        apply_stats({player.id: (3, Decimal('23.00'), 2, Decimal('36.00'))})
+
+    def totals(self, **params):
+        context = self.client.get(reverse('all_bets'), params).context
+        return [context[key] for key in ('total_bets_count', 'total_bets_amount', 'total_payouts', 'total_winners')]
+
+    def test_filtered_totals_include_archived_bets_like_the_unfiltered_ones(self):
+        self.assertEqual(self.totals(), [3, Decimal('23.00'), Decimal('36.00'), 2])
+        self.assertEqual(self.totals(search='player'), [3, Decimal('23.00'), Decimal('36.00'), 2])
+        self.assertEqual(self.totals(status='winners'), [2, Decimal('18.00'), Decimal('36.00'), 2])
+        self.assertEqual(self.totals(status='losers'), [1, Decimal('5.00'), Decimal('0.00'), 0])
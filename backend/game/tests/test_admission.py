@@ -0,0 +1,60 @@
+import heapq
+import random
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from game import admission
+from game.admission import TokenBucket
+
+
+class TokenBucketTests(SimpleTestCase):
+    def setUp(self):
+        self.now = 0.0
+        patcher = mock.patch('game.admission.time.monotonic', lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_rejection_does_not_consume_tokens(self):
+        bucket = TokenBucket(rate=10, burst=1)
+        self.assertEqual(bucket.take(), 0)
+        for _ in range(50):
+            self.assertGreater(bucket.take(), 0)
+
+        self.now += 0.1
+        self.assertEqual(bucket.take(), 0)
+
+    def test_rejected_clients_get_spread_out_hints(self):
+        bucket = TokenBucket(rate=10, burst=1)
+        bucket.take()
+        hints = [bucket.take() for _ in range(20)]
+        self.assertEqual(hints, sorted(hints))
+        self.assertAlmostEqual(hints[-1], 2.0)
+
+    def test_hints_are_bounded_by_max_wait(self):
+        bucket = TokenBucket(rate=10, burst=1, max_wait=5)
+        bucket.take()
+        hints = [bucket.take() for _ in range(200)]
+        self.assertLessEqual(max(hints), 5)
+
+    def test_clients_retrying_on_the_hint_are_admitted_at_rate(self):
+        rate, clients = 25, 5000
+        bucket = TokenBucket(rate=rate, burst=50)
+        rng = random.Random(7)
+        attempts = [(rng.uniform(0, 2), client) for client in range(clients)]
+        heapq.heapify(attempts)
+        admitted = []
+        with mock.patch('game.admission.random', rng):
+            while attempts:
+                self.now, client = heapq.heappop(attempts)
+                wait = bucket.take()
+                if wait:
+                    heapq.heappush(attempts, (self.now + admission._jittered(wait), client))
+                else:
+                    admitted.append(self.now)
+
+        self.assertEqual(len(admitted), clients)
+        # Everyone is in within ~10% of clients / rate
+        self.assertLess(max(admitted), clients / rate * 1.1)
+        halfway = clients / rate / 2
+        self.assertAlmostEqual(sum(t <= halfway for t in admitted) / (halfway * rate), 1, delta=0.1)
@@ -0,0 +1,111 @@
+import time
+from decimal import Decimal
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from accounts.models import Transaction, Wallet
+from game import bet_intake
+from game.models import Bet, GameRound
+
+try:
+    import fakeredis
+except ImportError:  # optional: only these tests need it
+    fakeredis = None
+
+User = get_user_model()
+
+
+@skipUnless(fakeredis, 'fakeredis is not installed')
+class BetIntakeTests(TestCase):
+    def setUp(self):
+        self.redis = fakeredis.FakeRedis(decode_responses=True)
+        self.close_at_ms = int((time.time() + 3600) * 1000)
+        self.user = User.objects.create_user(username='player', password='pw')
+        Wallet.objects.update_or_create(user=self.user, defaults={'balance': Decimal('100.00')})
+        self.round_a = GameRound.objects.create(round_id='RINTAKE_A', status='BETTING')
+        self.round_b = GameRound.objects.create(round_id='RINTAKE_B', status='BETTING', table='vip')
+
+    def accept(self, round_obj, number, amount, balance=Decimal('100.00')):
+        return bet_intake.accept_bet(
+            self.redis, round_obj.round_id, self.user.id, number, amount, balance, self.close_at_ms
+        )
+
+    def flush(self, round_obj):
+        with self.captureOnCommitCallbacks(execute=True):
+            return bet_intake.flush_round_bets(round_obj, self.redis)
+
+    def test_reservation_is_shared_across_rounds_and_tables(self):
+        self.assertEqual(self.accept(self.round_a, 3, '70.00')[0], bet_intake.ACCEPTED)
+        result, reserved, _ = self.accept(self.round_b, 4, '40.00')
+
+        self.assertEqual(result, bet_intake.INSUFFICIENT_BALANCE)
+        self.assertEqual(reserved, Decimal('70.00'))
+        self.assertEqual(self.accept(self.round_b, 4, '30.00')[:2], (bet_intake.ACCEPTED, Decimal('100.00')))
+
+    def test_cancel_releases_the_reservation(self):
+        self.accept(self.round_a, 3, '70.00')
+        bet_intake.cancel_bet(self.redis, self.round_a.round_id, self.user.id, 3, self.close_at_ms)
+
+        self.assertEqual(bet_intake.pending_reserved(self.redis, self.user.id), Decimal('0'))
+
+    def test_flush_debits_and_releases_after_commit(self):
+        self.accept(self.round_a, 3, '70.00')
+        self.accept(self.round_b, 4, '30.00')
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.assertEqual(bet_intake.flush_round_bets(self.round_a, self.redis), 1)
+            # Nothing is cleared in Redis before the transaction commits
+            self.assertEqual(bet_intake.pending_reserved(self.redis, self.user.id), Decimal('100.00'))
+            self.assertTrue(self.redis.exists(f'bet_intake:{self.round_a.round_id}:bets'))
+        for callback in callbacks:
+            callback()
+
+        wallet = Wallet.objects.get(user=self.user)
+        self.assertEqual(wallet.balance, Decimal('30.00'))
+        self.assertEqual(bet_intake.pending_reserved(self.redis, self.user.id), Decimal('30.00'))
+        self.assertFalse(self.redis.exists(f'bet_intake:{self.round_a.round_id}:bets'))
+
+        self.assertEqual(self.flush(self.round_b), 1)
+        self.assertEqual(Wallet.objects.get(user=self.user).balance, Decimal('0.00'))
+        self.assertEqual(bet_intake.pending_reserved(self.redis, self.user.id), Decimal('0'))
+
+    def test_grouped_debit_sets_updated_at(self):
+        before = Wallet.objects.get(user=self.user).updated_at
+        self.accept(self.round_a, 3, '10.00')
+        self.flush(self.round_a)
+
+        self.assertGreater(Wallet.objects.get(user=self.user).updated_at, before)
+
+    def test_retry_after_lost_cleanup_does_not_debit_twice(self):
+        self.accept(self.round_a, 3, '10.00')
+        self.accept(self.round_a, 5, '15.00')
+        # The first flush commits but its Redis cleanup never runs
+        with self.captureOnCommitCallbacks(execute=False):
+            bet_intake.flush_round_bets(self.round_a, self.redis)
+
+        with self.assertLogs('game', 'WARNING') as logs:
+            self.assertEqual(self.flush(self.round_a), 0)
+
+        self.assertIn('already flushed', logs.output[0])
+        self.assertEqual(bet_intake.pending_reserved(self.redis, self.user.id), Decimal('0'))
+        self.assertFalse(self.redis.exists(f'bet_intake:{self.round_a.round_id}:bets'))
+
+        self.assertEqual(Wallet.objects.get(user=self.user).balance, Decimal('75.00'))
+        self.assertEqual(Bet.objects.filter(round=self.round_a).count(), 2)
+        self.assertEqual(Transaction.objects.filter(user=self.user, transaction_type='BET').count(), 2)
+        self.round_a.refresh_from_db()
+        self.assertEqual((self.round_a.total_bets, self.round_a.total_amount), (2, Decimal('25.00')))
+
+    def test_db_path_bet_in_the_round_does_not_drop_pending_bets(self):
+        Bet.objects.create(user=self.user, round=self.round_a, number=1, chip_amount=Decimal('5.00'))
+        self.accept(self.round_a, 3, '10.00')
+
+        self.assertEqual(self.flush(self.round_a), 1)
+
+        self.assertEqual(
+            sorted(Bet.objects.filter(round=self.round_a).values_list('number', 'chip_amount')),
+            [(1, Decimal('5.00')), (3, Decimal('10.00'))],
+        )
+        self.assertEqual(Wallet.objects.get(user=self.user).balance, Decimal('90.00'))
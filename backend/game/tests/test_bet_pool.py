@@ -0,0 +1,55 @@
+import time
+from decimal import Decimal
+from unittest import mock, skipUnless
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+
+from game import bet_intake
+from game.bet_pool import get_bet_pool, queue_new_pool, record_bet
+from game.models import Bet, GameRound
+
+try:
+    import fakeredis
+except ImportError:  # optional: only these tests need it
+    fakeredis = None
+
+User = get_user_model()
+
+
+def amounts(pool):
+    return {item['number']: (item['amount'], item['count']) for item in pool[0] if item['count']}
+
+
+@skipUnless(fakeredis, 'fakeredis is not installed')
+class BetPoolTests(TestCase):
+    def setUp(self):
+        self.redis = fakeredis.FakeRedis(decode_responses=True)
+        self.round = GameRound.objects.create(round_id='RPOOL1', status='BETTING')
+        self.users = [User.objects.create_user(username=f'p{i}', password='pw') for i in range(2)]
+
+    def test_bets_before_the_first_read_are_counted_once_the_round_starts_a_pool(self):
+        pipe = self.redis.pipeline()
+        queue_new_pool(pipe, self.round.round_id)
+        pipe.execute()
+
+        record_bet(self.redis, self.round.round_id, 3, Decimal('10.00'), new_bet=True)
+        record_bet(self.redis, self.round.round_id, 3, Decimal('5.00'), new_bet=False)
+
+        with mock.patch('game.bet_pool._db_pool', side_effect=AssertionError('pool should come from Redis')):
+            self.assertEqual(amounts(get_bet_pool(self.redis, self.round)), {3: (Decimal('15.00'), 1)})
+
+    @override_settings(BET_INTAKE_MODE='redis')
+    def test_missing_pool_is_seeded_with_pending_intake_bets(self):
+        close_at_ms = int((time.time() + 3600) * 1000)
+        Bet.objects.create(user=self.users[0], round=self.round, number=2, chip_amount=Decimal('4.00'))
+        for user in self.users:
+            bet_intake.accept_bet(self.redis, self.round.round_id, user.id, 5, '7.50', Decimal('100.00'), close_at_ms)
+
+        pool = get_bet_pool(self.redis, self.round)
+
+        self.assertEqual(amounts(pool), {2: (Decimal('4.00'), 1), 5: (Decimal('15.00'), 2)})
+        self.assertEqual((pool[1], pool[2]), (3, Decimal('19.00')))
+        # Later intake bets keep incrementing the seeded hash
+        record_bet(self.redis, self.round.round_id, 5, Decimal('1.00'), new_bet=False)
+        self.assertEqual(amounts(get_bet_pool(self.redis, self.round))[5], (Decimal('16.00'), 2))
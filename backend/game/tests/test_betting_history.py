@@ -0,0 +1,40 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from game.models import Bet, GameRound
+from game.views import betting_history
+
+User = get_user_model()
+
+
+class BettingHistoryLimitTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='player', password='pw')
+        round_obj = GameRound.objects.create(round_id='RHIST1', status='BETTING')
+        for number in (1, 2, 3):
+            Bet.objects.create(user=self.user, round=round_obj, number=number, chip_amount='10.00')
+
+    def get(self, **params):
+        request = APIRequestFactory().get('/api/game/betting-history/', params)
+        force_authenticate(request, user=self.user)
+        return betting_history(request)
+
+    def test_limit_is_clamped_to_at_least_one(self):
+        for limit in ('0', '-5'):
+            response = self.get(limit=limit)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.data), 1)
+            self.assertIn('X-Next-Cursor', response)
+
+    def test_non_numeric_limit_is_rejected(self):
+        response = self.get(limit='ten')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, {'error': 'Invalid limit'})
+
+    def test_pages_follow_the_cursor(self):
+        first = self.get(limit=2)
+        self.assertEqual([bet['number'] for bet in first.data], [3, 2])
+        second = self.get(limit=2, cursor=first['X-Next-Cursor'])
+        self.assertEqual([bet['number'] for bet in second.data], [1])
+        self.assertNotIn('X-Next-Cursor', second)
@@ -0,0 +1,51 @@
+import csv
+import io
+from decimal import Decimal
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from accounts.models import Transaction
+from game import csv_export
+from game.csv_export import escape_cell, stream_csv
+
+User = get_user_model()
+
+
+class StreamCsvTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='=HYPERLINK("x")', password='pw')
+        for i in range(5):
+            Transaction.objects.create(
+                user=self.user, transaction_type='DEPOSIT', amount=Decimal('10.00'),
+                balance_before=Decimal('0.00'), balance_after=Decimal('10.00'), description=f'-{i}',
+            )
+
+    def export(self):
+        return stream_csv(
+            'transactions', ['User', 'Amount', 'Description'],
+            Transaction.objects.order_by('id'), ['user__username', 'amount', 'description'],
+        )
+
+    @mock.patch.object(csv_export, 'ROWS_PER_BLOCK', 2)
+    async def test_streams_blocks_asynchronously(self):
+        response = await sync_to_async(self.export)()
+        self.assertTrue(response.is_async)
+
+        blocks = [block async for block in response]
+
+        # Header, then blocks of two rows
+        self.assertEqual(len(blocks), 4)
+        rows = list(csv.reader(io.StringIO(b''.join(blocks).decode())))
+        self.assertEqual(rows[0], ['User', 'Amount', 'Description'])
+        self.assertEqual(rows[1], ['\'=HYPERLINK("x")', '10.00', "'-0"])
+        self.assertEqual(len(rows), 6)
+
+    def test_escape_cell(self):
+        for value in ('=1+1', '+1', '-1', '@SUM(A1)', '\tx'):
+            self.assertEqual(escape_cell(value), "'" + value)
+        self.assertEqual(escape_cell('player'), 'player')
+        self.assertEqual(escape_cell(Decimal('-5.00')), Decimal('-5.00'))
+        self.assertIsNone(escape_cell(None))
@@ -0,0 +1,49 @@
+from unittest import mock
+
+from django.test import TestCase
+
+from game.models import GameRound
+from game.utils import resolve_round_dice
+
+STORED = [3, 3, 1, 2, 5, 6]
+
+
+def dice_of(round_obj):
+    return [getattr(round_obj, f'dice_{i}') for i in range(1, 7)]
+
+
+class ResolveRoundDiceTests(TestCase):
+    def setUp(self):
+        self.round = GameRound.objects.create(round_id='RROLL1', status='CLOSED')
+
+    @mock.patch('game.utils.generate_random_dice_values', return_value=([4, 4, 1, 2, 3, 6], '4'))
+    def test_rolls_when_no_dice_are_stored(self, _generate):
+        dice_values, result, rolled = resolve_round_dice(self.round)
+
+        self.assertTrue(rolled)
+        self.assertEqual((dice_values, result), ([4, 4, 1, 2, 3, 6], '4'))
+        self.round.refresh_from_db()
+        self.assertEqual((dice_of(self.round), self.round.dice_result), ([4, 4, 1, 2, 3, 6], '4'))
+
+    def test_keeps_stored_dice_without_a_winner(self):
+        GameRound.objects.filter(pk=self.round.pk).update(**dict(zip([f'dice_{i}' for i in range(1, 7)], [1, 2, 3, 4, 5, 6])))
+        self.round.refresh_from_db()
+
+        dice_values, result, rolled = resolve_round_dice(self.round)
+
+        self.assertFalse(rolled)
+        self.assertEqual((dice_values, result), ([1, 2, 3, 4, 5, 6], None))
+
+    @mock.patch('game.utils.generate_random_dice_values', return_value=([4, 4, 1, 2, 3, 6], '4'))
+    def test_new_leader_with_stale_round_uses_the_stored_result(self, _generate):
+        # The previous leader stored (and settled) a result after this copy was loaded
+        GameRound.objects.filter(pk=self.round.pk).update(
+            dice_result='3', **dict(zip([f'dice_{i}' for i in range(1, 7)], STORED))
+        )
+
+        dice_values, result, rolled = resolve_round_dice(self.round)
+
+        self.assertFalse(rolled)
+        self.assertEqual((dice_values, result), (STORED, '3'))
+        self.round.refresh_from_db()
+        self.assertEqual((dice_of(self.round), self.round.dice_result), (STORED, '3'))
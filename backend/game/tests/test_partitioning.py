@@ -0,0 +1,95 @@
+from datetime import date, datetime
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from game import partitioning
+from game.partitioning import convert_sql, lock_bet
+
+
+class FakeCursor:
+    """Answers convert_sql's catalog queries for a game_bet with a unique (user, round, number) index."""
+    def __init__(self):
+        self.queries = []
+        self.result = None
+
+    def execute(self, sql, params=None):
+        self.queries.append((sql, params))
+        if 'MIN(created_at)' in sql:
+            self.result = [(datetime(2026, 8, 14, 12, 0),)]
+        elif 'pg_indexes' in sql:
+            self.index_query = sql
+            self.result = [('CREATE INDEX game_bet_user_id_idx ON public.game_bet USING btree (user_id)',)]
+        elif "contype = 'f'" in sql and 'confrelid' not in sql:
+            self.result = [('game_bet_user_id_fk', 'FOREIGN KEY (user_id) REFERENCES accounts_user(id)')]
+        elif 'attidentity' in sql:
+            self.result = [('d',)]
+        elif 'pg_get_serial_sequence' in sql:
+            self.result = [('public.game_bet_id_seq',)]
+        elif "contype = 'p'" in sql:
+            self.result = [('game_bet_pkey',)]
+        elif 'confrelid' in sql:
+            self.result = [('accounts_pendingpayment', 'pendingpayment_bet_id_fk')]
+        else:
+            raise AssertionError(f"Unexpected query: {sql}")
+
+    def fetchone(self):
+        return self.result[0] if self.result else None
+
+    def fetchall(self):
+        return self.result
+
+
+class ConvertSqlTests(SimpleTestCase):
+    def setUp(self):
+        self.cursor = FakeCursor()
+        self.statements = convert_sql(self.cursor, 'game_bet', date(2026, 10, 17), months_ahead=2)
+
+    def test_unique_indexes_are_not_recreated(self):
+        self.assertIn("NOT LIKE 'CREATE UNIQUE%%'", self.cursor.index_query)
+        indexes = [s for s in self.statements if s.startswith('CREATE INDEX') or s.startswith('CREATE UNIQUE')]
+        self.assertEqual(indexes, ['CREATE INDEX ON "game_bet" USING btree (user_id)'])
+
+    def test_statement_order(self):
+        self.assertEqual(self.statements[:6], [
+            'LOCK TABLE "game_bet" IN ACCESS EXCLUSIVE MODE',
+            'ALTER TABLE accounts_pendingpayment DROP CONSTRAINT "pendingpayment_bet_id_fk"',
+            'ALTER TABLE "game_bet" RENAME TO "game_bet_legacy"',
+            'ALTER TABLE "game_bet_legacy" RENAME CONSTRAINT "game_bet_pkey" TO "game_bet_legacy_pkey"',
+            'CREATE TABLE "game_bet" (LIKE "game_bet_legacy" INCLUDING DEFAULTS INCLUDING IDENTITY) '
+            'PARTITION BY RANGE (created_at)',
+            'ALTER TABLE "game_bet" ADD PRIMARY KEY (id, created_at)',
+        ])
+        self.assertIn(
+            'ALTER TABLE "game_bet" ADD CONSTRAINT "game_bet_user_id_fk_p" '
+            'FOREIGN KEY (user_id) REFERENCES accounts_user(id)',
+            self.statements,
+        )
+        self.assertTrue(self.statements[-1].startswith("SELECT setval(pg_get_serial_sequence('game_bet', 'id')"))
+
+    def test_partitions_cover_existing_data_and_coming_months(self):
+        partitions = [s for s in self.statements if 'PARTITION OF' in s]
+        self.assertEqual([s.split()[5] for s in partitions[:-1]], [
+            '"game_bet_p2026_08"', '"game_bet_p2026_09"', '"game_bet_p2026_10"',
+            '"game_bet_p2026_11"', '"game_bet_p2026_12"',
+        ])
+        self.assertIn("FOR VALUES FROM ('2026-12-01') TO ('2027-01-01')", partitions[-2])
+        self.assertEqual(partitions[-1], 'CREATE TABLE "game_bet_default" PARTITION OF "game_bet" DEFAULT')
+
+
+class LockBetTests(SimpleTestCase):
+    def test_takes_a_transaction_advisory_lock_on_postgres(self):
+        with mock.patch.object(partitioning, 'is_postgres', return_value=True), \
+                mock.patch.object(partitioning, 'connection') as connection:
+            lock_bet(7, 42, 3)
+
+        cursor = connection.cursor.return_value.__enter__.return_value
+        cursor.execute.assert_called_once_with(
+            "SELECT pg_advisory_xact_lock(hashtext(%s))", ['game_bet:7:42:3']
+        )
+
+    def test_noop_elsewhere(self):
+        with mock.patch.object(partitioning, 'connection') as connection:
+            connection.vendor = 'sqlite'
+            lock_bet(7, 42, 3)
+        connection.cursor.assert_not_called()
@@ -0,0 +1,94 @@
+import asyncio
+from io import StringIO
+from unittest import mock
+
+from django.core.management.base import OutputWrapper
+from django.core.management.color import no_style
+from django.db import DatabaseError
+from django.test import SimpleTestCase
+
+from game.async_engine import AsyncRoundEngine
+from game.round_scheduler import DeadlineRoundRunner, retry_delay
+from game.timer_lease import LeaseLost
+
+
+class Stop(BaseException):
+    """Ends a runner loop from inside a test."""
+
+
+def make_command():
+    return mock.Mock(stdout=OutputWrapper(StringIO()), style=no_style())
+
+
+def make_runner(cls=DeadlineRoundRunner, lease=None):
+    return cls(make_command(), None, None, get_redis=lambda: None, get_channel_layer=lambda: None, lease=lease)
+
+
+class RetryDelayTests(SimpleTestCase):
+    def test_backs_off_exponentially_up_to_the_cap(self):
+        self.assertEqual([retry_delay(n) for n in (1, 2, 3, 4)], [1, 2, 4, 8])
+        self.assertEqual(retry_delay(20), 30)
+
+
+class DeadlineRunnerRecoveryTests(SimpleTestCase):
+    @mock.patch('game.round_scheduler.time.sleep')
+    @mock.patch('game.round_scheduler.close_old_connections')
+    def test_failed_recovery_is_retried_with_backoff(self, _close, sleep):
+        runner = make_runner()
+        round_obj = mock.Mock()
+        runner._resume_or_create_round = mock.Mock(side_effect=[DatabaseError('down'), DatabaseError('down'), (round_obj, True)])
+        runner._run_round = mock.Mock(side_effect=Stop)
+
+        with self.assertLogs('game.timer', 'ERROR'), self.assertRaises(Stop):
+            runner.run()
+
+        self.assertEqual(runner._resume_or_create_round.call_count, 3)
+        self.assertEqual([call.args[0] for call in sleep.call_args_list], [1, 2])
+        runner._run_round.assert_called_once_with(round_obj, True)
+
+    @mock.patch('game.round_scheduler.close_old_connections')
+    def test_standby_runner_does_not_recover_rounds(self, _close):
+        lease = mock.Mock(is_leader=False, epoch=1)
+        lease.wait_for_leadership.side_effect = Stop
+        runner = make_runner(lease=lease)
+        runner._resume_or_create_round = mock.Mock()
+
+        with self.assertRaises(Stop):
+            runner.run()
+
+        runner._resume_or_create_round.assert_not_called()
+
+    @mock.patch('game.views.calculate_payouts')
+    def test_settle_checks_the_lease(self, calculate_payouts):
+        runner = make_runner(lease=mock.Mock(is_leader=False))
+
+        with self.assertRaises(LeaseLost):
+            runner._settle(mock.Mock(), [1, 1, 2, 3, 4, 5])
+
+        calculate_payouts.assert_not_called()
+
+
+class AsyncEngineSupervisionTests(SimpleTestCase):
+    def test_engine_is_restarted_after_an_escaped_error(self):
+        engine = make_runner(AsyncRoundEngine)
+        engine._main = mock.AsyncMock(side_effect=[RuntimeError('boom'), Stop])
+
+        with mock.patch('game.async_engine.asyncio.sleep', mock.AsyncMock()), \
+                self.assertLogs('game.timer', 'ERROR'), self.assertRaises(Stop):
+            asyncio.run(engine._supervised())
+
+        self.assertEqual(engine._main.call_count, 2)
+
+    @mock.patch('game.async_engine.close_old_connections')
+    def test_failed_recovery_is_retried_inside_the_loop(self, _close):
+        engine = make_runner(AsyncRoundEngine)
+        round_obj = mock.Mock()
+        engine._resume_or_create_round = mock.AsyncMock(side_effect=[DatabaseError('down'), (round_obj, False)])
+        engine._run_round = mock.AsyncMock(side_effect=Stop)
+
+        with mock.patch('game.async_engine.asyncio.sleep', mock.AsyncMock()), \
+                self.assertLogs('game.timer', 'ERROR'), self.assertRaises(Stop):
+            asyncio.run(engine._main())
+
+        self.assertEqual(engine._resume_or_create_round.call_count, 2)
+        engine._run_round.assert_awaited_once_with(round_obj, False)
@@ -0,0 +1,60 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import SimpleTestCase
+from django.utils import timezone
+
+from game import round_state
+from game.broadcast import with_frame
+
+TABLE = 'test-table'
+
+
+class RoundStateTests(SimpleTestCase):
+    def setUp(self):
+        self.now = 1000.0
+        patcher = mock.patch('game.round_state.time.monotonic', lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(round_state._states.pop, TABLE, None)
+
+    def schedule(self, start_time, status='BETTING'):
+        round_state.observe(TABLE, {
+            'type': 'round_schedule', 'round_id': 'R1', 'status': status,
+            'start_time': start_time.isoformat(), 'betting_close_time': 30,
+            'dice_roll_time': 51, 'dice_result_time': 55, 'round_end_time': 60,
+        })
+
+    def status(self):
+        return round_state.current_messages(TABLE)[0]['status']
+
+    def test_dice_events_get_their_status_from_the_sender(self):
+        self.schedule(timezone.now() - timedelta(seconds=52))
+        round_state.observe(TABLE, {'type': 'round_update', 'round_id': 'R1', 'status': 'CLOSED'})
+
+        round_state.observe(TABLE, with_frame({'type': 'dice_roll', 'round_id': 'R1', 'timer': 51, 'dice_roll_time': 51}))
+        self.assertEqual(self.status(), 'CLOSED')
+
+        round_state.observe(TABLE, with_frame({'type': 'dice_result', 'round_id': 'R1', 'timer': 55, 'result': '4'}))
+        self.assertEqual(self.status(), 'RESULT')
+
+    def test_schedule_timer_stops_at_round_end(self):
+        self.schedule(timezone.now() - timedelta(seconds=59.5))
+        self.assertEqual(round_state.current_messages(TABLE)[0]['timer'], 60)
+
+        self.schedule(timezone.now() - timedelta(seconds=61))
+        self.assertIsNone(round_state.current_messages(TABLE))
+
+    def test_tick_timer_is_not_extrapolated_after_game_end(self):
+        round_state.observe(TABLE, {'type': 'timer', 'round_id': 'R1', 'status': 'RESULT', 'timer': 58})
+        self.now += 2
+        self.assertEqual(round_state.current_messages(TABLE)[0]['timer'], 60)
+
+        round_state.observe(TABLE, {'type': 'game_end', 'round_id': 'R1', 'status': 'COMPLETED', 'timer': 60})
+        self.now += 2
+        self.assertEqual(round_state.current_messages(TABLE)[0]['timer'], 60)
+
+    def test_timerless_dice_result_still_gets_a_status(self):
+        event = with_frame({'type': 'dice_result', 'round_id': 'R1', 'result': '4'})
+        self.assertEqual(event['status'], 'RESULT')
+        self.assertNotIn('frame', event)
@@ -0,0 +1,124 @@
+"""
+Redis lease used to elect a single leader among redundant game timer processes.
+
+Every ``start_game_timer --leader-election`` instance runs a TimerLease. A
+background thread keeps trying to take the lease (``SET key owner NX PX ttl``)
+and, once held, renews it every ttl/4 with a compare-and-set script so an
+instance can only extend or release its own lease. Only the holder runs rounds
+and broadcasts; the others stand by. If the leader dies its lease expires after
+GAME_TIMER_LEASE_TTL_MS (under one second by default) and a standby takes over,
+resuming the live round from the database. A clean shutdown releases the lease
+immediately.
+
+Each acquisition increments a fencing counter, logged with the leadership
+change so overlapping leaders (e.g. after a long GC pause) can be told apart.
+"""
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+
+from django.conf import settings
+
+logger = logging.getLogger('game.timer')
+
+LEASE_KEY = 'game_timer:leader'
+FENCING_KEY = 'game_timer:leader_epoch'
+
+# Extend the lease only if we still own it
+RENEW_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('pexpire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+# Delete the lease only if we still own it
+RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+class LeaseLost(Exception):
+    """Raised inside the timer loop when this instance is no longer the leader."""
+
+
+class TimerLease:
+    def __init__(self, get_redis, ttl_ms=None, key=LEASE_KEY):
+        self.get_redis = get_redis
+        self.key = key
+        self.ttl_ms = ttl_ms or getattr(settings, 'GAME_TIMER_LEASE_TTL_MS', 800)
+        self.interval = self.ttl_ms / 4000.0
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.epoch = None
+        self._leader = False
+        self._valid_until = 0.0
+        self._stopped = threading.Event()
+        self._changed = threading.Condition()
+        self._thread = None
+
+    @property
+    def is_leader(self):
+        # Trust our own clock as well as the last renewal: if the renew thread
+        # stalls, we stop acting as leader before Redis expires the key.
+        return self._leader and time.monotonic() < self._valid_until
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='game-timer-lease', daemon=True)
+        self._thread.start()
+
+    def wait_for_leadership(self):
+        """Block until this instance holds the lease."""
+        with self._changed:
+            while not self.is_leader:
+                self._changed.wait(timeout=self.interval)
+
+    def release(self):
+        self._stopped.set()
+        if not self._leader:
+            return
+        self._leader = False
+        redis_client = self.get_redis()
+        if redis_client:
+            try:
+                redis_client.eval(RELEASE_SCRIPT, 1, self.key, self.owner)
+                logger.info(f"Released game timer lease ({self.owner})")
+            except Exception as e:
+                logger.warning(f"Failed to release game timer lease: {e}")
+
+    def _run(self):
+        redis_client = None
+        while not self._stopped.is_set():
+            started = time.monotonic()
+            try:
+                if redis_client is None:
+                    redis_client = self.get_redis()
+                if redis_client is not None:
+                    if self._leader:
+                        held = bool(redis_client.eval(RENEW_SCRIPT, 1, self.key, self.owner, self.ttl_ms))
+                    else:
+                        held = bool(redis_client.set(self.key, self.owner, nx=True, px=self.ttl_ms))
+                        if held:
+                            self.epoch = redis_client.incr(FENCING_KEY)
+                    self._update(held, started)
+            except Exception as e:
+                logger.warning(f"Game timer lease check failed: {e}")
+                redis_client = None
+                self._update(False, started)
+            self._stopped.wait(self.interval)
+
+    def _update(self, held, started):
+        with self._changed:
+            if held:
+                self._valid_until = started + self.ttl_ms / 1000.0
+            if held and not self._leader:
+                logger.info(f"Acquired game timer lease ({self.owner}, epoch {self.epoch})")
+            elif self._leader and not held:
+                logger.warning(f"Lost game timer lease ({self.owner}, epoch {self.epoch})")
+            self._leader = held
+            self._changed.notify_all()
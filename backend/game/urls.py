@@ -7,6 +7,8 @@ urlpatterns = [
     path('bet/<int:number>/', views.remove_bet, name='remove_bet'),
     path('bets/', views.my_bets, name='my_bets'),
     path('betting-history/', views.betting_history, name='betting_history'),
+    path('my-stats/', views.my_stats, name='my_stats'),
+    path('leaderboard/', views.leaderboard, name='leaderboard'),
     path('set-dice/', views.set_dice_result, name='set_dice_result'),
     path('dice-mode/', views.dice_mode, name='dice_mode'),
     path('stats/', views.game_stats, name='game_stats'),
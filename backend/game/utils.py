@@ -3,12 +3,14 @@ import json
 from collections import Counter
 from django.utils import timezone
 from django.conf import settings
-from .models import GameRound, GameSettings
+from .models import GameRound
+from .settings_cache import NUMERIC_KEYS, get_settings_snapshot
+from .tables import DEFAULT_TABLE, round_key, timer_key, make_round_id
 
 
-def get_current_round_state(redis_client):
+def get_current_round_state(redis_client, table=DEFAULT_TABLE):
     """
-    Get the current round state from Redis or Database.
+    Get the current round state of a table from Redis or Database.
     Handles staleness checks and provides a consistent interface.
     Returns: (round_obj, timer, status, round_data_dict)
     """
@@ -19,7 +21,7 @@ def get_current_round_state(redis_client):
 
     if redis_client:
         try:
-            round_data_raw = redis_client.get('current_round')
+            round_data_raw = redis_client.get(round_key(table))
             if round_data_raw:
                 round_data = json.loads(round_data_raw)
                 
@@ -40,7 +42,7 @@ def get_current_round_state(redis_client):
                         pass
                 
                 if not is_stale:
-                    timer = int(redis_client.get('round_timer') or '0')
+                    timer = int(redis_client.get(timer_key(table)) or '0')
                     status = round_data.get('status', 'WAITING')
                     try:
                         round_obj = GameRound.objects.get(round_id=round_data['round_id'])
@@ -48,15 +50,15 @@ def get_current_round_state(redis_client):
                         pass
                 else:
                     # Clear stale Redis data
-                    redis_client.delete('current_round')
-                    redis_client.delete('round_timer')
+                    redis_client.delete(round_key(table))
+                    redis_client.delete(timer_key(table))
                     round_data = None
         except Exception:
             pass
 
     # Fallback to database
     if not round_obj:
-        round_obj = GameRound.objects.order_by('-start_time').first()
+        round_obj = GameRound.objects.filter(table=table).order_by('-start_time').first()
         if round_obj:
             status = round_obj.status
             if round_obj.start_time:
@@ -112,6 +114,37 @@ def determine_winning_number(dice_values):
     return ", ".join(map(str, winners))
 
 
+DICE_FIELDS = [f'dice_{i}' for i in range(1, 7)]
+
+
+def resolve_round_dice(round_obj):
+    """
+    Return ``(dice_values, result, rolled)`` for a round that has reached its
+    result time, rolling the dice only if none are stored yet.
+
+    A round's result exists once all six dice are stored (dice_result alone can
+    legitimately be None: no number appeared twice). The roll is written with a
+    conditional UPDATE on the dice state read from the row, so when two timers
+    overlap during a handover, or an admin presets the dice at the same moment,
+    only one write wins; the others reload and use the stored dice.
+    """
+    for _ in range(3):
+        dice_values = [getattr(round_obj, field) for field in DICE_FIELDS]
+        if all(value is not None for value in dice_values):
+            return dice_values, round_obj.dice_result, False
+
+        new_values, result = generate_random_dice_values()
+        observed = {field: getattr(round_obj, field) for field in DICE_FIELDS + ['dice_result']}
+        updated = GameRound.objects.filter(pk=round_obj.pk, **observed).update(
+            dice_result=result, **dict(zip(DICE_FIELDS, new_values))
+        )
+        if updated:
+            apply_dice_values_to_round(round_obj, new_values)
+            return new_values, result, True
+        round_obj.refresh_from_db(fields=DICE_FIELDS + ['dice_result'])
+    raise RuntimeError(f"Could not store dice for round {round_obj.round_id}: the row kept changing")
+
+
 def apply_dice_values_to_round(round_obj, dice_values):
     """Persist six dice values onto the GameRound instance and recalculate dice_result."""
     if len(dice_values) != 6:
@@ -175,9 +208,14 @@ def sync_round_to_redis(round_obj, redis_client):
         # Build round data dict
         round_data = {
             'round_id': round_obj.round_id,
+            'table': round_obj.table,
             'status': round_obj.status,
             'start_time': round_obj.start_time.isoformat(),
             'timer': timer,
+            'betting_close_seconds': round_obj.betting_close_seconds,
+            'dice_roll_seconds': round_obj.dice_roll_seconds,
+            'dice_result_seconds': round_obj.dice_result_seconds,
+            'round_end_seconds': round_obj.round_end_seconds,
         }
         
         # Add dice result if available
@@ -193,8 +231,8 @@ def sync_round_to_redis(round_obj, redis_client):
         # Update Redis using pipeline for efficient batch writes
         import json
         pipe = redis_client.pipeline()
-        pipe.set('current_round', json.dumps(round_data))
-        pipe.set('round_timer', str(timer))
+        pipe.set(round_key(round_obj.table), json.dumps(round_data))
+        pipe.set(timer_key(round_obj.table), str(timer))
         pipe.execute()  # Execute both writes in one round trip
         
         return True
@@ -205,9 +243,9 @@ def sync_round_to_redis(round_obj, redis_client):
         return False
 
 
-def sync_database_to_redis(redis_client):
+def sync_database_to_redis(redis_client, table=DEFAULT_TABLE):
     """
-    Sync the current active round from database to Redis.
+    Sync the current active round of a table from database to Redis.
     Returns True if successful, False otherwise.
     """
     if not redis_client:
@@ -216,16 +254,18 @@ def sync_database_to_redis(redis_client):
     try:
         # Get current active round from database
         round_obj = GameRound.objects.filter(
+            table=table,
             status__in=['BETTING', 'CLOSED', 'RESULT']
         ).order_by('-start_time').first()
         
         if not round_obj:
             # No active round - check if we should create one
-            latest_round = GameRound.objects.order_by('-start_time').first()
+            latest_round = GameRound.objects.filter(table=table).order_by('-start_time').first()
             if latest_round and latest_round.status == 'COMPLETED':
                 # All rounds completed, create new one
                 round_obj = GameRound.objects.create(
-                    round_id=f"R{int(timezone.now().timestamp())}",
+                    round_id=make_round_id(table, timezone.now()),
+                    table=table,
                     status='BETTING',
                     betting_close_seconds=get_game_setting('BETTING_CLOSE_TIME', 30),
                     dice_roll_seconds=get_game_setting('DICE_ROLL_TIME', 7),
@@ -245,8 +285,9 @@ def sync_database_to_redis(redis_client):
 
 def get_game_setting(key, default=None):
     """
-    Get a game setting from the database, with fallback to settings.py defaults.
-    Always reads fresh from database (no caching).
+    Get a game setting, with fallback to settings.py defaults.
+    Reads from the process-local settings snapshot (see game/settings_cache.py),
+    which is reloaded whenever a setting is changed anywhere.
     
     Args:
         key: The setting key (e.g., 'BETTING_CLOSE_TIME')
@@ -256,75 +297,38 @@ def get_game_setting(key, default=None):
         The setting value (converted to int if it's a numeric setting)
     """
     try:
-        # Query directly using values_list to bypass any ORM instance caching
-        # This ensures we always get the latest value from the database
-        # Using values_list avoids creating model instances, which can be cached
-        result = GameSettings.objects.filter(key=key).values_list('value', flat=True).first()
-        if result is None:
-            raise GameSettings.DoesNotExist(f"GameSettings matching query does not exist.")
-        value = result
-        
-        # Convert to int for numeric settings
-        numeric_keys = [
-            'BETTING_CLOSE_TIME', 'DICE_ROLL_TIME', 'DICE_RESULT_TIME', 'ROUND_END_TIME',
-            'BETTING_DURATION', 'RESULT_SELECTION_DURATION', 
-            'RESULT_DISPLAY_DURATION', 'TOTAL_ROUND_DURATION',
-            'RESULT_ANNOUNCE_TIME'
-        ]
-        if key in numeric_keys:
-            try:
-                return int(value)
-            except (ValueError, TypeError):
-                pass
-        
-        return value
-    except GameSettings.DoesNotExist:
-        # Fallback to settings.py defaults
-        game_settings = getattr(settings, 'GAME_SETTINGS', {})
-        return game_settings.get(key, default)
+        values = get_settings_snapshot()['values']
+        if key in values:
+            return values[key]
     except Exception as e:
         import logging
         logger = logging.getLogger(__name__)
         logger.error(f"Error getting game setting {key}: {e}")
-        # Fallback to settings.py defaults
-        game_settings = getattr(settings, 'GAME_SETTINGS', {})
-        return game_settings.get(key, default)
+
+    # Fallback to settings.py defaults
+    game_settings = getattr(settings, 'GAME_SETTINGS', {})
+    return game_settings.get(key, default)
 
 
 def get_all_game_settings():
     """
     Get all game settings as a dictionary, with fallback to settings.py defaults.
-    This is cached for performance - settings don't change frequently.
+    Served from the process-local settings snapshot.
     """
-    result = {}
     defaults = getattr(settings, 'GAME_SETTINGS', {})
-    
-    # Get all settings from database
-    db_settings = GameSettings.objects.all()
-    for setting in db_settings:
-        result[setting.key] = setting.value
+    result = dict(get_settings_snapshot()['values'])
     
     # Fill in any missing settings from defaults
     for key, value in defaults.items():
         if key not in result:
             result[key] = value
     
-    # Convert numeric settings to int
-    numeric_keys = [
-        'BETTING_CLOSE_TIME', 'DICE_ROLL_TIME', 'DICE_RESULT_TIME', 'ROUND_END_TIME',
-        'BETTING_DURATION', 'RESULT_SELECTION_DURATION', 
-        'RESULT_DISPLAY_DURATION', 'TOTAL_ROUND_DURATION',
-        'RESULT_ANNOUNCE_TIME'
-    ]
-    for key in numeric_keys:
+    # Convert numeric settings to int (defaults may be strings)
+    for key in NUMERIC_KEYS:
         if key in result:
             try:
                 result[key] = int(result[key])
             except (ValueError, TypeError):
                 pass
     
-    # Handle PAYOUT_RATIOS - keep as dict from defaults (not stored in DB as JSON)
-    if 'PAYOUT_RATIOS' not in result and 'PAYOUT_RATIOS' in defaults:
-        result['PAYOUT_RATIOS'] = defaults['PAYOUT_RATIOS']
-    
     return result
@@ -5,9 +5,11 @@ from rest_framework.response import Response
 from django.utils import timezone
 from django.conf import settings
 from django.db import models, transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
 from django.shortcuts import render
 from django.views.decorators.csrf import csrf_exempt
-from datetime import timedelta
+from datetime import date, timedelta
 from decimal import Decimal
 import redis
 import json
@@ -18,7 +20,20 @@ logger = logging.getLogger('game')
 from .models import GameRound, Bet, DiceResult, GameSettings
 from .serializers import GameRoundSerializer, BetSerializer, CreateBetSerializer, DiceResultSerializer
 from .utils import get_game_setting, get_all_game_settings, calculate_current_timer
+from .settings_cache import get_settings_snapshot
+from .settlement import settle_round
+from .tables import DEFAULT_TABLE, request_table, round_key, timer_key, make_round_id, bet_limits
+from . import bet_intake
+from .bet_pool import record_bet, record_removal
+from .betting_stats import record_placed, record_removed, get_betting_stats
+from .idempotency import idempotent
+from .partitioning import lock_bet
+from .leaderboard import (
+    PERIODS as LEADERBOARD_PERIODS, period_key as leaderboard_period_key, get_leaderboard, publish_round_leaderboards,
+)
 from accounts.models import Wallet, Transaction
+from accounts.pagination import keyset_page, MAX_PAGE_SIZE
+from accounts.notifications import push_to_user
 
 # Redis connection using connection pool (optimized for scalability)
 try:
@@ -43,13 +58,15 @@ except (redis.ConnectionError, redis.TimeoutError, AttributeError):
 
 def get_dice_mode():
     """Get dice result mode: 'manual' or 'random'"""
-    try:
-        setting = GameSettings.objects.get(key='dice_mode')
-        return setting.value
-    except GameSettings.DoesNotExist:
-        # Default to 'random' if not set
-        GameSettings.objects.create(key='dice_mode', value='random', description='Dice result mode: manual or random')
-        return 'random'
+    mode = get_settings_snapshot()['values'].get('dice_mode')
+    if mode is not None:
+        return mode
+    # Default to 'random' if not set
+    GameSettings.objects.get_or_create(
+        key='dice_mode',
+        defaults={'value': 'random', 'description': 'Dice result mode: manual or random'}
+    )
+    return 'random'
 
 
 def set_dice_mode(mode):
@@ -68,13 +85,16 @@ def set_dice_mode(mode):
 @permission_classes([IsAuthenticated])
 def current_round(request):
     """Get current game round status"""
+    table = request_table(request)
+    if table is None:
+        return Response({'error': 'Unknown table'}, status=status.HTTP_400_BAD_REQUEST)
     logger.info(f"User {request.user.username} (ID: {request.user.id}) fetching current round")
     # Get current round from Redis or database
     round_obj = None
     
     if redis_client:
         try:
-            round_data = redis_client.get('current_round')
+            round_data = redis_client.get(round_key(table))
             if round_data:
                 round_data = json.loads(round_data)
                 
@@ -103,14 +123,14 @@ def current_round(request):
                         pass
                 else:
                     # Clear stale Redis data
-                    redis_client.delete('current_round')
-                    redis_client.delete('round_timer')
+                    redis_client.delete(round_key(table))
+                    redis_client.delete(timer_key(table))
         except Exception:
             pass
     
     # Fallback to latest round or create new one
     if not round_obj:
-        round_obj = GameRound.objects.order_by('-start_time').first()
+        round_obj = GameRound.objects.filter(table=table).order_by('-start_time').first()
         
         round_end_time = get_game_setting('ROUND_END_TIME', 80)
         # Check if we need to create a new round
@@ -143,7 +163,8 @@ def current_round(request):
             
             # Create new round
             round_obj = GameRound.objects.create(
-                round_id=f"R{int(timezone.now().timestamp())}",
+                round_id=make_round_id(table, timezone.now()),
+                table=table,
                 status='BETTING',
                 betting_close_seconds=get_game_setting('BETTING_CLOSE_TIME', 30),
                 dice_roll_seconds=get_game_setting('DICE_ROLL_TIME', 7),
@@ -165,8 +186,8 @@ def current_round(request):
                     'timer': timer,
                 }
                 pipe = redis_client.pipeline()
-                pipe.set('current_round', json.dumps(round_data))
-                pipe.set('round_timer', str(timer))
+                pipe.set(round_key(table), json.dumps(round_data))
+                pipe.set(timer_key(table), str(timer))
                 pipe.execute()
                 logger.info(f"Synced round {round_obj.round_id} to Redis")
             except Exception as e:
@@ -179,7 +200,7 @@ def current_round(request):
     timer = 0
     if redis_client:
         try:
-            redis_timer = redis_client.get('round_timer')
+            redis_timer = redis_client.get(timer_key(table))
             if redis_timer:
                 timer = int(redis_timer)
         except Exception:
@@ -192,11 +213,116 @@ def current_round(request):
     return Response(data)
 
 
+def push_bet_update(user_id, action, round_id, number, chip_amount, wallet_balance, pending=False):
+    """Push the new bet slip entry and balance to the user's other sockets (tabs, devices)."""
+    push_to_user(user_id, {
+        'type': 'bet_update',
+        'action': action,
+        'round_id': round_id,
+        'number': number,
+        'chip_amount': str(chip_amount),
+        'wallet_balance': str(wallet_balance),
+        'pending': pending,
+    })
+
+
+def _intake_round_data(table):
+    """Current round from Redis for the Redis bet intake path, or None to use the DB path."""
+    if not (bet_intake.intake_enabled() and redis_client):
+        return None
+    try:
+        round_data = redis_client.get(round_key(table))
+        return json.loads(round_data) if round_data else None
+    except Exception as e:
+        logger.error(f"Redis error reading round for bet intake: {e}")
+        return None
+
+
+def _place_bet_redis(request, round_data, number, chip_amount):
+    """place_bet via the Redis Lua intake: no row locks, persisted when betting closes."""
+    round_id = round_data['round_id']
+    balance = Wallet.objects.filter(user=request.user).values_list('balance', flat=True).first()
+    if balance is None:
+        logger.error(f"Wallet not found for user {request.user.username}")
+        return Response({'error': 'Wallet not found'}, status=status.HTTP_404_NOT_FOUND)
+
+    betting_close_time = get_game_setting('BETTING_CLOSE_TIME', 30)
+    close_at_ms = bet_intake.betting_close_ms(round_data, betting_close_time)
+    try:
+        result, reserved, total = bet_intake.accept_bet(
+            redis_client, round_id, request.user.id, number, chip_amount, balance, close_at_ms
+        )
+    except Exception as e:
+        logger.exception(f"Unexpected error placing bet for user {request.user.username}: {e}")
+        return Response({'error': 'Internal server error during betting'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    if result == bet_intake.CUTOFF_PASSED:
+        logger.warning(f"Bet failed for user {request.user.username}: Betting period ended for round {round_id}")
+        return Response({'error': f'Betting period has ended. Betting closes at {betting_close_time} seconds.'}, status=status.HTTP_400_BAD_REQUEST)
+    if result == bet_intake.INSUFFICIENT_BALANCE:
+        logger.warning(f"Bet failed for user {request.user.username}: Insufficient balance (Balance: {balance}, Reserved: {reserved}, Requested: {chip_amount})")
+        return Response({'error': 'Insufficient balance'}, status=status.HTTP_400_BAD_REQUEST)
+
+    record_bet(redis_client, round_id, number, chip_amount, new_bet=(total == chip_amount))
+    push_bet_update(request.user.id, 'placed', round_id, number, total, balance - reserved, pending=True)
+    logger.info(f"Bet accepted (pending): User {request.user.username}, Round {round_id}, Num {number}, Amount {chip_amount}")
+    return Response({
+        'bet': {
+            'round_id': round_id,
+            'number': number,
+            'chip_amount': str(total),
+            'pending': True,
+        },
+        'wallet_balance': str(balance - reserved),
+        'round': {'round_id': round_id},
+    }, status=status.HTTP_201_CREATED if total == chip_amount else status.HTTP_200_OK)
+
+
+def _remove_bet_redis(request, round_data, number):
+    """remove_bet for a bet still pending in the Redis intake."""
+    round_id = round_data['round_id']
+    betting_close_time = get_game_setting('BETTING_CLOSE_TIME', 30)
+    close_at_ms = bet_intake.betting_close_ms(round_data, betting_close_time)
+    try:
+        result, refund_amount = bet_intake.cancel_bet(redis_client, round_id, request.user.id, number, close_at_ms)
+        reserved = bet_intake.pending_reserved(redis_client, request.user.id)
+    except Exception as e:
+        logger.exception(f"Unexpected error removing bet for user {request.user.username}: {e}")
+        return Response({'error': 'Internal server error during refund'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    if result == bet_intake.CUTOFF_PASSED:
+        logger.warning(f"Remove bet failed for user {request.user.username}: Betting period ended for round {round_id}")
+        return Response({'error': f'Betting period has ended. Betting closes at {betting_close_time} seconds.'}, status=status.HTTP_400_BAD_REQUEST)
+    if result == 0:
+        logger.warning(f"Remove bet failed for user {request.user.username}: Bet on number {number} not found in round {round_id}")
+        return Response({'error': 'Bet not found'}, status=status.HTTP_404_NOT_FOUND)
+
+    record_removal(redis_client, round_id, number, refund_amount)
+    balance = Wallet.objects.filter(user=request.user).values_list('balance', flat=True).first() or Decimal('0.00')
+    push_bet_update(request.user.id, 'removed', round_id, number, Decimal('0.00'), balance - reserved, pending=True)
+    logger.info(f"Pending bet removed: User {request.user.username}, Round {round_id}, Num {number}, Amount {refund_amount}")
+    return Response({
+        'message': f'Bet on number {number} removed',
+        'refund_amount': str(refund_amount),
+        'wallet_balance': str(balance - reserved),
+        'round': {'round_id': round_id},
+    })
+
+
 @csrf_exempt
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
+@idempotent(
+    'bet',
+    get_redis=lambda: redis_client,
+    # Keep responses for a whole round so any retry within it is answered from Redis
+    get_ttl=lambda: get_game_setting('ROUND_END_TIME', 80) + 30,
+)
 def place_bet(request):
-    """Place a bet on a number"""
+    """Place a bet on a number (send an Idempotency-Key header to make retries safe)"""
+    table = request_table(request)
+    if table is None:
+        return Response({'error': 'Unknown table'}, status=status.HTTP_400_BAD_REQUEST)
     serializer = CreateBetSerializer(data=request.data)
     if not serializer.is_valid():
         logger.warning(f"User {request.user.username} provided invalid bet data: {serializer.errors}")
@@ -206,16 +332,27 @@ def place_bet(request):
     chip_amount = serializer.validated_data['chip_amount']
     logger.info(f"Bet attempt by user {request.user.username} (ID: {request.user.id}): Number {number}, Amount {chip_amount}")
 
+    # Per-table stakes
+    min_bet, max_bet = bet_limits(table)
+    if min_bet is not None and chip_amount < Decimal(str(min_bet)):
+        return Response({'error': f'Minimum bet on this table is {min_bet}'}, status=status.HTTP_400_BAD_REQUEST)
+    if max_bet is not None and chip_amount > Decimal(str(max_bet)):
+        return Response({'error': f'Maximum bet on this table is {max_bet}'}, status=status.HTTP_400_BAD_REQUEST)
+
+    intake_round = _intake_round_data(table)
+    if intake_round:
+        return _place_bet_redis(request, intake_round, number, chip_amount)
+
     # Get current round
     round_obj = None
     timer = 0
     
     if redis_client:
         try:
-            round_data = redis_client.get('current_round')
+            round_data = redis_client.get(round_key(table))
             if round_data:
                 round_data = json.loads(round_data)
-                timer = int(redis_client.get('round_timer') or '0')
+                timer = int(redis_client.get(timer_key(table)) or '0')
                 try:
                     round_obj = GameRound.objects.get(round_id=round_data['round_id'])
                 except GameRound.DoesNotExist:
@@ -225,7 +362,7 @@ def place_bet(request):
     
     # Fallback to latest round
     if not round_obj:
-        round_obj = GameRound.objects.order_by('-start_time').first()
+        round_obj = GameRound.objects.filter(table=table).order_by('-start_time').first()
         if not round_obj:
             logger.warning(f"Bet failed for user {request.user.username}: No active round")
             return Response({'error': 'No active round'}, status=status.HTTP_400_BAD_REQUEST)
@@ -258,37 +395,32 @@ def place_bet(request):
             logger.warning(f"Bet failed for user {request.user.username}: Round {round_obj.round_id} status is {round_obj.status}")
             return Response({'error': 'Betting is closed'}, status=status.HTTP_400_BAD_REQUEST)
 
-    # Get user wallet
-    try:
-        wallet = Wallet.objects.get(user=request.user)
-    except Wallet.DoesNotExist:
-        logger.error(f"Wallet not found for user {request.user.username}")
-        return Response({'error': 'Wallet not found'}, status=status.HTTP_404_NOT_FOUND)
-
-    # Check balance
-    if wallet.balance < chip_amount:
-        logger.warning(f"Bet failed for user {request.user.username}: Insufficient balance (Balance: {wallet.balance}, Requested: {chip_amount})")
-        return Response({'error': 'Insufficient balance'}, status=status.HTTP_400_BAD_REQUEST)
-
     # Create or update bet
     try:
         with transaction.atomic():
+            # Conditional debit: fails instead of overdrawing under concurrent bets
+            balance_after = Wallet.debit(request.user.id, chip_amount)
+            if balance_after is None:
+                if not Wallet.objects.filter(user=request.user).exists():
+                    logger.error(f"Wallet not found for user {request.user.username}")
+                    return Response({'error': 'Wallet not found'}, status=status.HTTP_404_NOT_FOUND)
+                logger.warning(f"Bet failed for user {request.user.username}: Insufficient balance (Requested: {chip_amount})")
+                return Response({'error': 'Insufficient balance'}, status=status.HTTP_400_BAD_REQUEST)
+            balance_before = balance_after + chip_amount
+
+            # No unique constraint once game_bet is partitioned; the lock makes get_or_create safe
+            lock_bet(request.user.id, round_obj.pk, number)
             bet, created = Bet.objects.get_or_create(
                 user=request.user,
                 round=round_obj,
                 number=number,
                 defaults={'chip_amount': chip_amount}
             )
-
-            balance_before = wallet.balance
             if not created:
                 # Increment existing bet amount
-                bet.chip_amount += chip_amount
-                bet.save()
-
-            # Deduct from wallet
-            wallet.deduct(chip_amount)
-            balance_after = wallet.balance
+                Bet.objects.filter(pk=bet.pk).update(chip_amount=F('chip_amount') + chip_amount)
+                bet.refresh_from_db(fields=['chip_amount'])
+            record_placed(request.user.id, chip_amount, new_bet=created)
 
             # Create transaction for the additional wager
             Transaction.objects.create(
@@ -301,18 +433,22 @@ def place_bet(request):
             )
 
             # Update round stats
-            round_obj.total_bets += 1
-            round_obj.total_amount += chip_amount
-            round_obj.save()
+            GameRound.objects.filter(pk=round_obj.pk).update(
+                total_bets=F('total_bets') + 1,
+                total_amount=F('total_amount') + chip_amount,
+            )
+            round_obj.refresh_from_db(fields=['total_bets', 'total_amount'])
             logger.info(f"Bet placed successfully: User {request.user.username}, Round {round_obj.round_id}, Num {number}, Amount {chip_amount}")
     except Exception as e:
         logger.exception(f"Unexpected error placing bet for user {request.user.username}: {e}")
         return Response({'error': 'Internal server error during betting'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+    record_bet(redis_client, round_obj.round_id, number, chip_amount, new_bet=created)
+    push_bet_update(request.user.id, 'placed', round_obj.round_id, number, bet.chip_amount, balance_after)
     serializer = BetSerializer(bet)
     response_data = {
         'bet': serializer.data,
-        'wallet_balance': str(wallet.balance),
+        'wallet_balance': str(balance_after),
         'round': {
             'round_id': round_obj.round_id,
             'total_bets': round_obj.total_bets,
@@ -327,17 +463,23 @@ def place_bet(request):
 @permission_classes([IsAuthenticated])
 def remove_bet(request, number):
     """Remove a bet for a specific number"""
+    table = request_table(request)
+    if table is None:
+        return Response({'error': 'Unknown table'}, status=status.HTTP_400_BAD_REQUEST)
     logger.info(f"Remove bet request by user {request.user.username} (ID: {request.user.id}) for number {number}")
+    intake_round = _intake_round_data(table)
+    if intake_round:
+        return _remove_bet_redis(request, intake_round, number)
     # Get current round
     round_obj = None
     timer = 0
     
     if redis_client:
         try:
-            round_data = redis_client.get('current_round')
+            round_data = redis_client.get(round_key(table))
             if round_data:
                 round_data = json.loads(round_data)
-                timer = int(redis_client.get('round_timer') or '0')
+                timer = int(redis_client.get(timer_key(table)) or '0')
                 try:
                     round_obj = GameRound.objects.get(round_id=round_data['round_id'])
                 except GameRound.DoesNotExist:
@@ -347,7 +489,7 @@ def remove_bet(request, number):
     
     # Fallback to latest round
     if not round_obj:
-        round_obj = GameRound.objects.order_by('-start_time').first()
+        round_obj = GameRound.objects.filter(table=table).order_by('-start_time').first()
         if not round_obj:
             logger.warning(f"Remove bet failed for user {request.user.username}: No active round")
             return Response({'error': 'No active round'}, status=status.HTTP_400_BAD_REQUEST)
@@ -380,28 +522,29 @@ def remove_bet(request, number):
             logger.warning(f"Remove bet failed for user {request.user.username}: Betting is closed (Status: {round_obj.status})")
             return Response({'error': 'Betting is closed'}, status=status.HTTP_400_BAD_REQUEST)
 
-    # Get the bet
-    try:
-        bet = Bet.objects.get(user=request.user, round=round_obj, number=number)
-    except Bet.DoesNotExist:
-        logger.warning(f"Remove bet failed for user {request.user.username}: Bet on number {number} not found in round {round_obj.round_id}")
-        return Response({'error': 'Bet not found'}, status=status.HTTP_404_NOT_FOUND)
-
-    # Store bet amount before deleting
-    refund_amount = bet.chip_amount
-
     try:
         with transaction.atomic():
+            # Lock the bet so two concurrent removals cannot both refund it
+            try:
+                bet = Bet.objects.select_for_update().get(user=request.user, round=round_obj, number=number)
+            except Bet.DoesNotExist:
+                logger.warning(f"Remove bet failed for user {request.user.username}: Bet on number {number} not found in round {round_obj.round_id}")
+                return Response({'error': 'Bet not found'}, status=status.HTTP_404_NOT_FOUND)
+            refund_amount = bet.chip_amount
+
             # Refund the bet amount
-            wallet = request.user.wallet
-            balance_before = wallet.balance
-            wallet.add(refund_amount)
-            balance_after = wallet.balance
+            balance_after = Wallet.credit(request.user.id, refund_amount)
+            if balance_after is None:
+                logger.error(f"Wallet not found for user {request.user.username}")
+                return Response({'error': 'Wallet not found'}, status=status.HTTP_404_NOT_FOUND)
+            balance_before = balance_after - refund_amount
 
             # Update round stats before deleting bet
-            round_obj.total_bets = max(0, round_obj.total_bets - 1)
-            round_obj.total_amount = max(Decimal('0.00'), round_obj.total_amount - refund_amount)
-            round_obj.save()
+            GameRound.objects.filter(pk=round_obj.pk).update(
+                total_bets=Greatest(F('total_bets') - 1, 0),
+                total_amount=Greatest(F('total_amount') - refund_amount, Decimal('0.00')),
+            )
+            round_obj.refresh_from_db(fields=['total_bets', 'total_amount'])
 
             # Create refund transaction
             Transaction.objects.create(
@@ -415,15 +558,18 @@ def remove_bet(request, number):
 
             # Delete the bet
             bet.delete()
+            record_removed(request.user.id, refund_amount)
             logger.info(f"Bet removed and refunded: User {request.user.username}, Round {round_obj.round_id}, Num {number}, Amount {refund_amount}")
     except Exception as e:
         logger.exception(f"Unexpected error removing bet for user {request.user.username}: {e}")
         return Response({'error': 'Internal server error during refund'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+    record_removal(redis_client, round_obj.round_id, number, refund_amount)
+    push_bet_update(request.user.id, 'removed', round_obj.round_id, number, Decimal('0.00'), balance_after)
     return Response({
         'message': f'Bet on number {number} removed',
         'refund_amount': str(refund_amount),
-        'wallet_balance': str(wallet.balance),
+        'wallet_balance': str(balance_after),
         'round': {
             'round_id': round_obj.round_id,
             'total_bets': round_obj.total_bets,
@@ -437,12 +583,15 @@ def remove_bet(request, number):
 @permission_classes([IsAuthenticated])
 def my_bets(request):
     """Get user's bets for current round"""
+    table = request_table(request)
+    if table is None:
+        return Response({'error': 'Unknown table'}, status=status.HTTP_400_BAD_REQUEST)
     logger.info(f"User {request.user.username} fetching their bets for the current round")
     # Get current round
     round_obj = None
     if redis_client:
         try:
-            round_data = redis_client.get('current_round')
+            round_data = redis_client.get(round_key(table))
             if round_data:
                 round_data = json.loads(round_data)
                 
@@ -471,19 +620,30 @@ def my_bets(request):
                         pass
                 else:
                     # Clear stale Redis data
-                    redis_client.delete('current_round')
-                    redis_client.delete('round_timer')
+                    redis_client.delete(round_key(table))
+                    redis_client.delete(timer_key(table))
         except Exception:
             pass
     
     # Fallback to latest round
     if not round_obj:
-        round_obj = GameRound.objects.order_by('-start_time').first()
+        round_obj = GameRound.objects.filter(table=table).order_by('-start_time').first()
     
     if round_obj:
         bets = Bet.objects.filter(user=request.user, round=round_obj)
         serializer = BetSerializer(bets, many=True)
-        return Response(serializer.data)
+        data = serializer.data
+        if bet_intake.intake_enabled() and redis_client:
+            # Bets accepted by the Redis intake and not yet persisted
+            try:
+                pending = bet_intake.pending_bets(redis_client, round_obj.round_id, request.user.id)
+            except Exception:
+                pending = {}
+            data = list(data) + [
+                {'round_id': round_obj.round_id, 'number': number, 'chip_amount': str(amount), 'pending': True}
+                for number, amount in sorted(pending.items())
+            ]
+        return Response(data)
     
     return Response([])
 
@@ -492,13 +652,26 @@ def my_bets(request):
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def betting_history(request):
-    """Get user's betting history (all bets, not just current round)"""
-    limit = int(request.query_params.get('limit', 50))
+    """
+    Get user's betting history (all bets, not just current round), newest first.
+    Pass the ``X-Next-Cursor`` response header back as ``?cursor=`` for older bets.
+    """
+    try:
+        limit = max(1, min(int(request.query_params.get('limit', 50)), MAX_PAGE_SIZE))
+    except ValueError:
+        return Response({'error': 'Invalid limit'}, status=status.HTTP_400_BAD_REQUEST)
     logger.info(f"User {request.user.username} fetching betting history (limit: {limit})")
     
-    bets = Bet.objects.filter(user=request.user).select_related('round').order_by('-created_at')[:limit]
+    bets = Bet.objects.filter(user=request.user).select_related('round')
+    try:
+        bets, next_cursor = keyset_page(bets, request.query_params.get('cursor'), limit)
+    except (ValueError, TypeError):
+        return Response({'error': 'Invalid cursor'}, status=status.HTTP_400_BAD_REQUEST)
     serializer = BetSerializer(bets, many=True)
-    return Response(serializer.data)
+    response = Response(serializer.data)
+    if next_cursor:
+        response['X-Next-Cursor'] = next_cursor
+    return response
 
 
 @api_view(['GET'])
@@ -532,7 +705,7 @@ def round_results(request, round_id=None):
                 logger.error(f"Redis error in round_results: {e}")
         
         if not round_obj:
-            round_obj = GameRound.objects.order_by('-start_time').first()
+            round_obj = GameRound.objects.filter(table=DEFAULT_TABLE).order_by('-start_time').first()
         
         if not round_obj:
             logger.warning(f"No rounds found for user {request.user.username}")
@@ -629,7 +802,7 @@ def set_dice_result(request):
     
     # Fallback to latest round
     if not round_obj:
-        round_obj = GameRound.objects.order_by('-start_time').first()
+        round_obj = GameRound.objects.filter(table=DEFAULT_TABLE).order_by('-start_time').first()
     
     if not round_obj:
         logger.warning(f"Admin {request.user.username} failed to set result: No active round")
@@ -739,8 +912,20 @@ def calculate_payouts(round_obj, dice_result=None, dice_values=None):
         dice_result: Winning number (deprecated, kept for backward compatibility)
         dice_values: List of 6 dice values [1-6, 1-6, 1-6, 1-6, 1-6, 1-6]
     """
+    # Persist anything still pending in the Redis bet intake before settling
+    if bet_intake.intake_enabled():
+        bet_intake.flush_round_bets(round_obj, redis_client)
+
+    _pay_winners(round_obj, dice_result, dice_values)
+
+    # Leaderboards count the round (losses included) once its payouts are committed
+    transaction.on_commit(lambda: publish_round_leaderboards(round_obj, redis_client))
+
+
+def _pay_winners(round_obj, dice_result, dice_values):
+    """Settle the winning bets of ``round_obj`` (see calculate_payouts)"""
     from collections import Counter
-    
+
     # Get dice values from round if not provided
     if dice_values is None:
         dice_values = [
@@ -759,79 +944,38 @@ def calculate_payouts(round_obj, dice_result=None, dice_values=None):
             else:
                 winning_numbers = [int(dice_result)]
                 
-            game_settings = get_all_game_settings()
-            for win_num in winning_numbers:
-                winning_bets = Bet.objects.filter(round=round_obj, number=win_num)
-                payout_ratio = game_settings.get('PAYOUT_RATIOS', {}).get(win_num, 6.0)
-                for bet in winning_bets:
-                    # Calculate total payout
-                    total_payout_amount = bet.chip_amount * Decimal(str(payout_ratio))
-                    
-                    # Store the total payout amount in bet.payout_amount for reference
-                    bet.payout_amount = total_payout_amount
-                    bet.is_winner = True
-                    bet.save()
-                    
-                    # Add 100% to winner's wallet
-                    wallet = bet.user.wallet
-                    balance_before = wallet.balance
-                    wallet.add(total_payout_amount)
-                    balance_after = wallet.balance
-                    
-                    Transaction.objects.create(
-                        user=bet.user,
-                        transaction_type='WIN',
-                        amount=total_payout_amount,
-                        balance_before=balance_before,
-                        balance_after=balance_after,
-                        description=f"Win on number {win_num} in round {round_obj.round_id}. Payout: {total_payout_amount}"
-                    )
+            payout_ratios = get_all_game_settings().get('PAYOUT_RATIOS', {})
+            multipliers = {
+                win_num: Decimal(str(payout_ratios.get(win_num, 6.0)))
+                for win_num in winning_numbers
+            }
+            settle_round(
+                round_obj, multipliers,
+                lambda number, multiplier, payout: f"Win on number {number} in round {round_obj.round_id}. Payout: {payout}"
+            )
         return
     
     # Count frequency of each number
     counts = Counter(dice_values)
     
     # Find all winning numbers (appearing 2+ times)
-    winning_numbers = [num for num, count in counts.items() if count >= 2]
+    # Payout multiplier = frequency (number of occurrences)
+    # Example: frequency 2 → multiplier 2, frequency 3 → multiplier 3, etc.
+    multipliers = {
+        num: Decimal(str(count)) for num, count in counts.items() if count >= 2
+    }
     
-    if not winning_numbers:
+    if not multipliers:
         # No winners if no number appears 2+ times
         return
     
-    # Process each winning number
-    for winning_number in winning_numbers:
-        frequency = counts[winning_number]
-        # Payout multiplier = frequency (number of occurrences)
-        # Example: frequency 2 → multiplier 2, frequency 3 → multiplier 3, etc.
-        payout_multiplier = Decimal(str(frequency))
-        
-        # Get all bets on this winning number
-        winning_bets = Bet.objects.filter(round=round_obj, number=winning_number)
-        
-        for bet in winning_bets:
-            # Calculate total payout: bet_amount * multiplier
-            total_payout_amount = bet.chip_amount * payout_multiplier
-            
-            # Store the total payout amount in bet.payout_amount for reference
-            bet.payout_amount = total_payout_amount
-            bet.is_winner = True
-            bet.save()
-
-            # Add 100% to winner's wallet
-            wallet = bet.user.wallet
-            balance_before = wallet.balance
-            wallet.add(total_payout_amount)
-            balance_after = wallet.balance
-
-            # Create transaction for winner (100%)
-            Transaction.objects.create(
-                user=bet.user,
-                transaction_type='WIN',
-                amount=total_payout_amount,
-                balance_before=balance_before,
-                balance_after=balance_after,
-                description=f"Win on number {winning_number} (appeared {frequency}x) in round {round_obj.round_id}. Payout: {total_payout_amount} (Multiplier: {payout_multiplier}x)"
-            )
+    settle_round(
+        round_obj, multipliers,
+        lambda number, multiplier, payout: (
+            f"Win on number {number} (appeared {counts[number]}x) in round {round_obj.round_id}. "
+            f"Payout: {payout} (Multiplier: {multiplier}x)"
+        )
+    )
 
 
 @api_view(['GET'])
@@ -881,7 +1025,7 @@ def winning_results(request, round_id=None):
                 pass
         
         if not round_obj:
-            round_obj = GameRound.objects.order_by('-start_time').first()
+            round_obj = GameRound.objects.filter(table=DEFAULT_TABLE).order_by('-start_time').first()
         
         if not round_obj:
             # Check if any rounds exist at all
@@ -983,6 +1127,54 @@ def winning_results(request, round_id=None):
     })
 
 
+@csrf_exempt
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def my_stats(request):
+    """Get user's lifetime betting stats"""
+    stats = get_betting_stats(request.user.id)
+    return Response({
+        'total_bets': stats['total_bets'],
+        'total_wagered': str(stats['total_wagered']),
+        'total_wins': stats['total_wins'],
+        'total_payouts': str(stats['total_payouts']),
+    })
+
+
+@csrf_exempt
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def leaderboard(request):
+    """
+    Net winnings leaderboard with the caller's rank.
+    ?period=daily|weekly|round (default daily), ?date=YYYY-MM-DD for daily/weekly
+    (default today), ?round_id= for round, ?limit= (default 20, max 100).
+    """
+    period = request.query_params.get('period', 'daily')
+    if period not in LEADERBOARD_PERIODS:
+        return Response({'error': f"period must be one of {', '.join(LEADERBOARD_PERIODS)}"}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        limit = max(1, min(int(request.query_params.get('limit', 20)), 100))
+    except ValueError:
+        return Response({'error': 'Invalid limit'}, status=status.HTTP_400_BAD_REQUEST)
+
+    if period == 'round':
+        key = request.query_params.get('round_id')
+        if not key:
+            return Response({'error': 'round_id is required'}, status=status.HTTP_400_BAD_REQUEST)
+    else:
+        day = None
+        if request.query_params.get('date'):
+            try:
+                day = date.fromisoformat(request.query_params['date'])
+            except ValueError:
+                return Response({'error': 'Invalid date, use YYYY-MM-DD'}, status=status.HTTP_400_BAD_REQUEST)
+        key = leaderboard_period_key(period, day=day)
+
+    board = get_leaderboard(redis_client, period, key, limit, user_id=request.user.id)
+    return Response({'period': period, 'key': key, **board})
+
+
 @csrf_exempt
 @api_view(['GET'])
 @permission_classes([IsAdminUser])
@@ -1005,7 +1197,7 @@ def game_stats(request):
     
     # Fallback to latest round
     if not current_round_obj:
-        current_round_obj = GameRound.objects.order_by('-start_time').first()
+        current_round_obj = GameRound.objects.filter(table=DEFAULT_TABLE).order_by('-start_time').first()
 
     stats = {
         'current_round': GameRoundSerializer(current_round_obj).data if current_round_obj else None,